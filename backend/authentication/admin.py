@@ -1 +1,24 @@
-# Register your models here.
+from __future__ import annotations
+
+from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.http import HttpRequest
+
+from dreams.services.bulk_deletion import delete_user
+
+
+class BulkDeletingUserAdmin(UserAdmin):
+    """User admin that removes accounts through the batched deletion path"""
+
+    def delete_model(self, request: HttpRequest, obj: User) -> None:
+        delete_user(obj)
+
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet[User]) -> None:
+        for user in queryset:
+            delete_user(user)
+
+
+admin.site.unregister(User)
+admin.site.register(User, BulkDeletingUserAdmin)
@@ -0,0 +1,53 @@
+"""
+Management command to delete a user and all of their journal data.
+Dreams are removed in batches so large accounts do not hit request timeouts.
+"""
+
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+
+from dreams.services.background_jobs import BackgroundJobs
+from dreams.services.bulk_deletion import delete_user
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Delete a user and all of their dreams, qualities and images"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("username", help="Username of the account to delete")
+        parser.add_argument(
+            "--background",
+            action="store_true",
+            help="Queue the deletion as a Celery job instead of running it here",
+        )
+
+    def handle(self, *args, **options) -> None:  # type: ignore[override]
+        username = options["username"]
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            self.stdout.write(self.style.ERROR(f"User {username} does not exist"))
+            return
+
+        if options["background"]:
+            task_id = BackgroundJobs.start(
+                user.pk, "dreams.tasks.delete_user_account", [user.pk]
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"Queued deletion of {username} as task {task_id}")
+            )
+            return
+
+        def report(done: int, total: int) -> None:
+            self.stdout.write(f"Deleted {done}/{total} dreams")
+
+        deleted = delete_user(user, progress=report)  # type: ignore[arg-type]
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted user {username} and {deleted} dreams")
+        )
+        logger.info(f"Deleted user {username} with {deleted} dreams")
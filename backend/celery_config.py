@@ -1,5 +1,6 @@
 import os
 
+from celery.schedules import crontab
 from django.conf import settings
 
 broker_url = (
@@ -31,3 +32,13 @@ enable_utc = True
 worker_prefetch_multiplier = 1
 task_acks_late = True
 worker_max_tasks_per_child = 1000
+
+# Only used by a local `celery beat`. In production Cloud Scheduler runs the
+# reconcile_frequencies command as a Cloud Run job at the same time (see
+# backend/reconcile-frequencies-job.yaml); no beat process is deployed.
+beat_schedule = {
+    "reconcile-quality-frequencies": {
+        "task": "dreams.tasks.reconcile_quality_frequencies",
+        "schedule": crontab(hour=3, minute=0),
+    },
+}
@@ -15,6 +15,7 @@ from datetime import timedelta
 from pathlib import Path
 
 import dj_database_url
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
 # Load environment variables from .env.local (takes precedence) or .env
@@ -112,6 +113,56 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Use Redis when configured so cached data is shared across instances,
+# otherwise fall back to per-process memory for local development.
+
+REDIS_CACHE_URL = os.environ.get("REDIS_CACHE_URL")
+if REDIS_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Caches read back by later requests (quality graph, Astral Plane pages) are
+# only correct when every gunicorn and Celery process shares them. Without
+# Redis they are used in DEBUG only; elsewhere every request builds its data.
+CROSS_REQUEST_CACHING = bool(REDIS_CACHE_URL) or DEBUG
+
+
+# Quality statistics engine: "python" (QualityGraph) or "sparse" (NumPy/SciPy)
+QUALITY_STATISTICS_ENGINE = os.environ.get("QUALITY_STATISTICS_ENGINE", "python")
+
+# Frequency recounts touching at least this many qualities run on Celery (0 = never)
+QUALITY_MAINTENANCE_CELERY_THRESHOLD = int(
+    os.environ.get("QUALITY_MAINTENANCE_CELERY_THRESHOLD", "0")
+)
+
+# Number of user shards the nightly frequency reconciliation is split into
+FREQUENCY_RECONCILIATION_SHARDS = int(
+    os.environ.get("FREQUENCY_RECONCILIATION_SHARDS", "4")
+)
+
+# Dream import bodies larger than this are staged in GCS and imported on Celery
+DREAM_IMPORT_INLINE_MAX_BYTES = int(
+    os.environ.get("DREAM_IMPORT_INLINE_MAX_BYTES", str(1024 * 1024))
+)
+
+# Journals with more dreams than this are exported to GCS on Celery
+DREAM_EXPORT_INLINE_MAX_DREAMS = int(
+    os.environ.get("DREAM_EXPORT_INLINE_MAX_DREAMS", "50000")
+)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -168,6 +219,9 @@ CORS_ALLOWED_ORIGINS = [
     if origin.strip()
 ]
 CORS_ALLOW_CREDENTIALS = True
+# Conditional requests: the frontend reads validators and sends If-Match
+CORS_ALLOW_HEADERS = (*default_headers, "if-match", "if-none-match")
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified"]
 
 # REST Framework settings
 REST_FRAMEWORK = {
@@ -5,6 +5,7 @@ from django.db.models import QuerySet
 from django.http import HttpRequest
 
 from .models import Dream, Quality
+from .services.bulk_deletion import delete_dreams
 
 
 @admin.register(Dream)
@@ -32,6 +33,10 @@ class DreamAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         return qs.filter(user=request.user)
 
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet[Dream]) -> None:
+        """Delete selected dreams through the batched path"""
+        delete_dreams(request.user, queryset.values_list("pk", flat=True))  # type: ignore[arg-type]
+
 
 @admin.register(Quality)
 class QualityAdmin(admin.ModelAdmin):
@@ -0,0 +1,148 @@
+"""
+Management command to compare the serializer and values() list rendering paths.
+Fixture data is created inside a transaction that is rolled back afterwards.
+"""
+
+import time
+from collections.abc import Callable
+from functools import partial
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from dreams.models import IMAGE_PREVIEW_COUNT, Dream, Image, Quality
+from dreams.renderers import FastJSONRenderer
+from dreams.serializers import DreamListSerializer, QualitySerializer
+from dreams.services.list_rendering import DreamListRows, QualityRows
+from dreams.views import DreamViewSet
+
+
+class Command(BaseCommand):
+    help = "Benchmark serializer vs values() rendering of dream and quality pages"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--page-sizes",
+            type=int,
+            nargs="+",
+            default=[20, 100],
+            help="Page sizes to render",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Renders per page size and path; the median is reported",
+        )
+        parser.add_argument(
+            "--qualities",
+            type=int,
+            default=5,
+            help="Qualities per fixture dream",
+        )
+
+    def handle(self, *args, **options) -> None:  # type: ignore[override]
+        page_sizes = sorted(options["page_sizes"])
+        with transaction.atomic():
+            user = self.create_fixtures(max(page_sizes), options["qualities"])
+            request = RequestFactory().get("/api/dreams/")
+            request.user = user
+            dreams = DreamViewSet.with_relations(
+                Dream.objects.owned_by(user).order_by("-created")
+            )
+            qualities = Quality.objects.filter(user=user).order_by("name")
+
+            self.stdout.write(
+                f"{'endpoint':<10} {'page':>5} {'serializer':>12} "
+                f"{'values()':>12} {'speedup':>8}"
+            )
+            for page_size in page_sizes:
+                paths = [
+                    (
+                        "dreams",
+                        partial(self.serialize_dreams, dreams, page_size, request),
+                        partial(self.render_dreams, dreams, page_size, user.pk),
+                    ),
+                    (
+                        "qualities",
+                        partial(self.serialize_qualities, qualities, page_size),
+                        partial(self.render_qualities, qualities, page_size),
+                    ),
+                ]
+                for name, serialize, render in paths:
+                    serializer_ms = self.time(serialize, options["repeat"])
+                    values_ms = self.time(render, options["repeat"])
+                    self.stdout.write(
+                        f"{name:<10} {page_size:>5} {serializer_ms:>10.2f}ms "
+                        f"{values_ms:>10.2f}ms {serializer_ms / values_ms:>7.1f}x"
+                    )
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def serialize_dreams(
+        dreams: QuerySet[Dream], page_size: int, request: HttpRequest
+    ) -> bytes:
+        """The DreamListSerializer path."""
+        page = list(dreams[:page_size])
+        serializer = DreamListSerializer(page, many=True, context={"request": request})
+        rendered: bytes = JSONRenderer().render(serializer.data)
+        return rendered
+
+    @staticmethod
+    def render_dreams(dreams: QuerySet[Dream], page_size: int, user_id: int) -> bytes:
+        """The DreamListRows path."""
+        selected = DreamListRows.selection(None)
+        rows = list(DreamListRows.values(dreams, selected)[:page_size])
+        return FastJSONRenderer().render(DreamListRows.render(rows, selected, user_id))
+
+    @staticmethod
+    def serialize_qualities(qualities: QuerySet[Quality], page_size: int) -> bytes:
+        """The QualitySerializer path."""
+        page = list(qualities[:page_size])
+        rendered: bytes = JSONRenderer().render(QualitySerializer(page, many=True).data)
+        return rendered
+
+    @staticmethod
+    def render_qualities(qualities: QuerySet[Quality], page_size: int) -> bytes:
+        """The QualityRows path."""
+        rows = QualityRows.values(qualities)[:page_size]
+        return FastJSONRenderer().render(QualityRows.render(rows))
+
+    def create_fixtures(self, dream_count: int, quality_count: int) -> User:
+        """Create a throwaway user with dream_count fully loaded dreams."""
+        user = User.objects.create_user(username=f"benchmark-{time.time_ns()}")
+        qualities = Quality.get_or_create_many(
+            user, [f"quality {n}" for n in range(max(dream_count, quality_count))]
+        )
+        dreams = Dream.objects.bulk_create(
+            Dream(user=user, description=f"Benchmark dream {n} " * 20)
+            for n in range(dream_count)
+        )
+        Dream.qualities.through.objects.bulk_create(
+            Dream.qualities.through(dream_id=dream.pk, quality_id=quality.pk)
+            for i, dream in enumerate(dreams)
+            for quality in qualities[i : i + quality_count]
+        )
+        Image.objects.bulk_create(
+            Image(dream=dream, gcs_path=f"benchmark/{dream.pk}/{n}.png")
+            for dream in dreams
+            for n in range(IMAGE_PREVIEW_COUNT)
+        )
+        return user
+
+    @staticmethod
+    def time(render: Callable[[], bytes], repeat: int) -> float:
+        """Median wall time of one render, in milliseconds."""
+        render()  # warm up
+        timings = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - start) * 1000)
+        return sorted(timings)[len(timings) // 2]
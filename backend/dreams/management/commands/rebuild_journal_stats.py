@@ -0,0 +1,57 @@
+"""
+Management command to find and fix drift in the per-user journal counters.
+Safe to run at any time - each chunk of users is rebuilt in its own short
+transaction.
+"""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from dreams.services.journal_stats import CHUNK_SIZE, rebuild_journal_stats
+
+logger = logging.getLogger(__name__)
+
+# Number of drifted user IDs listed in the output
+SAMPLE_SIZE = 20
+
+
+class Command(BaseCommand):
+    help = "Recompute the UserJournalStats counters of all users and report drift"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Only rebuild this user (repeatable)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Number of users checked per pass",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without fixing it",
+        )
+
+    def handle(self, *args, **options) -> None:  # type: ignore[override]
+        fix = not options["dry_run"]
+        report = rebuild_journal_stats(
+            fix=fix, chunk_size=options["chunk_size"], user_ids=options["user_ids"]
+        )
+
+        if report.user_ids:
+            sample = ", ".join(map(str, report.user_ids[:SAMPLE_SIZE]))
+            self.stdout.write(f"  drifted users: {sample}")
+
+        summary = f"Checked {report.checked} users, {report.drifted} drifted"
+        if report.drifted and not fix:
+            self.stdout.write(self.style.WARNING(f"{summary}; dry run, nothing fixed"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{summary}; fixed {report.fixed}"))
+        logger.info(summary)
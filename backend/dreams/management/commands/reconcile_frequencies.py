@@ -0,0 +1,108 @@
+"""
+Management command to find and fix drift in quality frequencies.
+Safe to run at any time - each chunk is recounted in its own short transaction.
+"""
+
+import logging
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from dreams.services.frequency_reconciliation import (
+    CHUNK_SIZE,
+    FrequencyDriftReport,
+    reconcile_frequencies,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Recount quality frequencies for all users and report drift"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=settings.FREQUENCY_RECONCILIATION_SHARDS,
+            help="Number of user shards to split the work into",
+        )
+        parser.add_argument(
+            "--shard",
+            type=int,
+            help="Only process this shard (run one process per shard in parallel)",
+        )
+        parser.add_argument(
+            "--cloud-run-task",
+            action="store_true",
+            help=(
+                "Take --shard and --shards from CLOUD_RUN_TASK_INDEX and "
+                "CLOUD_RUN_TASK_COUNT, so each task of a Cloud Run job runs one shard"
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Number of qualities recounted per pass",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without fixing it",
+        )
+        parser.add_argument(
+            "--background",
+            action="store_true",
+            help="Queue one Celery task per shard instead of running here",
+        )
+
+    def handle(self, *args, **options) -> None:  # type: ignore[override]
+        if options["cloud_run_task"]:
+            try:
+                options["shard"] = int(os.environ["CLOUD_RUN_TASK_INDEX"])
+                options["shards"] = int(os.environ["CLOUD_RUN_TASK_COUNT"])
+            except (KeyError, ValueError) as exc:
+                raise CommandError(f"Not running as a Cloud Run task: {exc}") from exc
+        shard_count = max(options["shards"], 1)
+        shards = (
+            [options["shard"]] if options["shard"] is not None else range(shard_count)
+        )
+        fix = not options["dry_run"]
+
+        if options["background"]:
+            from dreams.tasks import reconcile_quality_frequencies_shard
+
+            for shard in shards:
+                reconcile_quality_frequencies_shard.delay(shard, shard_count, fix)
+            self.stdout.write(
+                self.style.SUCCESS(f"Queued {len(shards)} reconciliation shards")
+            )
+            return
+
+        total = FrequencyDriftReport()
+        for shard in shards:
+            report = reconcile_frequencies(
+                shard, shard_count, fix=fix, chunk_size=options["chunk_size"]
+            )
+            self.stdout.write(
+                f"Shard {shard}/{shard_count}: checked {report.checked}, "
+                f"drifted {report.drifted}"
+            )
+            total.merge(report)
+
+        for quality_id, stored, actual in total.samples:
+            self.stdout.write(
+                f"  quality {quality_id}: stored {stored}, actual {actual}"
+            )
+
+        summary = (
+            f"Checked {total.checked} qualities, {total.drifted} drifted "
+            f"across {len(total.user_ids)} users (total drift {total.absolute_drift})"
+        )
+        if total.drifted and not fix:
+            self.stdout.write(self.style.WARNING(f"{summary}; dry run, nothing fixed"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{summary}; fixed {total.fixed}"))
+        logger.info(summary)
@@ -0,0 +1,122 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:48
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_cooccurrences(apps, schema_editor):
+    """Build pair rows for every existing dream."""
+    Dream = apps.get_model("dreams", "Dream")
+    QualityCooccurrence = apps.get_model("dreams", "QualityCooccurrence")
+
+    dream_qualities = defaultdict(list)
+    dream_users = {}
+    links = Dream.qualities.through.objects.values_list(
+        "dream_id", "quality_id", "dream__user_id"
+    )
+    for dream_id, quality_id, user_id in links.iterator():
+        dream_qualities[dream_id].append(quality_id)
+        dream_users[dream_id] = user_id
+
+    pair_dreams = defaultdict(list)
+    for dream_id, quality_ids in dream_qualities.items():
+        quality_ids.sort()
+        for i, q1 in enumerate(quality_ids):
+            for q2 in quality_ids[i + 1 :]:
+                pair_dreams[(dream_users[dream_id], q1, q2)].append(dream_id)
+
+    QualityCooccurrence.objects.bulk_create(
+        [
+            QualityCooccurrence(
+                user_id=user_id,
+                quality_a_id=quality_a_id,
+                quality_b_id=quality_b_id,
+                dream_count=len(dream_ids),
+                dream_ids=sorted(dream_ids),
+            )
+            for (user_id, quality_a_id, quality_b_id), dream_ids in pair_dreams.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dreams", "0004_add_is_public_field"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QualityCooccurrence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dream_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of dreams both qualities appear in"
+                    ),
+                ),
+                (
+                    "dream_ids",
+                    models.JSONField(
+                        default=list,
+                        help_text="Sorted IDs of the dreams both qualities appear in",
+                    ),
+                ),
+                (
+                    "quality_a",
+                    models.ForeignKey(
+                        help_text="The quality with the lower ID",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="dreams.quality",
+                    ),
+                ),
+                (
+                    "quality_b",
+                    models.ForeignKey(
+                        help_text="The quality with the higher ID",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="dreams.quality",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="The user who owns both qualities",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-dream_count"],
+                        name="dreams_qual_user_id_0c593e_idx",
+                    )
+                ],
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(("quality_a__lt", models.F("quality_b"))),
+                        name="dreams_cooccurrence_ordered_pair",
+                    )
+                ],
+                "unique_together": {("quality_a", "quality_b")},
+            },
+        ),
+        migrations.RunPython(backfill_cooccurrences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Composite index for co-occurrence self-joins on the implicit M2M table.
+
+    The (dream_id, quality_id) direction is already covered by the table's
+    unique constraint; this adds (quality_id, dream_id) so the dreams of one
+    quality can be found with an index-only scan.
+    """
+
+    dependencies = [
+        ("dreams", "0005_quality_cooccurrence"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX dreams_dream_qualities_quality_dream_idx "
+                "ON dreams_dream_qualities (quality_id, dream_id);"
+            ),
+            reverse_sql="DROP INDEX dreams_dream_qualities_quality_dream_idx;",
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:20
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def backfill_search_text(apps, schema_editor):
+    """Build the search document of every existing dream."""
+    Dream = apps.get_model("dreams", "Dream")
+
+    names = defaultdict(list)
+    links = Dream.qualities.through.objects.values_list("dream_id", "quality__name")
+    for dream_id, name in links.iterator():
+        names[dream_id].append(name)
+
+    batch = []
+    for dream in Dream.objects.only("pk", "description").iterator():
+        dream.search_text = f"{dream.description} {','.join(names[dream.pk])}"
+        batch.append(dream)
+        if len(batch) >= 1000:
+            Dream.objects.bulk_update(batch, ["search_text"])
+            batch = []
+    if batch:
+        Dream.objects.bulk_update(batch, ["search_text"])
+
+
+def create_search_index(apps, schema_editor):
+    """GIN index on Postgres, FTS5 mirror table on SQLite."""
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX dreams_dream_search_idx ON dreams_dream "
+            "USING gin (to_tsvector('english'::regconfig, search_text));"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE dreams_dream_fts "
+            "USING fts5(search_text, tokenize='porter unicode61');"
+        )
+        schema_editor.execute(
+            "INSERT INTO dreams_dream_fts (rowid, search_text) "
+            "SELECT id, search_text FROM dreams_dream;"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX dreams_dream_search_idx;")
+    elif vendor == "sqlite":
+        schema_editor.execute("DROP TABLE dreams_dream_fts;")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dreams", "0006_dream_qualities_quality_dream_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dream",
+            name="search_text",
+            field=models.TextField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Description and quality names, indexed for full-text search",
+            ),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:40
+
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    """Trigram index for fuzzy quality autocomplete (Postgres only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    schema_editor.execute(
+        "CREATE INDEX dreams_quality_name_trgm_idx ON dreams_quality "
+        "USING gin (name gin_trgm_ops);"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX dreams_quality_name_trgm_idx;")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dreams", "0007_dream_search_text"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
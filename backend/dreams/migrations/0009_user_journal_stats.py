@@ -0,0 +1,68 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("dreams", "0008_quality_name_trigram_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserJournalStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        help_text="The user whose journal is summarized",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="journal_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "dream_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of dreams the user has written"
+                    ),
+                ),
+                (
+                    "public_dream_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of the user's dreams shared in The Astral Plane",
+                    ),
+                ),
+                (
+                    "quality_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of qualities the user has"
+                    ),
+                ),
+                (
+                    "image_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of images generated for the user's dreams",
+                    ),
+                ),
+                (
+                    "last_dream_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the user's newest dream was created",
+                        null=True,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "user journal stats",
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dreams", "0009_user_journal_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeStamp",
+            fields=[
+                (
+                    "scope",
+                    models.CharField(
+                        help_text='The user ID as text, or "public"',
+                        max_length=32,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "token",
+                    models.CharField(
+                        help_text="Opaque marker replaced on every write", max_length=32
+                    ),
+                ),
+                (
+                    "changed",
+                    models.DateTimeField(help_text="When the scope was last written"),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dreams", "0010_change_stamp"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BackgroundJob",
+            fields=[
+                (
+                    "task_id",
+                    models.CharField(
+                        help_text="The Celery task ID",
+                        max_length=255,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "task_name",
+                    models.CharField(help_text="The queued task", max_length=255),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="The user the job runs for",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="background_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "created"], name="dreams_backgroundjob_user_idx"
+                    )
+                ],
+            },
+        ),
+    ]
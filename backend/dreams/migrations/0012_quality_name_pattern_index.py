@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-17 09:10
+
+from django.db import migrations
+
+
+def create_pattern_index(apps, schema_editor):
+    """Pattern-ops index for quality prefix autocomplete (Postgres only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX dreams_quality_user_name_like_idx ON dreams_quality "
+        "(user_id, name varchar_pattern_ops);"
+    )
+
+
+def drop_pattern_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX dreams_quality_user_name_like_idx;")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dreams", "0011_background_job"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_pattern_index, drop_pattern_index),
+    ]
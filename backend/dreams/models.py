@@ -1,9 +1,78 @@
 from collections import defaultdict
+from collections.abc import Collection, Iterable
 from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.validators import MinLengthValidator
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models.functions import Coalesce, Greatest, RowNumber
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.db.models.sql.compiler import SQLCompiler
+
+
+# Number of strongest connections reported per quality in statistics
+TOP_CONNECTION_COUNT = 5
+
+# Most recent dream IDs sampled per connection; connection_strength carries the
+# full count, and /api/qualities/{id}/connections/{other_id}/dreams/ pages
+# through the rest
+DREAM_ID_SAMPLE_SIZE = 10
+
+# Number of most recent images embedded in a serialized dream
+IMAGE_PREVIEW_COUNT = 5
+
+
+class GroupConcat(models.Aggregate):
+    """Comma-separated concatenation of grouped values (STRING_AGG on Postgres)."""
+
+    function = "GROUP_CONCAT"
+    output_field = models.TextField()
+
+    def as_postgresql(
+        self,
+        compiler: "SQLCompiler",
+        connection: "BaseDatabaseWrapper",
+        **extra_context: str | None,
+    ) -> tuple[str, Any]:
+        return self.as_sql(
+            compiler,
+            connection,
+            function="STRING_AGG",
+            template="%(function)s(%(expressions)s::text, ',')",
+            **extra_context,
+        )
+
+
+class JSONArrayFromEnd(models.Func):
+    """
+    Integer element of a JSON array counted from the end (1 is the last), or
+    NULL when the array is shorter, so a tail is read without loading the array.
+    """
+
+    output_field = models.IntegerField()
+
+    def __init__(self, expression: str, position: int) -> None:
+        super().__init__(expression)
+        self.position = position
+        self.template = f"json_extract(%(expressions)s, '$[#-{position}]')"
+
+    def as_postgresql(
+        self,
+        compiler: "SQLCompiler",
+        connection: "BaseDatabaseWrapper",
+        **extra_context: str | None,
+    ) -> tuple[str, Any]:
+        return self.as_sql(
+            compiler,
+            connection,
+            template=f"((%(expressions)s ->> -{self.position})::integer)",
+            **extra_context,
+        )
 
 
 @dataclass
@@ -12,14 +81,9 @@ class QualityConnection:
 
     quality_id: int
     quality_name: str
-    shared_dream_ids: list[int]
+    shared_dream_ids: list[int]  # Most recent shared dreams, ascending
     connection_strength: int  # Number of shared dreams
 
-    def __post_init__(self) -> None:
-        """Validate connection strength matches dream count."""
-        if self.connection_strength != len(self.shared_dream_ids):
-            self.connection_strength = len(self.shared_dream_ids)
-
 
 @dataclass
 class QualityStatistic:
@@ -41,16 +105,19 @@ class QualityGraphNode:
     quality_name: str
     frequency: int
     edges: dict[int, list[int]] = field(default_factory=dict)  # quality_id -> dream_ids
+    # quality_id -> shared dreams; differs from len(edges[...]) for sampled edges
+    strengths: dict[int, int] = field(default_factory=dict)
 
     def add_edge(self, other_quality_id: int, dream_id: int) -> None:
         """Add an edge to another quality via a dream."""
         if other_quality_id not in self.edges:
             self.edges[other_quality_id] = []
         self.edges[other_quality_id].append(dream_id)
+        self.strengths[other_quality_id] = self.strengths.get(other_quality_id, 0) + 1
 
     def get_connection_strength(self, other_quality_id: int) -> int:
         """Get the number of dreams connecting to another quality."""
-        return len(self.edges.get(other_quality_id, []))
+        return self.strengths.get(other_quality_id, 0)
 
 
 @dataclass
@@ -73,6 +140,25 @@ class QualityGraph:
         if quality2_id in self.nodes:
             self.nodes[quality2_id].add_edge(quality1_id, dream_id)
 
+    def add_edges(
+        self,
+        quality1_id: int,
+        quality2_id: int,
+        dream_ids: Iterable[int],
+        strength: int | None = None,
+    ) -> None:
+        """
+        Add a bidirectional edge shared by several dreams at once.
+        Pass strength when dream_ids is only a sample of the shared dreams.
+        """
+        dream_ids = list(dream_ids)
+        if strength is None:
+            strength = len(dream_ids)
+        for source, target in ((quality1_id, quality2_id), (quality2_id, quality1_id)):
+            if source in self.nodes:
+                self.nodes[source].edges[target] = list(dream_ids)
+                self.nodes[source].strengths[target] = strength
+
     def get_statistics(self) -> list[QualityStatistic]:
         """Generate statistics for all qualities in the graph."""
         stats = []
@@ -86,13 +172,13 @@ class QualityGraph:
                         QualityConnection(
                             quality_id=other_id,
                             quality_name=other_node.quality_name,
-                            shared_dream_ids=dream_ids,
-                            connection_strength=len(dream_ids),
+                            shared_dream_ids=dream_ids[-DREAM_ID_SAMPLE_SIZE:],
+                            connection_strength=node.strengths[other_id],
                         )
                     )
 
-            # Sort by connection strength
-            connections.sort(key=lambda c: c.connection_strength, reverse=True)
+            # Sort by connection strength, ties broken by name
+            connections.sort(key=lambda c: (-c.connection_strength, c.quality_name))
 
             stats.append(
                 QualityStatistic(
@@ -100,11 +186,41 @@ class QualityGraph:
                     name=node.quality_name,
                     frequency=node.frequency,
                     total_connections=len(node.edges),
-                    top_connections=connections[:5],  # Top 5 connections
+                    top_connections=connections[:TOP_CONNECTION_COUNT],
                 )
             )
 
-        return sorted(stats, key=lambda s: s.frequency, reverse=True)
+        return sorted(stats, key=lambda s: (-s.frequency, s.name))
+
+
+@dataclass
+class QualitySubgraphNode:
+    """A node in a quality subgraph, with its hop distance from the center."""
+
+    quality_id: int
+    quality_name: str
+    frequency: int
+    hops: int
+
+
+@dataclass
+class QualitySubgraphEdge:
+    """An edge in a quality subgraph, optionally with a sample of its dreams."""
+
+    source_id: int
+    target_id: int
+    strength: int  # Number of shared dreams
+    dream_ids: list[int] | None = None  # Most recent shared dreams, if requested
+
+
+@dataclass
+class QualitySubgraph:
+    """The k-hop neighbourhood of a quality in the co-occurrence graph."""
+
+    center_id: int
+    nodes: list[QualitySubgraphNode] = field(default_factory=list)
+    edges: list[QualitySubgraphEdge] = field(default_factory=list)
+    truncated: bool = False  # True if max_nodes cut the neighbourhood short
 
 
 class Quality(models.Model):
@@ -140,7 +256,7 @@ class Quality(models.Model):
     def __str__(self) -> str:
         return f"{self.name} ({self.user.username})"
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, **kwargs) -> None:
         # Normalize to lowercase for consistency
         self.name = self.name.lower()
         super().save(*args, **kwargs)
@@ -151,37 +267,333 @@ class Quality(models.Model):
         self.frequency = Dream.objects.filter(qualities=self).count()
         self.save(update_fields=["frequency"])
 
-    def get_connections(self) -> list[QualityConnection]:
+    @classmethod
+    def get_or_create_many(cls, user: User, names: Iterable[str]) -> list["Quality"]:
+        """
+        Resolve quality names to the user's qualities, creating missing ones.
+
+        Names are normalized (stripped, lowercased) and deduplicated, then
+        resolved with one insert that ignores existing rows and one fetch, so
+        the cost doesn't depend on how many names are given and concurrent
+        writers can't trip the (user, name) unique constraint.
+
+        Returns:
+            The qualities in the order their names first appeared
+        """
+        normalized = list(
+            dict.fromkeys(name.strip().lower() for name in names if name.strip())
+        )
+        if not normalized:
+            return []
+
+        Quality.objects.bulk_create(
+            [cls(user=user, name=name) for name in normalized],
+            ignore_conflicts=True,
+        )
+        # The insert reports no rows created, so the counter is recounted
+        UserJournalStats.recount(user.pk, "quality_count")
+        by_name = {
+            q.name: q for q in cls.objects.filter(user=user, name__in=normalized)
+        }
+        return [by_name[name] for name in normalized if name in by_name]
+
+    @classmethod
+    def autocomplete(
+        cls,
+        user: User,
+        prefix: str,
+        limit: int = 10,
+        by_frequency: bool = False,
+        fuzzy: bool = False,
+    ) -> list[dict[str, object]]:
+        """
+        Suggest the user's qualities for a partially typed name.
+
+        Prefix matches are a plain startswith (LIKE 'prefix%'). On Postgres a
+        (user, name varchar_pattern_ops) index serves it as a range scan
+        whatever the database collation; other backends may scan the user's
+        qualities. Fuzzy mode ranks by trigram similarity on Postgres
+        (pg_trgm) and falls back to a substring match elsewhere.
+
+        Args:
+            user: The user owning the qualities
+            prefix: What the user has typed so far
+            limit: Maximum number of suggestions
+            by_frequency: Rank the most used qualities first instead of by name
+            fuzzy: Match similar names rather than only prefixes
+
+        Returns:
+            Suggestions as {"id", "name", "frequency"} dicts
+        """
+        prefix = prefix.strip().lower()
+        qualities = cls.objects.filter(user=user)
+        order = ["-frequency", "name"] if by_frequency else ["name"]
+
+        if fuzzy and prefix:
+            if connection.vendor == "postgresql":
+                similarity = models.Func(
+                    models.F("name"),
+                    models.Value(prefix),
+                    function="similarity",
+                    output_field=models.FloatField(),
+                )
+                trigram_match = models.Func(
+                    models.F("name"),
+                    models.Value(prefix),
+                    template="%(expressions)s",
+                    arg_joiner=" %% ",
+                    output_field=models.BooleanField(),
+                )
+                qualities = qualities.filter(trigram_match).annotate(
+                    similarity=similarity
+                )
+                order = ["-similarity", *order]
+            else:
+                qualities = qualities.filter(name__contains=prefix)
+        elif prefix:
+            qualities = qualities.filter(name__startswith=prefix)
+
+        return list(
+            qualities.order_by(*order).values("id", "name", "frequency")[:limit]
+        )
+
+    @classmethod
+    def refresh_frequencies(
+        cls, quality_ids: Iterable[int], delete_orphans: bool = False
+    ) -> None:
+        """
+        Recount frequencies for several qualities with a single UPDATE.
+
+        Each row is set from an aggregated subquery over the Dream-Quality
+        through table, so the cost doesn't grow with the number of qualities.
+
+        Args:
+            quality_ids: IDs of the qualities whose dreams changed
+            delete_orphans: Also delete the qualities no dream uses any more
+        """
+        quality_ids = set(quality_ids)
+        if not quality_ids:
+            return
+
+        dream_counts = (
+            quality_links()
+            .filter(quality_id=models.OuterRef("pk"))
+            .order_by()
+            .values("quality_id")
+            .annotate(count=models.Count("dream_id"))
+            .values("count")
+        )
+        qualities = cls.objects.filter(pk__in=quality_ids)
+        qualities.update(
+            frequency=Coalesce(models.Subquery(dream_counts), models.Value(0))
+        )
+
+        if delete_orphans:
+            qualities.filter(frequency=0).delete()
+
+    def get_connections(
+        self,
+        limit: int | None = None,
+        min_strength: int = 1,
+        sample_size: int = DREAM_ID_SAMPLE_SIZE,
+    ) -> list[QualityConnection]:
         """
         Get all qualities that co-occur with this one as QualityConnection objects.
         Returns a list sorted by connection strength.
+
+        Runs as two queries on the Dream-Quality through table: a self-join
+        grouped by the other quality for the strengths, then a window over the
+        same join that keeps only the sample_size most recent shared dreams of
+        each connection, so neither grows with how many dreams are shared.
+        """
+        rows = (
+            quality_links()
+            .filter(dream__qualities=self)
+            .exclude(quality=self)
+            .values("quality_id", "quality__name")
+            .annotate(strength=models.Count("dream_id"))
+            .filter(strength__gte=min_strength)
+            .order_by("-strength", "quality__name")
+        )
+        if limit is not None:
+            rows = rows[:limit]
+        rows = list(rows)
+        if not rows:
+            return []
+
+        recent = (
+            quality_links()
+            .filter(dream__qualities=self)
+            .exclude(quality=self)
+            .annotate(
+                rank=models.Window(
+                    RowNumber(),
+                    partition_by=[models.F("quality_id")],
+                    order_by=models.F("dream_id").desc(),
+                )
+            )
+            .filter(rank__lte=sample_size)
+        )
+        if limit is not None:
+            recent = recent.filter(quality_id__in=[row["quality_id"] for row in rows])
+        samples: dict[int, list[int]] = defaultdict(list)
+        for quality_id, dream_id in recent.values_list("quality_id", "dream_id"):
+            samples[quality_id].append(dream_id)
+
+        return [
+            QualityConnection(
+                quality_id=row["quality_id"],
+                quality_name=row["quality__name"],
+                shared_dream_ids=sorted(samples[row["quality_id"]]),
+                connection_strength=row["strength"],
+            )
+            for row in rows
+        ]
+
+    def get_subgraph(
+        self,
+        hops: int = 1,
+        max_nodes: int = 50,
+        min_strength: int = 1,
+        dream_sample: int = 0,
+    ) -> QualitySubgraph:
         """
-        connections_dict: dict[int, list[int]] = defaultdict(list)
+        Get the neighbourhood of this quality within `hops` co-occurrence steps.
 
-        # Get all dreams with this quality using the correct relation
-        dreams = Dream.objects.filter(qualities=self).prefetch_related("qualities")
+        Reads only the QualityCooccurrence rows touching each hop's frontier, so
+        the full graph is never built. Stronger connections are expanded first,
+        and expansion stops once `max_nodes` qualities have been reached.
 
-        for dream in dreams:
-            for other_quality in dream.qualities.exclude(pk=self.pk):
-                connections_dict[other_quality.pk].append(dream.pk)
+        Args:
+            hops: Maximum distance from this quality
+            max_nodes: Maximum number of nodes, including this quality
+            min_strength: Minimum number of shared dreams for an edge
+            dream_sample: Number of most recent dream IDs per edge (0 for none)
+        """
+        distances = {self.pk: 0}
+        frontier = {self.pk}
+        truncated = False
 
-        # Convert to QualityConnection objects
-        connections = []
-        for quality_id, dream_ids in connections_dict.items():
-            try:
-                other_quality = Quality.objects.get(pk=quality_id)
-                connections.append(
-                    QualityConnection(
-                        quality_id=quality_id,
-                        quality_name=other_quality.name,
-                        shared_dream_ids=dream_ids,
-                        connection_strength=len(dream_ids),
-                    )
+        for hop in range(1, hops + 1):
+            if not frontier or truncated:
+                break
+            rows = (
+                QualityCooccurrence.objects.filter(
+                    user_id=self.user_id, dream_count__gte=min_strength
                 )
-            except Quality.DoesNotExist:
-                continue
+                .filter(
+                    models.Q(quality_a_id__in=frontier)
+                    | models.Q(quality_b_id__in=frontier)
+                )
+                .order_by("-dream_count")
+                .values_list("quality_a_id", "quality_b_id")
+            )
+            next_frontier = set()
+            for quality_a_id, quality_b_id in rows:
+                for source, target in (
+                    (quality_a_id, quality_b_id),
+                    (quality_b_id, quality_a_id),
+                ):
+                    if source in frontier and target not in distances:
+                        if len(distances) >= max_nodes:
+                            truncated = True
+                            break
+                        distances[target] = hop
+                        next_frontier.add(target)
+                if truncated:
+                    break
+            frontier = next_frontier
+
+        subgraph = QualitySubgraph(center_id=self.pk, truncated=truncated)
+
+        qualities = Quality.objects.filter(pk__in=distances).values_list(
+            "pk", "name", "frequency"
+        )
+        for quality_id, name, frequency in qualities:
+            subgraph.nodes.append(
+                QualitySubgraphNode(quality_id, name, frequency, distances[quality_id])
+            )
+        subgraph.nodes.sort(key=lambda n: (n.hops, -n.frequency, n.quality_name))
+
+        edge_fields = ["quality_a_id", "quality_b_id", "dream_count"]
+        if dream_sample > 0:
+            edge_fields.append("dream_ids")
+        edges = QualityCooccurrence.objects.filter(
+            quality_a_id__in=distances,
+            quality_b_id__in=distances,
+            dream_count__gte=min_strength,
+        ).values(*edge_fields)
+        for edge in edges:
+            subgraph.edges.append(
+                QualitySubgraphEdge(
+                    source_id=edge["quality_a_id"],
+                    target_id=edge["quality_b_id"],
+                    strength=edge["dream_count"],
+                    dream_ids=(
+                        edge["dream_ids"][-dream_sample:] if dream_sample > 0 else None
+                    ),
+                )
+            )
+        subgraph.edges.sort(key=lambda e: (-e.strength, e.source_id, e.target_id))
+
+        return subgraph
+
 
-        return sorted(connections, key=lambda c: c.connection_strength, reverse=True)
+class DreamQuerySet(models.QuerySet["Dream"]):
+    """
+    Access scopes for dreams, each shaped to use one composite index.
+    A single OR over owner and visibility can use neither index and needs a
+    DISTINCT once joins are added, so the scopes are kept separate.
+    """
+
+    def owned_by(self, user: User) -> "DreamQuerySet":
+        """Dreams written by the user; served by the (user, -created) index."""
+        return self.filter(user=user)
+
+    def public(self) -> "DreamQuerySet":
+        """Dreams shared in the Astral Plane; served by (is_public, -created)."""
+        return self.filter(is_public=True)
+
+    def visible_to(self, user: User) -> "DreamQuerySet":
+        """
+        The user's own dreams plus every public dream, for list views.
+        Each branch of the UNION is an index scan and UNION removes the overlap,
+        so no DISTINCT is needed and the result can still be filtered.
+        """
+        owned = Dream.objects.owned_by(user).order_by().values("pk")
+        shared = Dream.objects.public().order_by().values("pk")
+        return self.filter(pk__in=owned.union(shared))
+
+    def readable_by(self, user: User) -> "DreamQuerySet":
+        """
+        The same set as visible_to() for single-object lookups, where the
+        primary key picks the row and the OR is only a recheck.
+        """
+        return self.filter(models.Q(user=user) | models.Q(is_public=True))
+
+    def with_qualities(
+        self, quality_ids: Iterable[int], match_all: bool = False
+    ) -> "DreamQuerySet":
+        """
+        Dreams tagged with any of the qualities, or with every one of them.
+
+        Both are a semi-join against the (quality, dream) index of the through
+        table. For match_all the links are grouped by dream and only dreams
+        with one link per quality are kept (GROUP BY ... HAVING COUNT), so the
+        dream rows are never joined or de-duplicated.
+        """
+        quality_ids = set(quality_ids)
+        if not quality_ids:
+            return self.none()
+
+        links = quality_links().filter(quality_id__in=quality_ids).order_by()
+        if match_all and len(quality_ids) > 1:
+            links = (
+                links.values("dream_id")
+                .annotate(matched=models.Count("quality_id"))
+                .filter(matched=len(quality_ids))
+            )
+        return self.filter(pk__in=links.values("dream_id"))
 
 
 class Dream(models.Model):
@@ -198,6 +610,15 @@ class Dream(models.Model):
     # Dream content
     description = models.TextField(blank=True, help_text="Description of the dream")
 
+    # Search document, rebuilt by DreamSearchIndex whenever the description or
+    # qualities change
+    search_text = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Description and quality names, indexed for full-text search",
+    )
+
     # Dream qualities - many-to-many using default related_name (dream_set)
     qualities = models.ManyToManyField(
         Quality, blank=True, help_text="Single-word qualities describing this dream"
@@ -217,6 +638,8 @@ class Dream(models.Model):
         auto_now=True, help_text="When the dream entry was last modified"
     )
 
+    objects = DreamQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created"]  # Most recent dreams first
         indexes = [
@@ -227,11 +650,44 @@ class Dream(models.Model):
     def __str__(self) -> str:
         return f"Dream {self.pk} by {self.user.username} on {self.created.date()}"
 
+    def save(self, *args, **kwargs) -> None:
+        super().save(*args, **kwargs)
+        # post_save handlers have compared against the stored visibility
+        self._loaded_is_public = self.is_public
+
+    @property
+    def preview_images(self) -> list["Image"]:
+        """
+        The latest IMAGE_PREVIEW_COUNT images, newest first.
+        Uses the bounded prefetch stored in _preview_images when present.
+        """
+        prefetched: list[Image] | None = getattr(self, "_preview_images", None)
+        if prefetched is not None:
+            return prefetched
+        return list(self.images.order_by("-created")[:IMAGE_PREVIEW_COUNT])
+
+    @classmethod
+    def from_db(
+        cls, db: str | None, field_names: Collection[str], values: Collection[Any]
+    ) -> "Dream":
+        """Remember the stored visibility so saves can tell when it changes."""
+        instance = super().from_db(db, field_names, values)
+        if "is_public" in field_names:
+            instance._loaded_is_public = instance.is_public
+        return instance
+
     @classmethod
-    def build_quality_graph(cls, user: User) -> QualityGraph:
+    def build_quality_graph(
+        cls, user: User, dream_sample: int | None = None
+    ) -> QualityGraph:
         """
         Build a complete quality co-occurrence graph for a user.
-        This is more efficient than iterating through qualities individually.
+        Edges are read from the maintained QualityCooccurrence table, so the
+        cost does not depend on how many dreams the user has written.
+
+        With dream_sample, each edge keeps only its most recent dream IDs, read
+        from the end of the stored array in SQL, and strengths come from the
+        stored counts.
         """
         graph = QualityGraph()
 
@@ -240,29 +696,63 @@ class Dream(models.Model):
         for quality in qualities:
             graph.add_node(quality.pk, quality.name, quality.frequency)
 
-        # Then, fetch all dreams with their qualities in one query
-        dreams = cls.objects.filter(user=user).prefetch_related("qualities")
+        # Then, add one edge per co-occurring quality pair
+        pairs = QualityCooccurrence.objects.filter(user=user)
+        if dream_sample is None:
+            for quality_a_id, quality_b_id, dream_ids in pairs.values_list(
+                "quality_a_id", "quality_b_id", "dream_ids"
+            ):
+                graph.add_edges(quality_a_id, quality_b_id, dream_ids)
+            return graph
 
-        for dream in dreams:
-            qualities = list(dream.qualities.all())
-            # Only process if there are 2+ qualities
-            if len(qualities) >= 2:
-                for i, q1 in enumerate(qualities):
-                    for q2 in qualities[i + 1 :]:
-                        graph.add_edge(q1.pk, q2.pk, dream.pk)
+        recent = [
+            JSONArrayFromEnd("dream_ids", position)
+            for position in range(dream_sample, 0, -1)
+        ]
+        for quality_a_id, quality_b_id, strength, *dream_ids in pairs.values_list(
+            "quality_a_id", "quality_b_id", "dream_count", *recent
+        ):
+            graph.add_edges(
+                quality_a_id,
+                quality_b_id,
+                [pk for pk in dream_ids if pk is not None],
+                strength=strength,
+            )
 
         return graph
 
     @classmethod
-    def get_quality_statistics(cls, user: User) -> list[QualityStatistic]:
+    def get_quality_statistics(
+        cls, user: User, engine: str | None = None
+    ) -> list[QualityStatistic]:
         """
         Get quality statistics for word map visualization.
         Returns list of QualityStatistic objects sorted by frequency.
+
+        The engine defaults to settings.QUALITY_STATISTICS_ENGINE: "python" walks
+        the QualityGraph, "sparse" uses the NumPy/SciPy incidence-matrix engine.
+        Both return identical results.
         """
-        graph = cls.build_quality_graph(user)
+        engine = engine or settings.QUALITY_STATISTICS_ENGINE
+        if engine == "sparse":
+            from .services.quality_statistics import build_sparse_statistics
+
+            return build_sparse_statistics(user)
+
+        graph = cls.build_quality_graph(user, dream_sample=DREAM_ID_SAMPLE_SIZE)
         return graph.get_statistics()
 
 
+def quality_links() -> "models.QuerySet[Any]":
+    """
+    All rows of the Dream-Quality through table.
+
+    Typed loosely on purpose: django-stubs cannot resolve annotations on the
+    auto-created through model, so aggregates over it fail type checking.
+    """
+    return Dream.qualities.through.objects.all()
+
+
 class Image(models.Model):
     """Model for storing AI-generated images associated with dreams."""
 
@@ -310,3 +800,511 @@ class Image(models.Model):
 
     def __str__(self) -> str:
         return f"Image for Dream {self.dream.pk} ({self.generation_status})"
+
+
+class QualityCooccurrence(models.Model):
+    """
+    Maintained co-occurrence record for an unordered pair of a user's qualities.
+
+    Each row stores the dreams both qualities appear in. Pairs are stored with
+    ``quality_a_id < quality_b_id`` and are kept current by the handlers in
+    ``dreams.signals``, so the quality graph never has to walk every dream.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, help_text="The user who owns both qualities"
+    )
+
+    quality_a = models.ForeignKey(
+        Quality,
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text="The quality with the lower ID",
+    )
+
+    quality_b = models.ForeignKey(
+        Quality,
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text="The quality with the higher ID",
+    )
+
+    dream_count = models.PositiveIntegerField(
+        default=0, help_text="Number of dreams both qualities appear in"
+    )
+
+    dream_ids = models.JSONField(
+        default=list, help_text="Sorted IDs of the dreams both qualities appear in"
+    )
+
+    class Meta:
+        unique_together = [["quality_a", "quality_b"]]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(quality_a__lt=models.F("quality_b")),
+                name="dreams_cooccurrence_ordered_pair",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "-dream_count"]),  # For graph reads
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.quality_a_id} <-> {self.quality_b_id} ({self.dream_count})"
+
+    @staticmethod
+    def _ordered(quality1_id: int, quality2_id: int) -> tuple[int, int]:
+        """Return the pair with the lower quality ID first."""
+        if quality1_id < quality2_id:
+            return quality1_id, quality2_id
+        return quality2_id, quality1_id
+
+    @classmethod
+    def add_dream(cls, dream: Dream, added_ids: Iterable[int]) -> None:
+        """
+        Record a dream for every pair formed by newly added qualities.
+        Must be called after the qualities have been attached to the dream.
+        """
+        added = set(added_ids)
+        current = set(dream.qualities.values_list("pk", flat=True))
+        pairs = {cls._ordered(a, b) for a in added for b in current if a != b}
+        cls._apply(dream.user_id, dream.pk, pairs, add=True)
+
+    @classmethod
+    def remove_dream(cls, dream: Dream, removed_ids: Iterable[int]) -> None:
+        """
+        Forget a dream for every pair that involves one of the removed qualities.
+        Works both before removal (clear/delete) and after it (remove).
+        """
+        removed = set(removed_ids)
+        peers = removed | set(dream.qualities.values_list("pk", flat=True))
+        pairs = {cls._ordered(a, b) for a in removed for b in peers if a != b}
+        cls._apply(dream.user_id, dream.pk, pairs, add=False)
+
+    @classmethod
+    def _apply(
+        cls, user_id: int, dream_id: int, pairs: set[tuple[int, int]], add: bool
+    ) -> None:
+        """
+        Add or remove one dream from a set of pair rows.
+
+        Two transactions may both find a pair missing and try to create it;
+        the loser retries once, when the winner's row is visible and locked.
+        """
+        if not pairs:
+            return
+
+        for attempt in range(2):
+            try:
+                cls._apply_once(user_id, dream_id, pairs, add)
+                return
+            except IntegrityError:
+                if attempt:
+                    raise
+
+    @classmethod
+    def _apply_once(
+        cls, user_id: int, dream_id: int, pairs: set[tuple[int, int]], add: bool
+    ) -> None:
+        """One locked read-modify-write pass of _apply, in its own savepoint."""
+        with transaction.atomic():
+            rows = cls.objects.select_for_update().filter(
+                quality_a_id__in={a for a, _ in pairs},
+                quality_b_id__in={b for _, b in pairs},
+            )
+            existing = {(row.quality_a_id, row.quality_b_id): row for row in rows}
+
+            to_create = []
+            to_update = []
+            to_delete = []
+            for pair in pairs:
+                row = existing.get(pair)
+                if add:
+                    if row is None:
+                        to_create.append(
+                            cls(
+                                user_id=user_id,
+                                quality_a_id=pair[0],
+                                quality_b_id=pair[1],
+                                dream_count=1,
+                                dream_ids=[dream_id],
+                            )
+                        )
+                    elif dream_id not in row.dream_ids:
+                        row.dream_ids = sorted([*row.dream_ids, dream_id])
+                        row.dream_count = len(row.dream_ids)
+                        to_update.append(row)
+                elif row is not None and dream_id in row.dream_ids:
+                    row.dream_ids = [pk for pk in row.dream_ids if pk != dream_id]
+                    row.dream_count = len(row.dream_ids)
+                    if row.dream_ids:
+                        to_update.append(row)
+                    else:
+                        to_delete.append(row.pk)
+
+            if to_create:
+                QualityCooccurrence.objects.bulk_create(to_create)
+            if to_update:
+                cls.objects.bulk_update(to_update, ["dream_count", "dream_ids"])
+            if to_delete:
+                cls.objects.filter(pk__in=to_delete).delete()
+
+    @classmethod
+    def add_dreams(cls, user_id: int, links: Iterable[tuple[int, int]]) -> None:
+        """
+        Record many new dreams at once, e.g. a chunk of an import.
+        links must hold every (dream_id, quality_id) link of those dreams, so
+        the pairs come from the links alone and only their rows are read.
+        """
+        dream_qualities: dict[int, list[int]] = defaultdict(list)
+        for dream_id, quality_id in links:
+            dream_qualities[dream_id].append(quality_id)
+
+        pair_dreams: dict[tuple[int, int], set[int]] = defaultdict(set)
+        for dream_id, quality_ids in dream_qualities.items():
+            quality_ids.sort()
+            for i, q1 in enumerate(quality_ids):
+                for q2 in quality_ids[i + 1 :]:
+                    pair_dreams[(q1, q2)].add(dream_id)
+        if not pair_dreams:
+            return
+
+        # Retried once like _apply, if another transaction created a pair first
+        for attempt in range(2):
+            try:
+                cls._add_dreams_once(user_id, pair_dreams)
+                return
+            except IntegrityError:
+                if attempt:
+                    raise
+
+    @classmethod
+    def _add_dreams_once(
+        cls, user_id: int, pair_dreams: dict[tuple[int, int], set[int]]
+    ) -> None:
+        """One locked read-modify-write pass of add_dreams, in its own savepoint."""
+        with transaction.atomic():
+            rows = cls.objects.select_for_update().filter(
+                quality_a_id__in={a for a, _ in pair_dreams},
+                quality_b_id__in={b for _, b in pair_dreams},
+            )
+            existing = {(row.quality_a_id, row.quality_b_id): row for row in rows}
+
+            to_create = []
+            to_update = []
+            for pair, dream_ids in pair_dreams.items():
+                row = existing.get(pair)
+                if row is None:
+                    to_create.append(
+                        cls(
+                            user_id=user_id,
+                            quality_a_id=pair[0],
+                            quality_b_id=pair[1],
+                            dream_count=len(dream_ids),
+                            dream_ids=sorted(dream_ids),
+                        )
+                    )
+                else:
+                    row.dream_ids = sorted(set(row.dream_ids) | dream_ids)
+                    row.dream_count = len(row.dream_ids)
+                    to_update.append(row)
+
+            if to_create:
+                cls.objects.bulk_create(to_create, batch_size=1000)
+            if to_update:
+                cls.objects.bulk_update(
+                    to_update, ["dream_count", "dream_ids"], batch_size=1000
+                )
+
+    @classmethod
+    def remove_dreams(
+        cls, quality_ids: Iterable[int], dream_ids: Iterable[int]
+    ) -> None:
+        """
+        Forget many dreams at once, e.g. before a bulk delete.
+        Every pair a dream formed lies within the qualities it had, so only
+        rows with both sides in quality_ids are read.
+        """
+        quality_ids = set(quality_ids)
+        removed = set(dream_ids)
+        if not quality_ids or not removed:
+            return
+
+        with transaction.atomic():
+            rows = cls.objects.select_for_update().filter(
+                quality_a_id__in=quality_ids, quality_b_id__in=quality_ids
+            )
+            to_update = []
+            to_delete = []
+            for row in rows:
+                remaining = [pk for pk in row.dream_ids if pk not in removed]
+                if len(remaining) == len(row.dream_ids):
+                    continue
+                if remaining:
+                    row.dream_ids = remaining
+                    row.dream_count = len(remaining)
+                    to_update.append(row)
+                else:
+                    to_delete.append(row.pk)
+
+            if to_update:
+                cls.objects.bulk_update(
+                    to_update, ["dream_count", "dream_ids"], batch_size=1000
+                )
+            if to_delete:
+                cls.objects.filter(pk__in=to_delete).delete()
+
+    @classmethod
+    def rebuild_for_user(cls, user: User) -> None:
+        """Recompute every pair row for a user from the dream-quality links."""
+        dream_qualities: dict[int, list[int]] = defaultdict(list)
+        links = Dream.qualities.through.objects.filter(dream__user=user).values_list(
+            "dream_id", "quality_id"
+        )
+        for dream_id, quality_id in links:
+            dream_qualities[dream_id].append(quality_id)
+
+        pair_dreams: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for dream_id, quality_ids in dream_qualities.items():
+            quality_ids.sort()
+            for i, q1 in enumerate(quality_ids):
+                for q2 in quality_ids[i + 1 :]:
+                    pair_dreams[(q1, q2)].append(dream_id)
+
+        with transaction.atomic():
+            QualityCooccurrence.objects.filter(user=user).delete()
+            QualityCooccurrence.objects.bulk_create(
+                [
+                    cls(
+                        user=user,
+                        quality_a_id=quality_a_id,
+                        quality_b_id=quality_b_id,
+                        dream_count=len(dream_ids),
+                        dream_ids=sorted(dream_ids),
+                    )
+                    for (quality_a_id, quality_b_id), dream_ids in pair_dreams.items()
+                ],
+                batch_size=1000,
+            )
+
+
+class UserJournalStats(models.Model):
+    """
+    Maintained summary counters of one user's journal.
+
+    Single-row writes adjust the counters in place with F() expressions inside
+    the writing transaction (see ``dreams.signals``); bulk paths and the
+    ``rebuild_journal_stats`` command recount them from the journal tables.
+    """
+
+    # Counters recount() can refresh, each from one aggregate subquery
+    COUNTERS = (
+        "dream_count",
+        "public_dream_count",
+        "quality_count",
+        "image_count",
+        "last_dream_at",
+    )
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="journal_stats",
+        help_text="The user whose journal is summarized",
+    )
+
+    dream_count = models.PositiveIntegerField(
+        default=0, help_text="Number of dreams the user has written"
+    )
+
+    public_dream_count = models.PositiveIntegerField(
+        default=0, help_text="Number of the user's dreams shared in The Astral Plane"
+    )
+
+    quality_count = models.PositiveIntegerField(
+        default=0, help_text="Number of qualities the user has"
+    )
+
+    image_count = models.PositiveIntegerField(
+        default=0, help_text="Number of images generated for the user's dreams"
+    )
+
+    last_dream_at = models.DateTimeField(
+        null=True, blank=True, help_text="When the user's newest dream was created"
+    )
+
+    class Meta:
+        verbose_name_plural = "user journal stats"
+
+    def __str__(self) -> str:
+        return f"Journal stats of user {self.user_id}"
+
+    @staticmethod
+    def _actual() -> dict[str, models.Expression | models.Subquery]:
+        """Expressions computing each counter for the user in OuterRef("pk")."""
+
+        def count(queryset: models.QuerySet, user_field: str) -> models.Expression:
+            counts = (
+                queryset.filter(**{user_field: models.OuterRef("pk")})
+                .order_by()
+                .values(user_field)
+                .annotate(count=models.Count("pk"))
+                .values("count")
+            )
+            return Coalesce(models.Subquery(counts), models.Value(0))
+
+        dreams = Dream.objects.all()
+        return {
+            "dream_count": count(dreams, "user"),
+            "public_dream_count": count(dreams.filter(is_public=True), "user"),
+            "quality_count": count(Quality.objects.all(), "user"),
+            "image_count": count(Image.objects.all(), "dream__user"),
+            "last_dream_at": models.Subquery(
+                dreams.filter(user=models.OuterRef("pk"))
+                .order_by("-created")
+                .values("created")[:1]
+            ),
+        }
+
+    @classmethod
+    def actual(cls, user_ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        """The counters recomputed from the journal tables, by user ID."""
+        rows = (
+            User.objects.filter(pk__in=list(user_ids))
+            .annotate(**cls._actual())
+            .values("pk", *cls.COUNTERS)
+        )
+        return {row.pop("pk"): row for row in rows}
+
+    @classmethod
+    def rebuild(cls, user_ids: Iterable[int]) -> None:
+        """Recompute and store the counters of several users, creating rows."""
+        UserJournalStats.objects.bulk_create(
+            [
+                cls(user_id=user_id, **counters)
+                for user_id, counters in cls.actual(user_ids).items()
+            ],
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=list(cls.COUNTERS),
+            batch_size=1000,
+        )
+
+    @classmethod
+    def for_user(cls, user: User) -> "UserJournalStats":
+        """The user's counters, built on first use."""
+        stats = cls.objects.filter(user=user).first()
+        if stats is None:
+            cls.rebuild([user.pk])
+            stats = cls.objects.get(user=user)
+        return stats
+
+    @classmethod
+    def adjust(
+        cls,
+        user_id: int,
+        dreams: int = 0,
+        public_dreams: int = 0,
+        qualities: int = 0,
+        images: int = 0,
+        last_dream_at: datetime | None = None,
+    ) -> None:
+        """
+        Apply counter deltas for a single written row, in one UPDATE.
+        Users without a row are skipped; for_user() builds it when first read.
+        """
+        changes: dict[str, models.Expression] = {}
+        for name, delta in [
+            ("dream_count", dreams),
+            ("public_dream_count", public_dreams),
+            ("quality_count", qualities),
+            ("image_count", images),
+        ]:
+            if delta:
+                changes[name] = Greatest(models.F(name) + delta, models.Value(0))
+        if last_dream_at is not None:
+            changes["last_dream_at"] = Greatest(
+                Coalesce("last_dream_at", models.Value(last_dream_at)),
+                models.Value(last_dream_at),
+            )
+        if changes:
+            cls.objects.filter(user_id=user_id).update(**changes)
+
+    @classmethod
+    def recount(cls, user_id: int, *counters: str) -> None:
+        """
+        Refresh some counters from the journal tables, in one UPDATE.
+        For writes whose effect on a counter isn't known (conflict-ignoring
+        inserts, deleting the newest dream).
+        """
+        actual = cls._actual()
+        cls.objects.filter(user_id=user_id).update(
+            **{
+                name: models.Subquery(
+                    User.objects.filter(pk=models.OuterRef("user_id"))
+                    .annotate(value=actual[name])
+                    .values("value")
+                )
+                for name in counters
+            }
+        )
+
+
+class ChangeStamp(models.Model):
+    """
+    Marker of the last write in a scope: a user ID, or "public" for writes the
+    Astral Plane can show.
+
+    Stamps are rows rather than cache entries so that writes made by any
+    gunicorn or Celery process invalidate every process's conditional GETs.
+    """
+
+    scope = models.CharField(
+        max_length=32,
+        primary_key=True,
+        help_text='The user ID as text, or "public"',
+    )
+
+    token = models.CharField(
+        max_length=32, help_text="Opaque marker replaced on every write"
+    )
+
+    changed = models.DateTimeField(help_text="When the scope was last written")
+
+    def __str__(self) -> str:
+        return f"Change stamp of {self.scope}"
+
+
+class BackgroundJob(models.Model):
+    """
+    Owner of a Celery job started on a user's behalf.
+
+    Kept in the database so a job's status can be read from any gunicorn
+    process, not only the one that queued it.
+    """
+
+    task_id = models.CharField(
+        max_length=255, primary_key=True, help_text="The Celery task ID"
+    )
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="background_jobs",
+        help_text="The user the job runs for",
+    )
+
+    task_name = models.CharField(max_length=255, help_text="The queued task")
+
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "created"], name="dreams_backgroundjob_user_idx"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task_name} {self.task_id} for user {self.user_id}"
@@ -71,9 +71,10 @@ class DreamQualityViewSet(viewsets.ViewSet):
         quality = self.get_quality(pk)
 
         # Add quality to dream if not already present
+        # (the m2m_changed handler recounts the frequency)
         if not dream.qualities.filter(pk=quality.pk).exists():
             dream.qualities.add(quality)
-            quality.update_frequency()
+            quality.refresh_from_db(fields=["frequency"])
 
         serializer = QualitySerializer(quality, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -98,15 +99,8 @@ class DreamQualityViewSet(viewsets.ViewSet):
         quality = self.get_quality(pk)
 
         # Remove quality from dream if present
+        # (the m2m_changed handler recounts the frequency and deletes orphans)
         if dream.qualities.filter(pk=quality.pk).exists():
             dream.qualities.remove(quality)
 
-            # Update frequency and check if quality should be deleted
-            new_frequency = Dream.objects.filter(qualities=quality).count()
-            if new_frequency == 0:
-                quality.delete()
-            else:
-                quality.frequency = new_frequency
-                quality.save(update_fields=["frequency"])
-
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,4 +1,16 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
 
 
 class DynamicPageSizePagination(PageNumberPagination):
@@ -9,3 +21,117 @@ class DynamicPageSizePagination(PageNumberPagination):
     page_size = 20  # Default page size
     page_size_query_param = "page_size"  # Allow client to override page size
     max_page_size = 100  # Maximum page size to prevent abuse
+
+
+def approximate_count(queryset: QuerySet) -> int:
+    """
+    Estimate the number of rows a queryset returns.
+    Uses the planner's row estimate on Postgres (no scan) and COUNT elsewhere.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class DreamCursorPagination(BasePagination):
+    """
+    Keyset pagination for dream lists on (-created, id).
+
+    Each page seeks past the last row of the previous one instead of using an
+    OFFSET, so pages cost the same however deep the client goes, ride the
+    (user, -created) and (is_public, -created) indexes and never run a COUNT.
+    Pass ?total=approx to include an estimated total count.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    total_query_param = "total"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    @staticmethod
+    def encode_cursor(created: datetime, pk: int) -> str:
+        """Encode the position after a row as an opaque cursor."""
+        position = f"{created.isoformat()}|{pk}"
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple[datetime, int]:
+        """Decode a cursor into the (created, id) of the last row seen."""
+        try:
+            position = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created, pk = position.rsplit("|", 1)
+            return datetime.fromisoformat(created), int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list:
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        self.total = None
+        if request.query_params.get(self.total_query_param) == "approx":
+            self.total = approximate_count(queryset)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created__lt=created) | Q(created=created, pk__gt=pk)
+            )
+
+        rows = list(queryset.order_by("-created", "pk")[: page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        # Pages of values() rows hold dicts rather than model instances
+        if isinstance(last, dict):
+            created, pk = last["created"], last["id"]
+        else:
+            created, pk = last.created, last.pk
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(created, pk),
+        )
+
+    def get_paginated_response(self, data: list) -> Response:
+        payload: dict[str, object] = {"next": self.get_next_link()}
+        if self.total is not None:
+            payload["count"] = self.total
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {"type": "integer"},
+                "results": schema,
+            },
+        }
@@ -10,9 +10,9 @@ if TYPE_CHECKING:
 
 
 class HasUser(Protocol):
-    """Protocol for objects that have a user attribute."""
+    """Protocol for objects that have a user foreign key."""
 
-    user: object
+    user_id: int
 
 
 class IsAuthenticatedAndOwner(permissions.BasePermission):
@@ -29,7 +29,7 @@ class IsAuthenticatedAndOwner(permissions.BasePermission):
         self, request: Request, _view: ViewSet, obj: HasUser
     ) -> bool:
         """Check if the authenticated user owns the object."""
-        return obj.user == request.user
+        return obj.user_id == request.user.pk
 
 
 class IsAuthenticatedAndIsOwnerOrIsPublic(permissions.BasePermission):
@@ -53,7 +53,7 @@ class IsAuthenticatedAndIsOwnerOrIsPublic(permissions.BasePermission):
         - Write access: owner only
         """
         # Owner has full access
-        if obj.user == request.user:
+        if obj.user_id == request.user.pk:
             return True
 
         # For non-owners, only allow read access to public dreams
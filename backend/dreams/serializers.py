@@ -1,8 +1,22 @@
+from collections.abc import Iterable
 from typing import Any
 
+from django.db import transaction
 from rest_framework import serializers
 
-from .models import Dream, Image, Quality
+from .models import (
+    DREAM_ID_SAMPLE_SIZE,
+    Dream,
+    Image,
+    Quality,
+    QualityConnection,
+    QualityStatistic,
+    UserJournalStats,
+)
+from .services.quality_graph_cache import QualityGraphCache
+
+# Characters of the description kept in description_preview (cut in SQL)
+DESCRIPTION_PREVIEW_LENGTH = 200
 
 
 class QualitySerializer(serializers.ModelSerializer):
@@ -15,13 +29,21 @@ class QualitySerializer(serializers.ModelSerializer):
 
 
 class QualityConnectionSerializer(serializers.Serializer):
-    """Serializer for QualityConnection dataclass."""
+    """
+    Serializer for QualityConnection dataclass.
+    Only a bounded sample of the most recent shared dream IDs is included;
+    connection_strength carries the full count.
+    """
 
     quality_id = serializers.IntegerField()
     quality_name = serializers.CharField()
-    shared_dream_ids = serializers.ListField(child=serializers.IntegerField())
+    shared_dream_ids = serializers.SerializerMethodField()
     connection_strength = serializers.IntegerField()
 
+    def get_shared_dream_ids(self, obj: QualityConnection) -> list[int]:
+        """Return the most recent shared dream IDs, up to the sample size."""
+        return obj.shared_dream_ids[-DREAM_ID_SAMPLE_SIZE:]
+
 
 class QualityStatisticSerializer(serializers.Serializer):
     """Serializer for QualityStatistic dataclass."""
@@ -31,9 +53,39 @@ class QualityStatisticSerializer(serializers.Serializer):
     frequency = serializers.IntegerField()
     total_connections = serializers.IntegerField()
     top_connections = QualityConnectionSerializer(many=True)
-    all_dream_ids = serializers.ListField(
-        child=serializers.IntegerField(), required=False
-    )
+    all_dream_ids = serializers.SerializerMethodField()
+
+    def get_all_dream_ids(self, obj: QualityStatistic) -> list[int]:
+        """Return the most recent dream IDs, up to the sample size."""
+        return obj.all_dream_ids[-DREAM_ID_SAMPLE_SIZE:]
+
+
+class QualitySubgraphNodeSerializer(serializers.Serializer):
+    """Serializer for QualitySubgraphNode dataclass."""
+
+    id = serializers.IntegerField(source="quality_id")
+    name = serializers.CharField(source="quality_name")
+    frequency = serializers.IntegerField()
+    hops = serializers.IntegerField()
+
+
+class QualitySubgraphEdgeSerializer(serializers.Serializer):
+    """Serializer for QualitySubgraphEdge dataclass."""
+
+    # Shadows Field.source on the serializer class, which DRF allows
+    source = serializers.IntegerField(source="source_id")  # type: ignore[assignment]
+    target = serializers.IntegerField(source="target_id")
+    strength = serializers.IntegerField()
+    dream_ids = serializers.ListField(child=serializers.IntegerField(), allow_null=True)
+
+
+class QualitySubgraphSerializer(serializers.Serializer):
+    """Serializer for QualitySubgraph dataclass."""
+
+    center = serializers.IntegerField(source="center_id")
+    nodes = QualitySubgraphNodeSerializer(many=True)
+    edges = QualitySubgraphEdgeSerializer(many=True)
+    truncated = serializers.BooleanField()
 
 
 class ImageSerializer(serializers.ModelSerializer):
@@ -49,7 +101,7 @@ class DreamSerializer(serializers.ModelSerializer):
     """Serializer for Dream model."""
 
     qualities = QualitySerializer(many=True, read_only=True)
-    images = ImageSerializer(many=True, read_only=True)
+    images = ImageSerializer(many=True, read_only=True, source="preview_images")
     quality_ids = serializers.ListField(
         child=serializers.IntegerField(), write_only=True, required=False
     )
@@ -59,6 +111,7 @@ class DreamSerializer(serializers.ModelSerializer):
     # Add public field and ownership check (no username for anonymous sharing)
     is_public = serializers.BooleanField(required=False, default=False)
     is_owner = serializers.SerializerMethodField()
+    image_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Dream
@@ -67,6 +120,7 @@ class DreamSerializer(serializers.ModelSerializer):
             "description",
             "qualities",
             "images",
+            "image_count",
             "quality_ids",
             "quality_names",
             "is_public",
@@ -74,15 +128,31 @@ class DreamSerializer(serializers.ModelSerializer):
             "created",
             "updated",
         ]
-        read_only_fields = ["id", "images", "is_owner", "created", "updated"]
+        read_only_fields = [
+            "id",
+            "images",
+            "image_count",
+            "is_owner",
+            "created",
+            "updated",
+        ]
 
     def get_is_owner(self, obj: Dream) -> bool:
         """Check if requesting user owns this dream."""
         request = self.context.get("request")
         if request and hasattr(request, "user"):
-            return obj.user == request.user
+            # Compare IDs so the owner row is never loaded
+            return obj.user_id == request.user.pk
         return False
 
+    def get_image_count(self, obj: Dream) -> int:
+        """Total number of images; `images` only holds the latest few."""
+        count = getattr(obj, "image_count", None)
+        if count is None:
+            return obj.images.count()
+        return int(count)
+
+    @transaction.atomic
     def create(self, validated_data: dict[str, Any]) -> Dream:
         """Create a dream with quality handling."""
         quality_ids = validated_data.pop("quality_ids", [])
@@ -91,15 +161,7 @@ class DreamSerializer(serializers.ModelSerializer):
         dream = Dream.objects.create(**validated_data)
 
         # Handle quality names - create new qualities or get existing ones
-        user_qualities = []
-        if quality_names:
-            for name in quality_names:
-                name = name.strip().lower()
-                if name:  # Skip empty names
-                    quality, _created = Quality.objects.get_or_create(
-                        name=name, user=dream.user
-                    )
-                    user_qualities.append(quality)
+        user_qualities = Quality.get_or_create_many(dream.user, quality_names)
 
         # Handle quality IDs - existing qualities
         if quality_ids:
@@ -112,8 +174,10 @@ class DreamSerializer(serializers.ModelSerializer):
         if user_qualities:
             dream.qualities.set(user_qualities)
 
+        QualityGraphCache.bump_version(dream.user_id)
         return dream
 
+    @transaction.atomic
     def update(self, instance: Dream, validated_data: dict[str, Any]) -> Dream:
         """Update a dream and its qualities."""
         quality_ids = validated_data.pop("quality_ids", None)
@@ -129,13 +193,7 @@ class DreamSerializer(serializers.ModelSerializer):
 
         # Handle quality names - create new qualities or get existing ones
         if quality_names is not None:
-            for name in quality_names:
-                name = name.strip().lower()
-                if name:  # Skip empty names
-                    quality, _created = Quality.objects.get_or_create(
-                        name=name, user=instance.user
-                    )
-                    user_qualities.append(quality)
+            user_qualities = Quality.get_or_create_many(instance.user, quality_names)
 
         # Handle quality IDs - existing qualities
         elif quality_ids is not None:
@@ -148,33 +206,119 @@ class DreamSerializer(serializers.ModelSerializer):
         if quality_names is not None or quality_ids is not None:
             instance.qualities.set(user_qualities)
 
+        QualityGraphCache.bump_version(instance.user_id)
         return instance
 
 
-class DreamListSerializer(serializers.ModelSerializer):
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    """
+    Model serializer whose output can be narrowed per request.
+
+    `fields` keeps only the named fields and `expand` adds nested relations
+    (from expandable_fields) on top. Without `fields`, every field except the
+    optional_fields is rendered, as before.
+    """
+
+    optional_fields: tuple[str, ...] = ()
+    expandable_fields: tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        *args,
+        fields: Iterable[str] | None = None,
+        expand: Iterable[str] = (),
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        if fields is None:
+            keep = set(self.fields) - set(self.optional_fields)
+        else:
+            keep = set(fields) | set(expand)
+        for name in set(self.fields) - keep:
+            self.fields.pop(name)
+
+
+class DreamListSerializer(SparseFieldsetSerializer):
     """Lightweight serializer for dream lists."""
 
     qualities = QualitySerializer(many=True, read_only=True)
-    images = ImageSerializer(many=True, read_only=True)
+    images = ImageSerializer(many=True, read_only=True, source="preview_images")
     is_public = serializers.BooleanField(read_only=True)
     is_owner = serializers.SerializerMethodField()
+    image_count = serializers.SerializerMethodField()
+    description_preview = serializers.CharField(read_only=True)
+    quality_names = serializers.SerializerMethodField()
+
+    optional_fields = ("description_preview", "quality_names", "updated")
+    expandable_fields = ("qualities", "images")
 
     class Meta:
         model = Dream
         fields = [
             "id",
             "description",
+            "description_preview",
             "qualities",
+            "quality_names",
             "images",
+            "image_count",
+            "is_public",
+            "is_owner",
+            "created",
+            "updated",
+        ]
+        read_only_fields = [
+            "id",
+            "image_count",
             "is_public",
             "is_owner",
             "created",
+            "updated",
         ]
-        read_only_fields = ["id", "is_public", "is_owner", "created"]
 
     def get_is_owner(self, obj: Dream) -> bool:
         """Check if requesting user owns this dream."""
         request = self.context.get("request")
         if request and hasattr(request, "user"):
-            return obj.user == request.user
+            # Compare IDs so the owner row is never loaded
+            return obj.user_id == request.user.pk
         return False
+
+    def get_image_count(self, obj: Dream) -> int:
+        """Total number of images; `images` only holds the latest few."""
+        count = getattr(obj, "image_count", None)
+        if count is None:
+            return obj.images.count()
+        return int(count)
+
+    def get_quality_names(self, obj: Dream) -> list[str]:
+        """Names of the dream's qualities, without the nested objects."""
+        return [quality.name for quality in obj.qualities.all()]
+
+
+class DreamImportRowSerializer(serializers.Serializer):
+    """Validates one row of a dream import file."""
+
+    description = serializers.CharField()
+    qualities = serializers.ListField(
+        child=serializers.CharField(min_length=2, max_length=128),
+        required=False,
+        default=list,
+    )
+    is_public = serializers.BooleanField(required=False, default=False)
+    created = serializers.DateTimeField(required=False)
+
+
+class UserJournalStatsSerializer(serializers.ModelSerializer):
+    """Serializer for a user's journal summary counters."""
+
+    class Meta:
+        model = UserJournalStats
+        fields = [
+            "dream_count",
+            "public_dream_count",
+            "quality_count",
+            "image_count",
+            "last_dream_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,66 @@
+"""
+Dispatch and status lookup for long-running per-user Celery jobs.
+"""
+
+from datetime import timedelta
+from typing import Any
+
+from django.utils import timezone
+
+from dreams.models import BackgroundJob
+
+# How long a job's owner is remembered, and so how long its status can be read
+JOB_OWNER_TIMEOUT = timedelta(days=1)
+
+
+class BackgroundJobs:
+    """
+    Celery jobs started on behalf of a user.
+
+    The owner of every job is recorded in a BackgroundJob row when it is
+    queued, so only that user can read its status, from any process. Tasks
+    report progress through
+    update_state(state="PROGRESS", meta={"done": ..., "total": ...}).
+    """
+
+    @classmethod
+    def start(cls, user_id: int, task_name: str, args: list[Any]) -> str:
+        """Queue a task by name for a user and return its task ID."""
+        from dream_journal.celery import app as celery_app
+
+        result = celery_app.send_task(task_name, args=args)
+        BackgroundJob.objects.create(
+            task_id=str(result.id), user_id=user_id, task_name=task_name
+        )
+        # Forget the user's expired jobs while here
+        BackgroundJob.objects.filter(
+            user_id=user_id, created__lt=timezone.now() - JOB_OWNER_TIMEOUT
+        ).delete()
+        return str(result.id)
+
+    @classmethod
+    def status(cls, user_id: int, task_id: str) -> dict[str, Any] | None:
+        """
+        Get the state, progress and result of a user's job.
+        Returns None if the job is unknown or belongs to another user.
+        """
+        owned = BackgroundJob.objects.filter(
+            task_id=task_id,
+            user_id=user_id,
+            created__gte=timezone.now() - JOB_OWNER_TIMEOUT,
+        )
+        if not owned.exists():
+            return None
+
+        from dream_journal.celery import app as celery_app
+
+        result = celery_app.AsyncResult(task_id)
+        payload: dict[str, Any] = {"task_id": task_id, "state": result.state}
+        if result.state == "PROGRESS" and isinstance(result.info, dict):
+            payload["done"] = result.info.get("done", 0)
+            payload["total"] = result.info.get("total", 0)
+        elif result.state == "SUCCESS":
+            payload["result"] = result.result
+        elif result.state == "FAILURE":
+            payload["error"] = str(result.info)
+        return payload
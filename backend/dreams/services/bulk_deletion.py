@@ -0,0 +1,130 @@
+"""
+Batched deletion of dreams and whole accounts.
+
+Deleting dreams one by one runs the per-row signal handlers for every dream,
+each recounting qualities and rewriting co-occurrence and search rows. These paths turn
+the handlers off, delete in fixed-size batches and repair the aggregates once.
+"""
+
+import logging
+from collections.abc import Callable, Iterable
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from dreams.models import (
+    ChangeStamp,
+    Dream,
+    Quality,
+    QualityCooccurrence,
+    UserJournalStats,
+)
+from dreams.signals import suppress_dream_signals
+
+from .conditional_requests import ChangeStamps
+from .dream_search import DreamSearchIndex
+from .public_feed_cache import PublicFeedCache
+from .quality_graph_cache import QualityGraphCache
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+# Called with (done, total) after every batch
+ProgressCallback = Callable[[int, int], None]
+
+
+def _batches(ids: list[int]) -> Iterable[list[int]]:
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start : start + BATCH_SIZE]
+
+
+def delete_dreams(
+    user: User,
+    dream_ids: Iterable[int] | None = None,
+    progress: ProgressCallback | None = None,
+) -> int:
+    """
+    Delete a user's dreams in batches and fix frequencies once at the end.
+
+    Args:
+        user: The user owning the dreams
+        dream_ids: Dreams to delete; IDs of other users' dreams are ignored.
+            None deletes every dream of the user.
+        progress: Optional callback reporting (done, total) after each batch
+
+    Returns:
+        The number of dreams deleted
+    """
+    dreams = Dream.objects.filter(user=user)
+    if dream_ids is not None:
+        dreams = dreams.filter(pk__in=list(dream_ids))
+    ids = list(dreams.order_by("pk").values_list("pk", flat=True))
+
+    affected: set[int] = set()
+    done = 0
+    try:
+        with suppress_dream_signals():
+            for batch in _batches(ids):
+                with transaction.atomic():
+                    quality_ids = set(
+                        Dream.qualities.through.objects.filter(
+                            dream_id__in=batch
+                        ).values_list("quality_id", flat=True)
+                    )
+                    QualityCooccurrence.remove_dreams(quality_ids, batch)
+                    Dream.objects.filter(pk__in=batch).delete()
+                    DreamSearchIndex.remove(batch)
+                affected |= quality_ids
+                done += len(batch)
+                if progress is not None:
+                    progress(done, len(ids))
+    finally:
+        # Committed batches are repaired even if a later one failed
+        if affected:
+            Quality.refresh_frequencies(affected, delete_orphans=True)
+        if done:
+            UserJournalStats.rebuild([user.pk])
+            QualityGraphCache.bump_version(user.pk)
+            ChangeStamps.touch(user.pk)
+            PublicFeedCache.bump_version()
+
+    logger.info(f"Bulk deleted {done} dreams for user {user.pk}")
+    return done
+
+
+def delete_user(user: User, progress: ProgressCallback | None = None) -> int:
+    """
+    Delete a user account and all of its journal data.
+
+    Dreams go first in batches; the qualities and co-occurrence rows left
+    behind are removed by the final cascade, so no aggregate is recounted.
+
+    Returns:
+        The number of dreams deleted
+    """
+    user_id = user.pk
+    ids = list(
+        Dream.objects.filter(user=user).order_by("pk").values_list("pk", flat=True)
+    )
+
+    done = 0
+    with suppress_dream_signals():
+        for batch in _batches(ids):
+            with transaction.atomic():
+                Dream.objects.filter(pk__in=batch).delete()
+                DreamSearchIndex.remove(batch)
+            done += len(batch)
+            if progress is not None:
+                progress(done, len(ids))
+
+        with transaction.atomic():
+            QualityCooccurrence.objects.filter(user=user).delete()
+            Quality.objects.filter(user=user).delete()
+            ChangeStamp.objects.filter(scope=str(user_id)).delete()
+            user.delete()
+        if done:
+            PublicFeedCache.bump_version()
+
+    logger.info(f"Deleted user {user_id} with {done} dreams")
+    return done
@@ -0,0 +1,92 @@
+"""
+Work collected during a transaction and run once after it commits.
+"""
+
+import threading
+import weakref
+from typing import ClassVar, Self
+
+from django.db import transaction
+
+
+class CommitBatch:
+    """
+    State collected during one transaction and acted on once it commits.
+
+    Subclasses hold what they collect and implement run(). Callers add to the
+    batch returned by current(), so the several signals one save fans out into
+    cost one unit of work per transaction.
+    """
+
+    # Batches run in ascending order, so work that publishes results (change
+    # stamps) can run after the work that produces them
+    order: ClassVar[int] = 0
+
+    @classmethod
+    def current(cls) -> Self | None:
+        """
+        Get this class's batch for the current transaction.
+        Returns None outside a transaction, where work should run immediately.
+        """
+        batches = CommitBatches.current()
+        if batches is None:
+            return None
+        batch = batches.pending.get(cls)
+        if not isinstance(batch, cls):
+            batch = cls()
+            batches.pending[cls] = batch
+        return batch
+
+    def run(self) -> None:
+        """Act on everything collected; called once, after the commit."""
+        raise NotImplementedError
+
+
+class CommitBatches:
+    """
+    The batches of one transaction, run by a single on_commit callback.
+
+    The thread only keeps a weak reference; the callback Django holds is what
+    keeps the batches alive, so they disappear with it when the transaction
+    (or the savepoint that created them) rolls back. Batches requested while
+    the callback runs (a recount touching change stamps) join the same pass.
+    """
+
+    _local = threading.local()
+
+    def __init__(self) -> None:
+        self.pending: dict[type[CommitBatch], CommitBatch] = {}
+        self.running = False
+        self.done = False
+
+    @classmethod
+    def current(cls) -> "CommitBatches | None":
+        """The batches of the current transaction, None outside one."""
+        ref: weakref.ref[CommitBatches] | None = getattr(cls._local, "ref", None)
+        batches = ref() if ref is not None else None
+        if batches is not None and batches.running:
+            return batches
+        if not transaction.get_connection().in_atomic_block:
+            return None
+        if batches is None or batches.done:
+            batches = cls()
+            cls._local.ref = weakref.ref(batches)
+        # Registered on every call so the batches also run if a savepoint
+        # holding an earlier registration is rolled back; only the first call
+        # finds work
+        transaction.on_commit(batches.run)
+        return batches
+
+    def run(self) -> None:
+        """Run every pending batch, lowest order first."""
+        if self.done:
+            return
+        self.running = True
+        try:
+            while self.pending:
+                batch_class = min(self.pending, key=lambda c: c.order)
+                self.pending.pop(batch_class).run()
+        finally:
+            self.running = False
+            self.done = True
+            self.pending.clear()
@@ -0,0 +1,202 @@
+"""
+Validators for conditional GETs and If-Match on dream writes.
+"""
+
+import hashlib
+import uuid
+from collections.abc import Iterable
+from datetime import datetime
+
+from django.utils import timezone
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from dreams.models import ChangeStamp
+
+from .commit_batches import CommitBatch
+
+# Scope of the stamp touched by every write the Astral Plane can show
+PUBLIC_SCOPE = "public"
+
+# Signed image URLs last an hour; revalidations after this long get fresh ones
+SIGNED_URL_REFRESH = 30 * 60
+
+
+class ChangeStamps:
+    """
+    Per-user change stamps, plus one for public dreams.
+
+    Every write to a user's dreams, qualities or images replaces the user's
+    stamp, and writes the Astral Plane can show replace the public one, so a
+    list's validators only need the stamps of the scopes it reads: one primary
+    key lookup, however large the list.
+    """
+
+    @staticmethod
+    def _new(scope: int | str) -> ChangeStamp:
+        return ChangeStamp(
+            scope=str(scope), token=uuid.uuid4().hex, changed=timezone.now()
+        )
+
+    @classmethod
+    def get_many(cls, scopes: Iterable[int | str]) -> list[ChangeStamp]:
+        """Get the stamps of user IDs or PUBLIC_SCOPE, creating missing ones."""
+        keys = [str(scope) for scope in scopes]
+        stamps = ChangeStamp.objects.in_bulk(keys)
+        missing = [cls._new(key) for key in keys if key not in stamps]
+        if missing:
+            # If a concurrent request created one first, this response's
+            # validators just won't match the next request's: one extra 200
+            ChangeStamp.objects.bulk_create(missing, ignore_conflicts=True)
+            stamps.update((stamp.scope, stamp) for stamp in missing)
+        return [stamps[key] for key in keys]
+
+    @classmethod
+    def get(cls, scope: int | str) -> ChangeStamp:
+        """Get the stamp of a user ID or PUBLIC_SCOPE, creating one if missing."""
+        return cls.get_many([scope])[0]
+
+    @classmethod
+    def touch(cls, *scopes: int | str) -> None:
+        """
+        Replace the stamps of scopes.
+        Published on commit so a concurrent request can't validate pre-commit data.
+        """
+        batch = ChangeStampBatch.current()
+        if batch is None:
+            cls.publish(set(map(str, scopes)))
+            return
+        batch.scopes.update(map(str, scopes))
+
+    @classmethod
+    def publish(cls, scopes: set[str]) -> None:
+        """Replace the stamps of scopes now, with one upsert."""
+        if not scopes:
+            return
+        ChangeStamp.objects.bulk_create(
+            [cls._new(scope) for scope in scopes],
+            update_conflicts=True,
+            unique_fields=["scope"],
+            update_fields=["token", "changed"],
+        )
+
+
+class ChangeStampBatch(CommitBatch):
+    """
+    Scopes touched during one transaction, published once it commits.
+
+    One dream save touches the owner's stamp from several signal handlers, the
+    frequency recount and the public feed; they share one upsert. It runs after
+    the other batches, so the recounts they make are covered by the new stamps.
+    """
+
+    order = 1
+
+    def __init__(self) -> None:
+        self.scopes: set[str] = set()
+
+    def run(self) -> None:
+        """Publish the coalesced stamps."""
+        ChangeStamps.publish(self.scopes)
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The resource was modified since it was fetched."
+    default_code = "precondition_failed"
+
+
+class ConditionalGet:
+    """Builds validators and answers If-None-Match / If-Modified-Since."""
+
+    @staticmethod
+    def entity_tag(version: str, *parts: object) -> str:
+        """
+        A strong ETag: the resource's own version, then a digest of everything
+        else the representation depends on (viewer, query, related stamps).
+        """
+        digest = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+        return f'"{version}.{digest[:32]}"'
+
+    @staticmethod
+    def headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+        """Validator headers; clients must revalidate before reusing a copy."""
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified.timestamp())
+        return headers
+
+    @classmethod
+    def with_validators(
+        cls, response: Response, etag: str, last_modified: datetime | None = None
+    ) -> Response:
+        """Attach validator headers to a full response."""
+        for name, value in cls.headers(etag, last_modified).items():
+            response[name] = value
+        return response
+
+    @classmethod
+    def not_modified(
+        cls, request: Request, etag: str, last_modified: datetime | None = None
+    ) -> Response | None:
+        """
+        Answer a GET whose copy is still current, before any data is loaded.
+
+        If-None-Match takes precedence; If-Modified-Since is only consulted
+        without it. Returns None when the representation must be sent.
+        """
+        if request.method not in ("GET", "HEAD"):
+            return None
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            # Weak comparison, as RFC 9110 specifies for If-None-Match
+            client_etags = {
+                tag.removeprefix("W/") for tag in parse_etags(if_none_match)
+            }
+            current = etag in client_etags or "*" in client_etags
+        else:
+            if_modified_since = request.headers.get("If-Modified-Since")
+            since = (
+                parse_http_date_safe(if_modified_since) if if_modified_since else None
+            )
+            current = (
+                since is not None
+                and last_modified is not None
+                and int(last_modified.timestamp()) <= since
+            )
+
+        if not current:
+            return None
+        return Response(
+            status=status.HTTP_304_NOT_MODIFIED,
+            headers=cls.headers(etag, last_modified),
+        )
+
+    @staticmethod
+    def require_version(request: Request, version: str) -> None:
+        """
+        Enforce If-Match against the version part of entity_tag() ETags.
+
+        Only the part before the "." is compared, so a write conflicts with
+        changes to the resource itself, not with anything else its ETag covers
+        (an image finishing, another dream renaming a shared quality).
+
+        Raises:
+            PreconditionFailed: If-Match names no tag of the current version
+        """
+        if_match = request.headers.get("If-Match")
+        if not if_match:
+            return
+        tags = parse_etags(if_match)
+        if "*" in tags:
+            return
+        # Weak tags never satisfy If-Match
+        versions = {
+            tag.strip('"').split(".", 1)[0] for tag in tags if not tag.startswith("W/")
+        }
+        if version not in versions:
+            raise PreconditionFailed()
@@ -0,0 +1,132 @@
+"""
+Calendar aggregates of a user's journal: dream and quality counts per day,
+week or month, plus writing streaks.
+"""
+
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models.functions import Trunc
+
+from dreams.models import Dream, UserJournalStats, quality_links
+
+PERIODS = ("day", "week", "month")
+
+# Range covered when the client does not pass one
+DEFAULT_RANGE = timedelta(days=364)
+
+# Dates outside these are clamped, so the default range before the earliest,
+# the day after the latest and any UTC offset stay representable
+EARLIEST_DATE = date.min + DEFAULT_RANGE + timedelta(days=2)
+LATEST_DATE = date.max - timedelta(days=2)
+
+
+def day_bounds(start: date, end: date, tz: ZoneInfo) -> tuple[datetime, datetime]:
+    """
+    The [lower, upper) instants covering whole local days start..end.
+    Filtering created on these keeps the (user, -created) index usable, where
+    a __date lookup would wrap the column in a function.
+    """
+    lower = datetime.combine(start, time.min, tzinfo=tz)
+    upper = datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz)
+    return lower, upper
+
+
+def streaks(days: list[date], today: date) -> tuple[int, int]:
+    """
+    The current and longest runs of consecutive days with a dream.
+    The current streak survives until a day passes without one, so it counts
+    up to today or yesterday.
+    """
+    longest = run = 0
+    previous = None
+    for day in days:
+        run = run + 1 if previous == day - timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+    current = run if previous and previous >= today - timedelta(days=1) else 0
+    return current, longest
+
+
+class DreamCalendar:
+    """Builds the calendar payload with a few GROUP BY queries."""
+
+    @staticmethod
+    def dream_counts(
+        dreams: models.QuerySet[Dream], period: str, tz: ZoneInfo
+    ) -> models.QuerySet:
+        """(first local day of the period, dream count) pairs, oldest first."""
+        bucket = Trunc("created", period, output_field=models.DateField(), tzinfo=tz)
+        return (
+            dreams.order_by()
+            .annotate(bucket=bucket)
+            .values("bucket")
+            .annotate(dreams=models.Count("pk"))
+            .order_by("bucket")
+            .values_list("bucket", "dreams")
+        )
+
+    @staticmethod
+    def build(
+        user: User, period: str, start: date, end: date, tz: ZoneInfo
+    ) -> dict[str, object]:
+        """
+        Aggregate the user's dreams between two local dates.
+
+        Args:
+            user: Whose journal to aggregate
+            period: Bucket size, one of PERIODS
+            start: First local day of the range
+            end: Last local day of the range (inclusive)
+            tz: Time zone the days, weeks and months are counted in
+
+        Returns:
+            The buckets (start date, dream count, distinct quality count) of the
+            range, the streaks and the journal totals
+        """
+        lower, upper = day_bounds(start, end, tz)
+        dreams = Dream.objects.owned_by(user)
+        in_range = dreams.filter(created__gte=lower, created__lt=upper)
+
+        quality_counts = dict(
+            quality_links()
+            .filter(dream__in=in_range.order_by())
+            .annotate(
+                bucket=Trunc(
+                    "dream__created",
+                    period,
+                    output_field=models.DateField(),
+                    tzinfo=tz,
+                )
+            )
+            .values("bucket")
+            .annotate(qualities=models.Count("quality_id", distinct=True))
+            .values_list("bucket", "qualities")
+        )
+        buckets = [
+            {
+                "date": day.isoformat(),
+                "dreams": count,
+                "qualities": quality_counts.get(day, 0),
+            }
+            for day, count in DreamCalendar.dream_counts(in_range, period, tz)
+        ]
+
+        # Every active day of the journal, for the streaks
+        days = [day for day, _ in DreamCalendar.dream_counts(dreams, "day", tz)]
+        current, longest = streaks(days, datetime.now(tz).date())
+
+        stats = UserJournalStats.for_user(user)
+        return {
+            "period": period,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "buckets": buckets,
+            "streaks": {"current": current, "longest": longest},
+            "totals": {
+                "dreams": stats.dream_count,
+                "qualities": stats.quality_count,
+            },
+        }
@@ -0,0 +1,151 @@
+"""
+Streaming export of a user's whole journal as JSON Lines or CSV.
+
+Dreams are read through a server-side cursor and encoded a chunk at a time;
+the qualities of each chunk are resolved by one lookup on the through table
+instead of a prefetch over the whole set, so memory stays bounded by the
+chunk size however large the journal is. Rows use the import format, so an
+export can be imported again as it is.
+"""
+
+import csv
+import io
+from collections.abc import Callable, Iterable, Iterator
+from datetime import timedelta
+from itertools import islice
+from typing import Any
+
+import orjson
+from django.contrib.auth.models import User
+
+from dreams.models import Dream
+
+from .dream_import import QUALITY_SEPARATORS
+
+# Supported formats and the content types they are served as
+EXPORT_FORMATS = {
+    "jsonl": "application/jsonl",
+    "csv": "text/csv",
+}
+
+CHUNK_SIZE = 1000
+
+# Lifetime of the download URL of an export written by a background job
+EXPORT_URL_EXPIRATION = timedelta(hours=24)
+
+CSV_FIELDS = ["description", "qualities", "is_public", "created"]
+
+# Separator of the quality names in a CSV cell, split again by the importer.
+# Cells whose names contain a separator (or that would start with "[") are
+# written as a JSON array instead, which the importer reads back as it is.
+CSV_QUALITY_SEPARATOR = ";"
+
+# Called with (dreams written, total dreams) after every chunk
+ProgressCallback = Callable[[int, int], None]
+
+
+def _chunked(
+    rows: Iterable[tuple[Any, ...]], size: int
+) -> Iterator[list[tuple[Any, ...]]]:
+    """Split rows into lists of size, the last one possibly shorter."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def export_chunks(
+    user: User, chunk_size: int = CHUNK_SIZE
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Read the user's dreams, oldest first, as lists of export rows.
+
+    Each chunk costs one lookup of its qualities; the dreams themselves are
+    fetched chunk_size rows at a time from one cursor.
+    """
+    rows = (
+        Dream.objects.owned_by(user)
+        .order_by("created", "pk")
+        .values_list("pk", "description", "is_public", "created")
+        .iterator(chunk_size=chunk_size)
+    )
+    for chunk in _chunked(rows, chunk_size):
+        names: dict[int, list[str]] = {pk: [] for pk, *_ in chunk}
+        links = (
+            Dream.qualities.through.objects.filter(dream_id__in=names)
+            .order_by("quality__name")
+            .values_list("dream_id", "quality__name")
+        )
+        for dream_id, name in links:
+            names[dream_id].append(name)
+        yield [
+            {
+                "description": description,
+                "qualities": names[pk],
+                "is_public": is_public,
+                "created": created,
+            }
+            for pk, description, is_public, created in chunk
+        ]
+
+
+def encode_jsonl(rows: list[dict[str, Any]]) -> bytes:
+    """One JSON object per line."""
+    return b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+
+def encode_qualities(names: list[str]) -> str:
+    """The quality names of one dream as a CSV cell."""
+    if any(QUALITY_SEPARATORS.search(name) for name in names) or (
+        names and names[0].startswith("[")
+    ):
+        return orjson.dumps(names).decode()
+    return CSV_QUALITY_SEPARATOR.join(names)
+
+
+def encode_csv(rows: list[dict[str, Any]], header: bool = False) -> bytes:
+    """CSV rows, with the quality names joined into one cell."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+    if header:
+        writer.writeheader()
+    writer.writerows(
+        {
+            **row,
+            "qualities": encode_qualities(row["qualities"]),
+            "is_public": str(row["is_public"]).lower(),
+            "created": row["created"].isoformat(),
+        }
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+def export_dreams(
+    user: User,
+    fmt: str,
+    chunk_size: int = CHUNK_SIZE,
+    total: int = 0,
+    progress: ProgressCallback | None = None,
+) -> Iterator[bytes]:
+    """
+    Encode a user's journal in one of the EXPORT_FORMATS, a chunk at a time.
+
+    Args:
+        user: The user whose dreams are exported
+        fmt: "jsonl" or "csv"
+        chunk_size: Dreams read and encoded per chunk
+        total: Number of dreams when known, for progress
+        progress: Optional callback reporting (dreams written, total) per chunk
+
+    Yields:
+        The encoded file in pieces of one chunk each
+    """
+    if fmt == "csv":
+        # The header goes out even for an empty journal
+        yield encode_csv([], header=True)
+    done = 0
+    for rows in export_chunks(user, chunk_size):
+        yield encode_csv(rows) if fmt == "csv" else encode_jsonl(rows)
+        done += len(rows)
+        if progress is not None:
+            progress(done, total)
@@ -0,0 +1,278 @@
+"""
+Streaming bulk import of dreams from JSON Lines or CSV.
+
+Rows are parsed and validated one at a time and written in chunks: one
+quality upsert, one dream insert, one link insert, one co-occurrence update
+and one search refresh per chunk, with no per-row signal handlers.
+Frequencies and the journal counters are repaired once at the end, so memory
+and per-row cost stay flat however large the file is.
+"""
+
+import csv
+import logging
+import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import orjson
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from dreams.models import Dream, Quality, QualityCooccurrence, UserJournalStats
+from dreams.serializers import DreamImportRowSerializer
+
+from .conditional_requests import ChangeStamps
+from .dream_search import DreamSearchIndex
+from .public_feed_cache import PublicFeedCache
+from .quality_graph_cache import QualityGraphCache
+
+logger = logging.getLogger(__name__)
+
+# Supported formats and the content types that select them
+IMPORT_FORMATS = {
+    "application/jsonl": "jsonl",
+    "application/x-ndjson": "jsonl",
+    "application/x-jsonlines": "jsonl",
+    "text/csv": "csv",
+}
+
+CHUNK_SIZE = 500
+
+# Number of rejected rows listed individually in a report
+ERROR_SAMPLE_SIZE = 50
+
+# Separators of the quality names in a CSV cell
+QUALITY_SEPARATORS = re.compile(r"[;,]")
+
+# Called with (bytes read, total bytes) after every chunk
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class ImportReport:
+    """What an import wrote and rejected."""
+
+    imported: int = 0
+    rejected: int = 0
+    # {"line": ..., "errors": ...} for the first ERROR_SAMPLE_SIZE rejected rows
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def reject(self, line: int, errors: object) -> None:
+        """Count a rejected row, keeping its errors while there is room."""
+        self.rejected += 1
+        if len(self.errors) < ERROR_SAMPLE_SIZE:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self) -> dict[str, object]:
+        """Serialize for responses and Celery results."""
+        return {
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "errors": self.errors,
+        }
+
+
+class ImportRows:
+    """Parses import files into (line number, row dict or error) pairs."""
+
+    @staticmethod
+    def jsonl(lines: Iterable[bytes]) -> Iterator[tuple[int, dict | str]]:
+        """One JSON object per line; blank lines are skipped."""
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = orjson.loads(line)
+            except orjson.JSONDecodeError as exc:
+                yield number, f"Invalid JSON: {exc}"
+                continue
+            if not isinstance(row, dict):
+                yield number, "Each line must be a JSON object"
+                continue
+            qualities = row.get("qualities")
+            if isinstance(qualities, list):
+                # Accept exported quality objects as well as plain names
+                row["qualities"] = [
+                    q.get("name") if isinstance(q, dict) else q for q in qualities
+                ]
+            yield number, row
+
+    @staticmethod
+    def csv_qualities(cell: str) -> list[str]:
+        """
+        Quality names from a CSV cell: a JSON array of strings (as exported
+        when a name holds a separator), or names separated by ";" or ",".
+        """
+        if cell.startswith("["):
+            try:
+                names = orjson.loads(cell)
+            except orjson.JSONDecodeError:
+                pass
+            else:
+                if isinstance(names, list) and all(isinstance(n, str) for n in names):
+                    return [name.strip() for name in names if name.strip()]
+        return [name.strip() for name in QUALITY_SEPARATORS.split(cell) if name.strip()]
+
+    @staticmethod
+    def csv(lines: Iterable[bytes]) -> Iterator[tuple[int, dict | str]]:
+        """
+        A header row naming description and optionally qualities, is_public and
+        created. Empty cells count as missing.
+        """
+        decode_errors: list[str] = []
+
+        def decoded() -> Iterator[str]:
+            for line in lines:
+                try:
+                    yield line.decode("utf-8-sig")
+                except UnicodeDecodeError as exc:
+                    decode_errors.append(str(exc))
+                    return
+
+        reader = csv.DictReader(decoded())
+        try:
+            for record in reader:
+                row = {
+                    key: value
+                    for key, value in record.items()
+                    if key is not None and value not in (None, "")
+                }
+                row["qualities"] = ImportRows.csv_qualities(row.get("qualities", ""))
+                yield reader.line_num, row
+        except csv.Error as exc:
+            yield reader.line_num, f"Invalid CSV: {exc}"
+        if decode_errors:
+            yield reader.line_num + 1, f"Not UTF-8, stopped: {decode_errors[0]}"
+
+    @classmethod
+    def parse(
+        cls, lines: Iterable[bytes], fmt: str
+    ) -> Iterator[tuple[int, dict | str]]:
+        """Parse lines of a file in one of the IMPORT_FORMATS."""
+        if fmt == "csv":
+            return cls.csv(lines)
+        return cls.jsonl(lines)
+
+
+def _counted(lines: Iterable[bytes], counter: list[int]) -> Iterator[bytes]:
+    """Pass lines through, adding their sizes to counter[0]."""
+    for line in lines:
+        counter[0] += len(line)
+        yield line
+
+
+def _write_chunk(user: User, rows: list[dict[str, Any]]) -> tuple[list[int], set[int]]:
+    """
+    Insert one chunk of validated rows.
+
+    Returns:
+        The new dream IDs and the IDs of the qualities they use
+    """
+    qualities = Quality.get_or_create_many(
+        user, (name for row in rows for name in row["qualities"])
+    )
+    quality_ids = {quality.name: quality.pk for quality in qualities}
+
+    dreams = Dream.objects.bulk_create(
+        Dream(user=user, description=row["description"], is_public=row["is_public"])
+        for row in rows
+    )
+    # created is set on insert (auto_now_add), so imported dates are written after
+    dated = []
+    for dream, row in zip(dreams, rows, strict=True):
+        if "created" in row:
+            dream.created = row["created"]
+            dated.append(dream)
+    if dated:
+        Dream.objects.bulk_update(dated, ["created"])
+
+    links = {
+        (dream.pk, quality_ids[name.strip().lower()])
+        for dream, row in zip(dreams, rows, strict=True)
+        for name in row["qualities"]
+        if name.strip().lower() in quality_ids
+    }
+    Dream.qualities.through.objects.bulk_create(
+        Dream.qualities.through(dream_id=dream_id, quality_id=quality_id)
+        for dream_id, quality_id in links
+    )
+    QualityCooccurrence.add_dreams(user.pk, links)
+    dream_ids = [dream.pk for dream in dreams]
+    DreamSearchIndex.refresh(dream_ids)
+    return dream_ids, {quality_id for _, quality_id in links}
+
+
+def import_dreams(
+    user: User,
+    lines: Iterable[bytes],
+    fmt: str,
+    total_bytes: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+    progress: ProgressCallback | None = None,
+) -> ImportReport:
+    """
+    Import a stream of dreams for a user.
+
+    Invalid rows are skipped and reported; valid rows are written chunk_size
+    at a time, each chunk in its own transaction. Committed chunks stay
+    imported and are repaired even if a later one fails.
+
+    Args:
+        user: The user the dreams are imported for
+        lines: The file, line by line
+        fmt: One of the IMPORT_FORMATS values
+        total_bytes: Size of the file when known, for progress
+        chunk_size: Rows written per transaction
+        progress: Optional callback reporting (bytes read, total_bytes) per chunk
+
+    Returns:
+        A report of the dreams imported and the rows rejected
+    """
+    report = ImportReport()
+    read = [0]
+    affected: set[int] = set()
+    any_public = False
+
+    def flush(chunk: list[dict[str, Any]]) -> None:
+        nonlocal any_public
+        with transaction.atomic():
+            dream_ids, quality_ids = _write_chunk(user, chunk)
+        report.imported += len(dream_ids)
+        affected.update(quality_ids)
+        any_public = any_public or any(row["is_public"] for row in chunk)
+        if progress is not None:
+            progress(read[0], total_bytes)
+
+    chunk: list[dict[str, Any]] = []
+    try:
+        for line, row in ImportRows.parse(_counted(lines, read), fmt):
+            if isinstance(row, str):
+                report.reject(line, row)
+                continue
+            serializer = DreamImportRowSerializer(data=row)
+            if not serializer.is_valid():
+                report.reject(line, serializer.errors)
+                continue
+            chunk.append(serializer.validated_data)
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+    finally:
+        # One maintenance pass for everything that was committed
+        if affected:
+            Quality.refresh_frequencies(affected)
+        if report.imported:
+            UserJournalStats.rebuild([user.pk])
+            QualityGraphCache.bump_version(user.pk)
+            ChangeStamps.touch(user.pk)
+            if any_public:
+                PublicFeedCache.bump_version()
+
+    logger.info(
+        f"Imported {report.imported} dreams for user {user.pk}, "
+        f"rejected {report.rejected} rows"
+    )
+    return report
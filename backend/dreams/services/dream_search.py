@@ -0,0 +1,185 @@
+"""
+Full-text search over dreams.
+
+Every dream keeps a search document (Dream.search_text) holding its description
+and quality names. Postgres searches it through a GIN index on its tsvector;
+SQLite mirrors it into the dreams_dream_fts FTS5 table. Other backends fall
+back to a substring match on the document.
+"""
+
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from django.db import connection, models
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, Concat
+
+from dreams.models import Dream, GroupConcat, quality_links
+
+from .commit_batches import CommitBatch
+
+# Text search configuration used by the GIN index and every query against it
+POSTGRES_SEARCH_CONFIG = "english"
+
+SQLITE_FTS_TABLE = "dreams_dream_fts"
+
+
+class TsVector(models.Func):
+    """to_tsvector() with the configuration the GIN index was built with."""
+
+    template = f"to_tsvector('{POSTGRES_SEARCH_CONFIG}'::regconfig, %(expressions)s)"
+    output_field = models.TextField()
+
+
+class TsQuery(models.Func):
+    """to_tsquery() with the configuration the GIN index was built with."""
+
+    template = f"to_tsquery('{POSTGRES_SEARCH_CONFIG}'::regconfig, %(expressions)s)"
+    output_field = models.TextField()
+
+
+class SearchRefreshBatch(CommitBatch):
+    """
+    Dream IDs whose search documents went stale during one transaction.
+
+    Saving a dream through the API fires post_save and then m2m_changed for
+    the quality set (post_remove and post_add); collecting the IDs here turns
+    those into one refresh once the transaction commits.
+    """
+
+    def __init__(self) -> None:
+        self.dream_ids: set[int] = set()
+
+    def run(self) -> None:
+        """Run the coalesced refresh."""
+        if self.dream_ids:
+            DreamSearchIndex.refresh(self.dream_ids)
+
+
+class DreamSearchIndex:
+    """Maintains and queries the per-dream search documents."""
+
+    @staticmethod
+    def terms(query: str) -> list[str]:
+        """Split user input into lowercase word terms, dropping operators."""
+        return re.findall(r"\w+", query.lower())
+
+    @classmethod
+    def schedule(cls, dream_ids: Iterable[int]) -> None:
+        """Queue a refresh of the given dreams for when the transaction commits."""
+        batch = SearchRefreshBatch.current()
+        if batch is None:
+            cls.refresh(dream_ids)
+            return
+        batch.dream_ids.update(dream_ids)
+
+    @classmethod
+    def refresh(cls, dream_ids: Iterable[int]) -> None:
+        """
+        Rebuild the search documents of the given dreams with one UPDATE.
+        Must run after description or quality changes have been written.
+        """
+        dream_ids = list(set(dream_ids))
+        if not dream_ids:
+            return
+
+        quality_names = (
+            quality_links()
+            .filter(dream_id=models.OuterRef("pk"))
+            .order_by()
+            .values("dream_id")
+            .annotate(names=GroupConcat("quality__name"))
+            .values("names")
+        )
+        Dream.objects.filter(pk__in=dream_ids).update(
+            search_text=Concat(
+                "description",
+                models.Value(" "),
+                Coalesce(models.Subquery(quality_names), models.Value("")),
+                output_field=models.TextField(),
+            )
+        )
+
+        if connection.vendor == "sqlite":
+            placeholders = ", ".join(["%s"] * len(dream_ids))
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid IN ({placeholders})",
+                    dream_ids,
+                )
+                cursor.execute(
+                    f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, search_text) "
+                    f"SELECT id, search_text FROM dreams_dream "
+                    f"WHERE id IN ({placeholders})",
+                    dream_ids,
+                )
+
+    @classmethod
+    def remove(cls, dream_ids: Iterable[int]) -> None:
+        """Drop deleted dreams from the SQLite FTS table (Postgres needs nothing)."""
+        dream_ids = list(dream_ids)
+        if not dream_ids or connection.vendor != "sqlite":
+            return
+
+        placeholders = ", ".join(["%s"] * len(dream_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid IN ({placeholders})",
+                dream_ids,
+            )
+
+    @classmethod
+    def search(
+        cls, queryset: models.QuerySet[Dream], query: str
+    ) -> models.QuerySet[Dream]:
+        """
+        Filter dreams to those matching every word of the query, best first.
+
+        Words match as prefixes so results update while the user types. The
+        queryset is annotated with search_rank (higher is better).
+        """
+        terms = cls.terms(query)
+        if not terms:
+            return queryset
+
+        if connection.vendor == "postgresql":
+            vector = TsVector("search_text")
+            ts_query = TsQuery(models.Value(" & ".join(f"{t}:*" for t in terms)))
+            matches: Any = models.Func(
+                vector,
+                ts_query,
+                template="%(expressions)s",
+                arg_joiner=" @@ ",
+                output_field=models.BooleanField(),
+            )
+            rank: Any = models.Func(
+                vector, ts_query, function="ts_rank", output_field=models.FloatField()
+            )
+            queryset = queryset.filter(matches).annotate(search_rank=rank)
+        elif connection.vendor == "sqlite":
+            fts_query = " ".join(f'"{t}"*' for t in terms)
+            queryset = queryset.filter(
+                pk__in=RawSQL(
+                    f"SELECT rowid FROM {SQLITE_FTS_TABLE} "
+                    f"WHERE {SQLITE_FTS_TABLE} MATCH %s",
+                    [fts_query],
+                )
+            ).annotate(
+                # bm25() is lower for better matches
+                search_rank=RawSQL(
+                    f"SELECT -bm25({SQLITE_FTS_TABLE}) FROM {SQLITE_FTS_TABLE} "
+                    f"WHERE {SQLITE_FTS_TABLE} MATCH %s "
+                    f"AND rowid = dreams_dream.id",
+                    [fts_query],
+                    output_field=models.FloatField(),
+                )
+            )
+        else:
+            for term in terms:
+                queryset = queryset.filter(search_text__icontains=term)
+            queryset = queryset.annotate(
+                search_rank=models.Value(0.0, output_field=models.FloatField())
+            )
+
+        return queryset.order_by("-search_rank", "-created")
@@ -0,0 +1,134 @@
+"""
+Detection and repair of drift in the denormalized Quality.frequency counter.
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Mod
+
+from dreams.models import Quality, quality_links
+
+from .conditional_requests import ChangeStamps
+from .quality_graph_cache import QualityGraphCache
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+
+# Number of drifted qualities listed individually in a report
+DRIFT_SAMPLE_SIZE = 20
+
+
+@dataclass
+class FrequencyDriftReport:
+    """What one reconciliation pass found and fixed."""
+
+    checked: int = 0
+    drifted: int = 0
+    fixed: int = 0
+    absolute_drift: int = 0
+    user_ids: set[int] = field(default_factory=set)
+    # (quality_id, stored frequency, actual dream count)
+    samples: list[tuple[int, int, int]] = field(default_factory=list)
+
+    def merge(self, other: "FrequencyDriftReport") -> None:
+        """Fold another shard's report into this one."""
+        self.checked += other.checked
+        self.drifted += other.drifted
+        self.fixed += other.fixed
+        self.absolute_drift += other.absolute_drift
+        self.user_ids |= other.user_ids
+        room = DRIFT_SAMPLE_SIZE - len(self.samples)
+        self.samples.extend(other.samples[:room])
+
+    def as_dict(self) -> dict[str, object]:
+        """Serialize for Celery results and logs."""
+        return {
+            "checked": self.checked,
+            "drifted": self.drifted,
+            "fixed": self.fixed,
+            "absolute_drift": self.absolute_drift,
+            "users": len(self.user_ids),
+            "samples": [list(sample) for sample in self.samples],
+        }
+
+
+def reconcile_frequencies(
+    shard: int = 0,
+    shard_count: int = 1,
+    fix: bool = True,
+    chunk_size: int = CHUNK_SIZE,
+) -> FrequencyDriftReport:
+    """
+    Compare every quality's stored frequency to its dream count and fix drift.
+
+    Qualities are walked in primary key order, chunk_size at a time. Each chunk
+    costs one aggregate read and, when something drifted, one short UPDATE of
+    only the drifted rows, so no long-running lock is held.
+
+    Args:
+        shard: Which shard of users to check (user_id % shard_count == shard)
+        shard_count: Total number of shards the users are split into
+        fix: Write the recounted frequencies; False only reports drift
+        chunk_size: Number of qualities read per pass
+
+    Returns:
+        A report of the qualities checked and the drift found
+    """
+    dream_counts = (
+        quality_links()
+        .filter(quality_id=models.OuterRef("pk"))
+        .order_by()
+        .values("quality_id")
+        .annotate(count=models.Count("dream_id"))
+        .values("count")
+    )
+    qualities = Quality.objects.order_by("pk")
+    if shard_count > 1:
+        qualities = qualities.alias(user_shard=Mod("user_id", shard_count)).filter(
+            user_shard=shard
+        )
+
+    report = FrequencyDriftReport()
+    last_pk = 0
+    while True:
+        chunk = list(
+            qualities.filter(pk__gt=last_pk).values_list("pk", flat=True)[:chunk_size]
+        )
+        if not chunk:
+            break
+
+        drifted = list(
+            qualities.filter(pk__gte=chunk[0], pk__lte=chunk[-1])
+            .annotate(actual=Coalesce(models.Subquery(dream_counts), models.Value(0)))
+            .exclude(frequency=models.F("actual"))
+            .values_list("pk", "user_id", "frequency", "actual")
+        )
+        report.checked += len(chunk)
+        last_pk = chunk[-1]
+        if not drifted:
+            continue
+
+        report.drifted += len(drifted)
+        for pk, user_id, frequency, actual in drifted:
+            report.user_ids.add(user_id)
+            report.absolute_drift += abs(frequency - actual)
+            if len(report.samples) < DRIFT_SAMPLE_SIZE:
+                report.samples.append((pk, frequency, actual))
+
+        if fix:
+            with transaction.atomic():
+                Quality.refresh_frequencies(pk for pk, *_ in drifted)
+                user_ids = {user_id for _, user_id, *_ in drifted}
+                for user_id in user_ids:
+                    QualityGraphCache.bump_version(user_id)
+                ChangeStamps.touch(*user_ids)
+            report.fixed += len(drifted)
+
+    logger.info(
+        f"Frequency reconciliation shard {shard}/{shard_count}: "
+        f"checked {report.checked}, drifted {report.drifted}, fixed {report.fixed}"
+    )
+    return report
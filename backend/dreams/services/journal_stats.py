@@ -0,0 +1,89 @@
+"""
+Detection and repair of drift in the maintained UserJournalStats counters.
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from dreams.models import UserJournalStats
+
+from .conditional_requests import ChangeStamps
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+
+
+@dataclass
+class JournalStatsReport:
+    """What one rebuild pass found and fixed."""
+
+    checked: int = 0
+    drifted: int = 0
+    fixed: int = 0
+    # IDs of users whose stored counters differed (or had no row)
+    user_ids: list[int] = field(default_factory=list)
+
+
+def rebuild_journal_stats(
+    fix: bool = True,
+    chunk_size: int = CHUNK_SIZE,
+    user_ids: list[int] | None = None,
+) -> JournalStatsReport:
+    """
+    Recompute every user's counters and store the ones that drifted.
+
+    Users are walked in primary key order, chunk_size at a time: one aggregate
+    read of the actual counters, one read of the stored rows and, when
+    something drifted, one upsert of only those users.
+
+    Args:
+        fix: Store the recomputed counters; False only reports drift
+        chunk_size: Number of users checked per pass
+        user_ids: Only check these users
+
+    Returns:
+        A report of the users checked and the drift found
+    """
+    users = User.objects.order_by("pk")
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+
+    report = JournalStatsReport()
+    last_pk = 0
+    while True:
+        chunk = list(
+            users.filter(pk__gt=last_pk).values_list("pk", flat=True)[:chunk_size]
+        )
+        if not chunk:
+            break
+        last_pk = chunk[-1]
+        report.checked += len(chunk)
+
+        actual = UserJournalStats.actual(chunk)
+        stored = {
+            row.pop("user_id"): row
+            for row in UserJournalStats.objects.filter(user_id__in=chunk).values(
+                "user_id", *UserJournalStats.COUNTERS
+            )
+        }
+        drifted = [pk for pk in chunk if stored.get(pk) != actual.get(pk)]
+        if not drifted:
+            continue
+
+        report.drifted += len(drifted)
+        report.user_ids.extend(drifted)
+        if fix:
+            with transaction.atomic():
+                UserJournalStats.rebuild(drifted)
+                ChangeStamps.touch(*drifted)
+            report.fixed += len(drifted)
+
+    logger.info(
+        f"Journal stats rebuild: checked {report.checked}, "
+        f"drifted {report.drifted}, fixed {report.fixed}"
+    )
+    return report
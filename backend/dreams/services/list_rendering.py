@@ -0,0 +1,214 @@
+"""
+Serializer-free rendering of dream and quality list pages.
+
+Instantiating DRF fields for every row dominates the cost of large list pages.
+These builders read the same data with values() queries and assemble the plain
+dicts DreamListSerializer and QualitySerializer would have produced, key for
+key and in the same order.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from typing import Any, ClassVar
+
+from django.db import models
+from django.db.models.functions import RowNumber
+from rest_framework import serializers
+
+from dreams.models import IMAGE_PREVIEW_COUNT, Dream, Image
+from dreams.serializers import (
+    DreamListSerializer,
+    ImageSerializer,
+    QualitySerializer,
+)
+
+# Row dicts as values() returns them and the list serializers render them
+Row = dict[str, Any]
+
+# Formats datetimes exactly as the serializers' DateTimeFields do
+_datetime_field = serializers.DateTimeField()
+
+
+def format_datetime(value: datetime | None) -> str | None:
+    """Render a datetime the way DRF's DateTimeField does."""
+    if value is None:
+        return None
+    return _datetime_field.to_representation(value)
+
+
+class QualityRows:
+    """Builds QualitySerializer output from values() rows."""
+
+    FIELDS: tuple[str, ...] = tuple(QualitySerializer.Meta.fields)
+
+    @classmethod
+    def values(cls, queryset: models.QuerySet) -> models.QuerySet:
+        """Narrow a quality queryset to the columns the rows are built from."""
+        rows: models.QuerySet = queryset.values(*cls.FIELDS)
+        return rows
+
+    @classmethod
+    def render(cls, rows: Iterable[Row]) -> list[Row]:
+        """Format values() rows as serialized qualities."""
+        return [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "frequency": row["frequency"],
+                "created": format_datetime(row["created"]),
+            }
+            for row in rows
+        ]
+
+
+class DreamListRows:
+    """
+    Builds DreamListSerializer output from values() rows.
+
+    The queryset must come from DreamViewSet.with_relations() with the same
+    field selection, so the image_count and description_preview annotations are
+    in place. Qualities and preview images are read with one values() query
+    each for the whole page.
+    """
+
+    FIELDS: tuple[str, ...] = tuple(DreamListSerializer.Meta.fields)
+
+    # Fields rendered when the client does not narrow the selection
+    DEFAULT_FIELDS = frozenset(FIELDS) - set(DreamListSerializer.optional_fields)
+
+    # Columns read for each field, beyond the ones always needed
+    FIELD_COLUMNS: ClassVar[dict[str, tuple[str, ...]]] = {
+        "description": ("description",),
+        "description_preview": ("description_preview",),
+        "image_count": ("image_count",),
+        "updated": ("updated",),
+    }
+
+    @classmethod
+    def selection(
+        cls, fields: set[str] | None, expand: set[str] | frozenset[str] = frozenset()
+    ) -> frozenset[str]:
+        """Resolve a sparse field selection to the fields rendered."""
+        if fields is None:
+            return cls.DEFAULT_FIELDS
+        return frozenset(fields) | frozenset(expand)
+
+    @classmethod
+    def values(
+        cls, queryset: models.QuerySet[Dream], selected: frozenset[str]
+    ) -> models.QuerySet:
+        """
+        Narrow a dream queryset to the columns the rows are built from.
+        Relation prefetches are dropped; render() reads the relations itself.
+        """
+        columns = ["id", "user_id", "is_public", "created"]
+        for name in selected:
+            columns.extend(cls.FIELD_COLUMNS.get(name, ()))
+        rows: models.QuerySet = queryset.prefetch_related(None).values(*columns)
+        return rows
+
+    @classmethod
+    def render(
+        cls, rows: Sequence[Row], selected: frozenset[str], viewer_id: int | None
+    ) -> list[Row]:
+        """
+        Format a page of values() rows as serialized dreams.
+
+        Args:
+            rows: The page, as returned by values()
+            selected: The fields to render, from selection()
+            viewer_id: Primary key of the requesting user, for is_owner
+        """
+        dream_ids = [row["id"] for row in rows]
+        qualities = cls._qualities(dream_ids, selected)
+        images = cls._images(dream_ids) if "images" in selected else {}
+
+        results = []
+        for row in rows:
+            dream_id = row["id"]
+            dream_qualities = qualities.get(dream_id, [])
+            result: Row = {}
+            if "id" in selected:
+                result["id"] = dream_id
+            if "description" in selected:
+                result["description"] = row["description"]
+            if "description_preview" in selected:
+                result["description_preview"] = row["description_preview"]
+            if "qualities" in selected:
+                result["qualities"] = dream_qualities
+            if "quality_names" in selected:
+                result["quality_names"] = [q["name"] for q in dream_qualities]
+            if "images" in selected:
+                result["images"] = images.get(dream_id, [])
+            if "image_count" in selected:
+                result["image_count"] = int(row["image_count"])
+            if "is_public" in selected:
+                result["is_public"] = row["is_public"]
+            if "is_owner" in selected:
+                result["is_owner"] = row["user_id"] == viewer_id
+            if "created" in selected:
+                result["created"] = format_datetime(row["created"])
+            if "updated" in selected:
+                result["updated"] = format_datetime(row["updated"])
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _qualities(
+        dream_ids: list[int], selected: frozenset[str]
+    ) -> dict[int, list[Row]]:
+        """The qualities of each dream, ordered by name like Quality.Meta."""
+        if not dream_ids or not selected & {"qualities", "quality_names"}:
+            return {}
+
+        columns = ["dream_id", "quality_id", "quality__name"]
+        if "qualities" in selected:
+            columns += ["quality__frequency", "quality__created"]
+        links = (
+            Dream.qualities.through.objects.filter(dream_id__in=dream_ids)
+            .order_by("quality__name")
+            .values_list(*columns)
+        )
+
+        by_dream: dict[int, list[Row]] = defaultdict(list)
+        for dream_id, quality_id, name, *rest in links:
+            quality: Row = {"id": quality_id, "name": name}
+            if rest:
+                frequency, created = rest
+                quality["frequency"] = frequency
+                quality["created"] = format_datetime(created)
+            by_dream[dream_id].append(quality)
+        return by_dream
+
+    @staticmethod
+    def _images(dream_ids: list[int]) -> dict[int, list[Row]]:
+        """The latest IMAGE_PREVIEW_COUNT images of each dream, newest first."""
+        if not dream_ids:
+            return {}
+
+        images = (
+            Image.objects.filter(dream_id__in=dream_ids)
+            .annotate(
+                preview_rank=models.Window(
+                    RowNumber(),
+                    partition_by=models.F("dream_id"),
+                    order_by=models.F("created").desc(),
+                )
+            )
+            .filter(preview_rank__lte=IMAGE_PREVIEW_COUNT)
+            .order_by("-created")
+            .values("dream_id", *ImageSerializer.Meta.fields)
+        )
+
+        by_dream: dict[int, list[Row]] = defaultdict(list)
+        for image in images:
+            by_dream[image["dream_id"]].append(
+                {
+                    "id": image["id"],
+                    "generation_status": image["generation_status"],
+                    "generation_prompt": image["generation_prompt"],
+                    "created": format_datetime(image["created"]),
+                }
+            )
+        return by_dream
@@ -0,0 +1,66 @@
+"""
+Streaming transfer of journal files through the GCS bucket, for jobs that run
+on a Celery worker instead of in the request that started them.
+"""
+
+import json
+from collections.abc import Iterable, Iterator
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from google.cloud import storage
+
+# Bytes read from a stream per write
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+_client: storage.Client | None = None
+
+
+def get_bucket() -> storage.Bucket:
+    """The journal bucket, with one client per process."""
+    global _client
+    if _client is None:
+        if settings.SERVICE_ACCOUNT_JSON:
+            _client = storage.Client.from_service_account_info(
+                json.loads(settings.SERVICE_ACCOUNT_JSON)
+            )
+        else:
+            _client = storage.Client()
+    return _client.bucket(settings.GCS_BUCKET_NAME)
+
+
+def write_chunks(path: str, chunks: Iterable[bytes], content_type: str) -> int:
+    """
+    Upload chunks to a blob as they are produced (a resumable upload), so
+    nothing larger than one chunk is held in memory.
+
+    Returns:
+        The number of bytes written
+    """
+    written = 0
+    with get_bucket().blob(path).open("wb", content_type=content_type) as blob:
+        for chunk in chunks:
+            blob.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def read_lines(path: str) -> Iterator[bytes]:
+    """Stream a blob line by line."""
+    with get_bucket().blob(path).open("rb") as blob:
+        yield from blob
+
+
+def delete(path: str) -> None:
+    """Delete a blob if it exists."""
+    blob = get_bucket().blob(path)
+    if blob.exists():
+        blob.delete()
+
+
+def signed_url(path: str, expiration: timedelta) -> str:
+    """A signed GET URL for downloading a blob without credentials."""
+    blob = get_bucket().blob(path)
+    url: str = blob.generate_signed_url(expiration=timezone.now() + expiration)
+    return url
@@ -0,0 +1,140 @@
+"""
+Shared cache for pages of the public Astral Plane feed.
+"""
+
+import copy
+import hashlib
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .conditional_requests import PUBLIC_SCOPE, ChangeStamps
+
+# Cached pages are keyed by version, so stale entries simply stop being read
+CACHE_TIMEOUT = 60 * 60
+
+# Holds (token, when it was set), which also serve as the feed's validators
+VERSION_KEY = "public_feed_version_at"
+
+# Query parameters that select a page of the feed; anything else is ignored
+PAGE_PARAMS = (
+    "page",
+    "page_size",
+    "pagination",
+    "cursor",
+    "total",
+    "search",
+    "fields",
+    "expand",
+)
+
+
+class PublicFeedCache:
+    """
+    Cache for Astral Plane pages, shared by every user; used only with
+    CROSS_REQUEST_CACHING.
+
+    Pages are stored without viewer-specific data: each cached page keeps the
+    owner ID of every result next to the serialized payload, and is_owner is
+    filled in per request. Any write that changes what the feed shows replaces
+    the feed version, which orphans every cached page at once.
+    """
+
+    @staticmethod
+    def _new_version() -> tuple[str, datetime]:
+        return uuid.uuid4().hex, timezone.now()
+
+    @classmethod
+    def get_version(cls) -> tuple[str, datetime]:
+        """Get the feed version and when it was set, creating one if missing."""
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, cls._new_version(), timeout=None)
+            version = cache.get(VERSION_KEY)
+        token, changed = version
+        return str(token), changed
+
+    @classmethod
+    def validator(cls) -> tuple[str, datetime]:
+        """
+        The token and change time the feed's validators are built from.
+
+        With CROSS_REQUEST_CACHING they are the feed version, so a page served
+        from cache doesn't touch the database; otherwise versions bumped by
+        other processes are invisible here and the public change stamp is read.
+        """
+        if settings.CROSS_REQUEST_CACHING:
+            return cls.get_version()
+        stamp = ChangeStamps.get(PUBLIC_SCOPE)
+        return stamp.token, stamp.changed
+
+    @classmethod
+    def bump_version(cls) -> None:
+        """
+        Invalidate every cached feed page.
+        Published on commit so a concurrent request can't cache pre-commit data.
+        """
+        transaction.on_commit(
+            lambda: cache.set(VERSION_KEY, cls._new_version(), timeout=None)
+        )
+        # The same writes change what conditional GETs of public dreams validate
+        ChangeStamps.touch(PUBLIC_SCOPE)
+
+    @staticmethod
+    def _page_key(request: Request, version: str) -> str:
+        params = []
+        for name in PAGE_PARAMS:
+            value = request.query_params.get(name, "").strip()
+            if name == "search":
+                value = " ".join(value.lower().split())
+            params.append(f"{name}={value}")
+        digest = hashlib.sha256("&".join(params).encode()).hexdigest()
+        return f"public_feed:{version}:{digest}"
+
+    @classmethod
+    def get_response(
+        cls,
+        request: Request,
+        build: Callable[[], tuple[dict[str, Any], list[int]]],
+        version: str,
+    ) -> Response:
+        """
+        Serve a feed page from cache, building it on a miss.
+
+        Args:
+            request: The incoming request
+            build: Callable returning the paginated payload and the owner ID of
+                each result, in order
+            version: The feed version token from validator(), so the page and
+                its validators come from the same version
+
+        Returns:
+            The page with is_owner set for the requesting user
+        """
+        entry: dict[str, Any] | None
+        if not settings.CROSS_REQUEST_CACHING:
+            # A per-process cache would keep serving dreams unpublished through
+            # another process
+            data, owner_ids = build()
+            entry = {"data": data, "owner_ids": owner_ids}
+        else:
+            key = cls._page_key(request, version)
+            entry = cache.get(key)
+            if entry is None:
+                data, owner_ids = build()
+                entry = {"data": data, "owner_ids": owner_ids}
+                cache.set(key, entry, timeout=CACHE_TIMEOUT)
+
+        data = copy.deepcopy(entry["data"])
+        for result, owner_id in zip(data["results"], entry["owner_ids"], strict=True):
+            if "is_owner" in result:
+                result["is_owner"] = owner_id == request.user.pk
+        return Response(data, headers={"Cache-Control": "private, no-cache"})
@@ -0,0 +1,92 @@
+"""
+Versioned per-user cache for quality graph and statistics responses.
+"""
+
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .conditional_requests import ConditionalGet
+
+# Cached payloads are keyed by version, so stale entries simply stop being read
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class QualityGraphCache:
+    """
+    Cache for per-user quality graph data, used only with CROSS_REQUEST_CACHING.
+
+    Every user has a "quality graph version" token. Writes that change dreams or
+    qualities replace the token, which orphans every payload cached under the
+    old one. Responses carry a ConditionalGet ETag built from the token so
+    clients can revalidate without the graph being rebuilt.
+    """
+
+    @staticmethod
+    def _version_key(user_id: int) -> str:
+        return f"quality_graph_version:{user_id}"
+
+    @classmethod
+    def get_version(cls, user_id: int) -> str:
+        """Get the user's current graph version, creating one if missing."""
+        key = cls._version_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            version = cache.get(key)
+        return str(version)
+
+    @classmethod
+    def bump_version(cls, user_id: int) -> None:
+        """
+        Invalidate the user's cached graph data.
+
+        The new token is published once the surrounding transaction commits, so
+        a concurrent request can't cache pre-commit data under the new version.
+        """
+        key = cls._version_key(user_id)
+        transaction.on_commit(lambda: cache.set(key, uuid.uuid4().hex, timeout=None))
+
+    @classmethod
+    def get_response(
+        cls,
+        request: Request,
+        user_id: int,
+        name: str,
+        build: Callable[[], Any],
+    ) -> Response:
+        """
+        Serve `name` for the user from cache, honouring If-None-Match.
+
+        Args:
+            request: The incoming request
+            user_id: The user whose graph data is requested
+            name: Identifier of the payload (e.g. "statistics")
+            build: Callable producing the serialized payload on a cache miss
+
+        Returns:
+            A 304 response if the client's copy is current, otherwise the payload
+        """
+        if not settings.CROSS_REQUEST_CACHING:
+            # Versions bumped in other processes would never be seen here
+            return Response(build(), headers={"Cache-Control": "private, no-cache"})
+
+        version = cls.get_version(user_id)
+        etag = ConditionalGet.entity_tag(version, name, user_id)
+        not_modified = ConditionalGet.not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        data_key = f"quality_graph:{name}:{user_id}:{version}"
+        data = cache.get(data_key)
+        if data is None:
+            data = build()
+            cache.set(data_key, data, timeout=CACHE_TIMEOUT)
+
+        return ConditionalGet.with_validators(Response(data), etag)
@@ -0,0 +1,89 @@
+"""
+Coalesced, on-commit maintenance of quality frequencies.
+"""
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.conf import settings
+
+from dreams.models import Quality
+
+from .commit_batches import CommitBatch
+from .conditional_requests import ChangeStamps
+
+logger = logging.getLogger(__name__)
+
+
+class QualityMaintenanceBatch(CommitBatch):
+    """
+    Quality IDs touched during one transaction, recounted once it commits.
+
+    A dream save fans out into several m2m_changed signals (set() sends both
+    post_remove and post_add); collecting their quality IDs here turns those
+    into one recount and one orphan cleanup per user.
+    """
+
+    def __init__(self) -> None:
+        self.touched: dict[int, set[int]] = defaultdict(set)
+        self.removed: dict[int, set[int]] = defaultdict(set)
+
+    def run(self) -> None:
+        """Run the coalesced recount."""
+        for user_id in self.touched.keys() | self.removed.keys():
+            removed = self.removed[user_id]
+            touched = self.touched[user_id] - removed
+            QualityMaintenance.refresh(user_id, touched, removed)
+
+
+class QualityMaintenance:
+    """Schedules and runs quality frequency recounts."""
+
+    @classmethod
+    def schedule(
+        cls,
+        user_id: int,
+        quality_ids: Iterable[int] = (),
+        removed_ids: Iterable[int] = (),
+    ) -> None:
+        """
+        Queue a frequency recount for the given qualities.
+
+        Args:
+            user_id: The user owning the qualities
+            quality_ids: Qualities that gained or lost dreams
+            removed_ids: Qualities that lost dreams and may now be orphaned
+        """
+        batch = QualityMaintenanceBatch.current()
+        if batch is None:
+            cls.refresh(user_id, set(quality_ids), set(removed_ids))
+            return
+        batch.touched[user_id].update(quality_ids)
+        batch.removed[user_id].update(removed_ids)
+
+    @staticmethod
+    def refresh(user_id: int, quality_ids: set[int], removed_ids: set[int]) -> None:
+        """
+        Recount frequencies and delete orphans, now or on a Celery worker.
+        Batches at or above settings.QUALITY_MAINTENANCE_CELERY_THRESHOLD
+        qualities are sent to the worker (0 disables deferral).
+        """
+        threshold = settings.QUALITY_MAINTENANCE_CELERY_THRESHOLD
+        if threshold and len(quality_ids) + len(removed_ids) >= threshold:
+            from dream_journal.celery import app as celery_app
+
+            celery_app.send_task(
+                "dreams.tasks.refresh_quality_frequencies",
+                args=[user_id, sorted(quality_ids), sorted(removed_ids)],
+            )
+            logger.info(
+                f"Deferred frequency recount of "
+                f"{len(quality_ids) + len(removed_ids)} qualities for user {user_id}"
+            )
+            return
+
+        Quality.refresh_frequencies(quality_ids)
+        Quality.refresh_frequencies(removed_ids, delete_orphans=True)
+        # Frequencies are rendered with every dream, so cached copies are stale
+        ChangeStamps.touch(user_id)
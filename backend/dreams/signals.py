@@ -1,55 +1,464 @@
+import functools
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.db import models
-from django.db.models.signals import m2m_changed, post_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from .models import Dream, Quality
+from .models import Dream, Image, Quality, QualityCooccurrence, UserJournalStats
+from .services.conditional_requests import ChangeStamps
+from .services.dream_search import DreamSearchIndex
+from .services.public_feed_cache import PublicFeedCache
+from .services.quality_graph_cache import QualityGraphCache
+from .services.quality_maintenance import QualityMaintenance
+
+# Set while bulk paths write rows directly and repair aggregates themselves
+_signals_suppressed: ContextVar[bool] = ContextVar(
+    "dreams_signals_suppressed", default=False
+)
+
+
+@contextmanager
+def suppress_dream_signals() -> Iterator[None]:
+    """
+    Skip the per-row handlers below for the duration of the block.
+    The caller becomes responsible for frequencies, co-occurrences and the
+    quality graph cache version.
+    """
+    token = _signals_suppressed.set(True)
+    try:
+        yield
+    finally:
+        _signals_suppressed.reset(token)
+
+
+def unless_suppressed(handler: Callable[..., None]) -> Callable[..., None]:
+    """Make a signal handler a no-op inside suppress_dream_signals()."""
+
+    @functools.wraps(handler)
+    def wrapper(*args: object, **kwargs: object) -> None:
+        if not _signals_suppressed.get():
+            handler(*args, **kwargs)
 
+    return wrapper
 
-@receiver(m2m_changed, sender=Dream.qualities.through)  # type: ignore[misc]
+
+def _image_owner_id(image: Image) -> int | None:
+    """The ID of the user owning an image's dream."""
+    return (
+        Dream.objects.filter(pk=image.dream_id)
+        .values_list("user_id", flat=True)
+        .first()
+    )
+
+
+@receiver(m2m_changed, sender=Dream.qualities.through)
+@unless_suppressed
 def update_quality_frequencies_and_cleanup(
     sender: type[models.Model],
-    instance: Dream,
+    instance: Dream | Quality,
     action: str,
+    reverse: bool,
     pk_set: set[int] | None,
     **kwargs: dict[str, object],
 ) -> None:
     """
     Update quality frequencies and clean up orphaned qualities.
     Triggered when the many-to-many relationship between Dream and Quality changes.
+    Affected qualities are collected and recounted once the transaction commits.
     """
-    if action in ["post_add", "post_remove", "post_clear"]:
-        # Update frequencies for affected qualities
-        if action == "post_clear":
-            # If clearing, update all qualities for this user
-            qualities = Quality.objects.filter(user=instance.user)
-            for quality in qualities:
-                quality.update_frequency()
-        elif pk_set:
-            # Update the changed qualities
-            qualities = Quality.objects.filter(pk__in=pk_set)
-            for quality in qualities:
-                quality.update_frequency()
-
-    if action == "post_remove" and pk_set:
-        # Check which qualities became orphaned (frequency = 0)
-        orphaned_qualities = Quality.objects.filter(pk__in=pk_set, frequency=0)
-        orphaned_qualities.delete()
-
-
-@receiver(post_delete, sender=Dream)  # type: ignore[misc]
+    if reverse:
+        # Changed from the quality side: only that quality's frequency moves
+        if action in ["post_add", "post_remove", "post_clear"]:
+            QualityMaintenance.schedule(instance.user_id, [instance.pk])
+        return
+
+    if not isinstance(instance, Dream):
+        return
+
+    if action == "pre_clear":
+        # Read what is about to be cleared while it is still linked
+        QualityMaintenance.schedule(
+            instance.user_id,
+            removed_ids=instance.qualities.values_list("pk", flat=True),
+        )
+    elif action == "post_add" and pk_set:
+        QualityMaintenance.schedule(instance.user_id, pk_set)
+    elif action == "post_remove" and pk_set:
+        # Delete qualities that became orphaned (frequency = 0)
+        QualityMaintenance.schedule(instance.user_id, removed_ids=pk_set)
+
+
+@receiver(m2m_changed, sender=Dream.qualities.through)
+@unless_suppressed
+def update_quality_cooccurrences(
+    sender: type[models.Model],
+    instance: Dream | Quality,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs: dict[str, object],
+) -> None:
+    """
+    Keep QualityCooccurrence rows in step with the Dream-Quality relationship.
+    Clears are handled before they happen, while the old qualities can still be read.
+    """
+    if reverse:
+        # Changed from the quality side: pk_set holds dream IDs
+        if not isinstance(instance, Quality):
+            return
+        if action == "pre_clear":
+            QualityCooccurrence.objects.filter(
+                models.Q(quality_a=instance) | models.Q(quality_b=instance)
+            ).delete()
+        elif action in ["post_add", "post_remove"] and pk_set:
+            for dream in Dream.objects.filter(pk__in=pk_set):
+                if action == "post_add":
+                    QualityCooccurrence.add_dream(dream, [instance.pk])
+                else:
+                    QualityCooccurrence.remove_dream(dream, [instance.pk])
+        return
+
+    if not isinstance(instance, Dream):
+        return
+
+    if action == "post_add" and pk_set:
+        QualityCooccurrence.add_dream(instance, pk_set)
+    elif action == "post_remove" and pk_set:
+        QualityCooccurrence.remove_dream(instance, pk_set)
+    elif action == "pre_clear":
+        QualityCooccurrence.remove_dream(
+            instance, instance.qualities.values_list("pk", flat=True)
+        )
+
+
+@receiver(pre_delete, sender=Dream)
+@unless_suppressed
+def remove_cooccurrences_before_dream_deletion(
+    sender: type[models.Model], instance: Dream, **kwargs: dict[str, object]
+) -> None:
+    """
+    Drop the dream from its quality pairs while its qualities can still be read.
+    The quality IDs are kept on the instance for the post_delete recount.
+    """
+    quality_ids = list(instance.qualities.values_list("pk", flat=True))
+    instance._deleted_quality_ids = quality_ids  # type: ignore[attr-defined]
+    QualityCooccurrence.remove_dream(instance, quality_ids)
+
+
+@receiver(post_delete, sender=Dream)
+@unless_suppressed
 def cleanup_qualities_after_dream_deletion(
     sender: type[models.Model], instance: Dream, **kwargs: dict[str, object]
 ) -> None:
     """
     Update frequencies and clean up orphaned qualities after a dream is deleted.
     """
-    # Get qualities that were associated with this dream before deletion
-    # Note: The M2M relationship is already cleared by Django before post_delete
-    # So we need to update all user qualities
-    user_qualities = Quality.objects.filter(user=instance.user)
+    # The M2M rows are already gone by post_delete, so use the IDs read in
+    # pre_delete and recount only those qualities
+    QualityMaintenance.schedule(
+        instance.user_id, removed_ids=getattr(instance, "_deleted_quality_ids", [])
+    )
+
+
+@receiver(m2m_changed, sender=Dream.qualities.through)
+@unless_suppressed
+def invalidate_quality_graph_on_relationship_change(
+    sender: type[models.Model],
+    instance: Dream | Quality,
+    action: str,
+    **kwargs: dict[str, object],
+) -> None:
+    """Invalidate cached quality graph data when dream qualities change."""
+    if action in ["post_add", "post_remove", "post_clear"]:
+        QualityGraphCache.bump_version(instance.user_id)
+
+
+@receiver(post_save, sender=Quality)
+@receiver(post_delete, sender=Quality)
+@receiver(post_delete, sender=Dream)
+@unless_suppressed
+def invalidate_quality_graph_on_write(
+    sender: type[models.Model], instance: Dream | Quality, **kwargs: dict[str, object]
+) -> None:
+    """Invalidate cached quality graph data when a dream or quality is written."""
+    QualityGraphCache.bump_version(instance.user_id)
+
+
+@receiver(post_save, sender=Dream)
+@unless_suppressed
+def refresh_search_text_on_dream_save(
+    sender: type[models.Model],
+    instance: Dream,
+    update_fields: frozenset[str] | None,
+    **kwargs: dict[str, object],
+) -> None:
+    """Rebuild a dream's search document when its description may have changed."""
+    if update_fields is None or "description" in update_fields:
+        DreamSearchIndex.schedule([instance.pk])
+
+
+@receiver(m2m_changed, sender=Dream.qualities.through)
+@unless_suppressed
+def refresh_search_text_on_relationship_change(
+    sender: type[models.Model],
+    instance: Dream | Quality,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs: dict[str, object],
+) -> None:
+    """Rebuild search documents when quality names are attached or detached."""
+    if not reverse:
+        if action in ["post_add", "post_remove", "post_clear"]:
+            DreamSearchIndex.schedule([instance.pk])
+        return
+
+    # Changed from the quality side: pk_set holds dream IDs
+    if action == "pre_clear":
+        instance._search_dream_ids = list(  # type: ignore[union-attr]
+            instance.dream_set.values_list("pk", flat=True)  # type: ignore[union-attr]
+        )
+    elif action == "post_clear":
+        DreamSearchIndex.schedule(getattr(instance, "_search_dream_ids", []))
+    elif action in ["post_add", "post_remove"] and pk_set:
+        DreamSearchIndex.schedule(pk_set)
+
+
+@receiver(pre_delete, sender=Quality)
+@unless_suppressed
+def collect_search_dreams_before_quality_deletion(
+    sender: type[models.Model], instance: Quality, **kwargs: dict[str, object]
+) -> None:
+    """Remember which dreams mention a quality that is about to be deleted."""
+    # Orphan cleanup deletes qualities after recounting them to zero, so
+    # there is nothing to read for those
+    if instance.frequency:
+        instance._search_dream_ids = list(  # type: ignore[attr-defined]
+            instance.dream_set.values_list("pk", flat=True)
+        )
+
+
+@receiver(post_delete, sender=Quality)
+@unless_suppressed
+def refresh_search_text_after_quality_deletion(
+    sender: type[models.Model], instance: Quality, **kwargs: dict[str, object]
+) -> None:
+    """Drop a deleted quality's name from the search documents that had it."""
+    DreamSearchIndex.schedule(getattr(instance, "_search_dream_ids", []))
+
+
+@receiver(post_save, sender=Quality)
+@unless_suppressed
+def refresh_search_text_on_quality_rename(
+    sender: type[models.Model],
+    instance: Quality,
+    created: bool,
+    update_fields: frozenset[str] | None,
+    **kwargs: dict[str, object],
+) -> None:
+    """Rebuild the search documents of dreams using a renamed quality."""
+    if created or (update_fields is not None and "name" not in update_fields):
+        return
+    DreamSearchIndex.schedule(
+        Dream.qualities.through.objects.filter(quality_id=instance.pk).values_list(
+            "dream_id", flat=True
+        )
+    )
+
+
+@receiver(post_delete, sender=Dream)
+@unless_suppressed
+def remove_search_entry_after_dream_deletion(
+    sender: type[models.Model], instance: Dream, **kwargs: dict[str, object]
+) -> None:
+    """Drop a deleted dream from the search index."""
+    DreamSearchIndex.remove([instance.pk])
+
+
+@receiver(post_save, sender=Dream)
+@receiver(post_delete, sender=Dream)
+@unless_suppressed
+def invalidate_public_feed_on_dream_write(
+    sender: type[models.Model], instance: Dream, **kwargs: dict[str, object]
+) -> None:
+    """
+    Invalidate cached Astral Plane pages when a public dream is written, or a
+    dream becomes or stops being public.
+    """
+    was_public = getattr(instance, "_loaded_is_public", False)
+    if instance.is_public or was_public:
+        PublicFeedCache.bump_version()
+
+
+@receiver(m2m_changed, sender=Dream.qualities.through)
+@unless_suppressed
+def invalidate_public_feed_on_relationship_change(
+    sender: type[models.Model],
+    instance: Dream | Quality,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs: dict[str, object],
+) -> None:
+    """Invalidate cached Astral Plane pages when a public dream's qualities change."""
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if not reverse:
+        if isinstance(instance, Dream) and instance.is_public:
+            PublicFeedCache.bump_version()
+    elif action == "post_clear" or (
+        pk_set and Dream.objects.filter(pk__in=pk_set, is_public=True).exists()
+    ):
+        PublicFeedCache.bump_version()
 
-    for quality in user_qualities:
-        quality.update_frequency()
 
-    # Delete qualities with frequency = 0
-    user_qualities.filter(frequency=0).delete()
+@receiver(post_save, sender=Quality)
+@unless_suppressed
+def invalidate_public_feed_on_quality_rename(
+    sender: type[models.Model],
+    instance: Quality,
+    created: bool,
+    update_fields: frozenset[str] | None,
+    **kwargs: dict[str, object],
+) -> None:
+    """Invalidate cached Astral Plane pages when a quality they show is renamed."""
+    if created or (update_fields is not None and "name" not in update_fields):
+        return
+    if instance.dream_set.filter(is_public=True).exists():
+        PublicFeedCache.bump_version()
+
+
+@receiver(post_save, sender=Image)
+@receiver(post_delete, sender=Image)
+@unless_suppressed
+def invalidate_public_feed_on_image_write(
+    sender: type[models.Model], instance: Image, **kwargs: dict[str, object]
+) -> None:
+    """Invalidate cached Astral Plane pages when a public dream's images change."""
+    if Dream.objects.filter(pk=instance.dream_id, is_public=True).exists():
+        PublicFeedCache.bump_version()
+
+
+@receiver(post_save, sender=Dream)
+@receiver(post_delete, sender=Dream)
+@receiver(post_save, sender=Quality)
+@receiver(post_delete, sender=Quality)
+@unless_suppressed
+def touch_change_stamp_on_write(
+    sender: type[models.Model], instance: Dream | Quality, **kwargs: dict[str, object]
+) -> None:
+    """Invalidate the owner's conditional GET validators when a row is written."""
+    ChangeStamps.touch(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Dream.qualities.through)
+@unless_suppressed
+def touch_change_stamp_on_relationship_change(
+    sender: type[models.Model],
+    instance: Dream | Quality,
+    action: str,
+    **kwargs: dict[str, object],
+) -> None:
+    """Invalidate the owner's conditional GET validators when qualities change."""
+    if action in ["post_add", "post_remove", "post_clear"]:
+        ChangeStamps.touch(instance.user_id)
+
+
+@receiver(post_save, sender=Image)
+@receiver(post_delete, sender=Image)
+@unless_suppressed
+def touch_change_stamp_on_image_write(
+    sender: type[models.Model], instance: Image, **kwargs: dict[str, object]
+) -> None:
+    """Invalidate the owner's conditional GET validators when an image changes."""
+    user_id = _image_owner_id(instance)
+    if user_id is not None:
+        ChangeStamps.touch(user_id)
+
+
+@receiver(post_save, sender=Dream)
+@unless_suppressed
+def adjust_journal_stats_on_dream_save(
+    sender: type[models.Model],
+    instance: Dream,
+    created: bool,
+    **kwargs: dict[str, object],
+) -> None:
+    """Count a new dream, or a dream that became or stopped being public."""
+    was_public = getattr(instance, "_loaded_is_public", False)
+    if created:
+        UserJournalStats.adjust(
+            instance.user_id,
+            dreams=1,
+            public_dreams=int(instance.is_public),
+            last_dream_at=instance.created,
+        )
+    elif instance.is_public != was_public:
+        UserJournalStats.adjust(
+            instance.user_id, public_dreams=1 if instance.is_public else -1
+        )
+
+
+@receiver(post_delete, sender=Dream)
+@unless_suppressed
+def adjust_journal_stats_on_dream_delete(
+    sender: type[models.Model], instance: Dream, **kwargs: dict[str, object]
+) -> None:
+    """Uncount a deleted dream and find the newest remaining one."""
+    UserJournalStats.adjust(
+        instance.user_id, dreams=-1, public_dreams=-int(instance.is_public)
+    )
+    UserJournalStats.recount(instance.user_id, "last_dream_at")
+
+
+@receiver(post_save, sender=Quality)
+@unless_suppressed
+def adjust_journal_stats_on_quality_create(
+    sender: type[models.Model],
+    instance: Quality,
+    created: bool,
+    **kwargs: dict[str, object],
+) -> None:
+    """Count a quality created on its own (get_or_create_many recounts itself)."""
+    if created:
+        UserJournalStats.adjust(instance.user_id, qualities=1)
+
+
+@receiver(post_delete, sender=Quality)
+@unless_suppressed
+def adjust_journal_stats_on_quality_delete(
+    sender: type[models.Model], instance: Quality, **kwargs: dict[str, object]
+) -> None:
+    """Uncount a deleted quality, including orphans removed after a recount."""
+    UserJournalStats.adjust(instance.user_id, qualities=-1)
+
+
+@receiver(post_save, sender=Image)
+@unless_suppressed
+def adjust_journal_stats_on_image_create(
+    sender: type[models.Model],
+    instance: Image,
+    created: bool,
+    **kwargs: dict[str, object],
+) -> None:
+    """Count a new image; status updates leave the counters alone."""
+    user_id = _image_owner_id(instance) if created else None
+    if user_id is not None:
+        UserJournalStats.adjust(user_id, images=1)
+
+
+@receiver(post_delete, sender=Image)
+@unless_suppressed
+def adjust_journal_stats_on_image_delete(
+    sender: type[models.Model], instance: Image, **kwargs: dict[str, object]
+) -> None:
+    """
+    Uncount a deleted image.
+    Images are deleted before their dream in a cascade, so the owner can be read.
+    """
+    user_id = _image_owner_id(instance)
+    if user_id is not None:
+        UserJournalStats.adjust(user_id, images=-1)
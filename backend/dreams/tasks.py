@@ -4,10 +4,19 @@ import os
 from typing import Any
 
 from celery import Task, shared_task
+from django.conf import settings
+from django.contrib.auth.models import User
 from google import genai
 from google.cloud import storage
 
-from .models import Image
+from .models import Image, Quality, UserJournalStats
+from .services import object_storage
+from .services.bulk_deletion import delete_dreams, delete_user
+from .services.conditional_requests import ChangeStamps
+from .services.dream_export import EXPORT_FORMATS, EXPORT_URL_EXPIRATION, export_dreams
+from .services.dream_import import import_dreams
+from .services.frequency_reconciliation import reconcile_frequencies
+from .services.quality_graph_cache import QualityGraphCache
 
 logger = logging.getLogger(__name__)
 
@@ -189,3 +198,195 @@ def generate_dream_image(
             raise self.retry(exc=exc, countdown=60 * (2**self.request.retries)) from exc
 
         return {"status": "error", "error": str(exc)}
+
+
+@shared_task
+def refresh_quality_frequencies(
+    user_id: int, quality_ids: list[int], removed_ids: list[int]
+) -> dict[str, Any]:
+    """
+    Celery task to recount quality frequencies deferred from a large write.
+
+    Args:
+        user_id: The user owning the qualities
+        quality_ids: Qualities that gained or lost dreams
+        removed_ids: Qualities that lost dreams and may now be orphaned
+
+    Returns:
+        dict containing task status and the number of qualities recounted
+    """
+    Quality.refresh_frequencies(quality_ids)
+    Quality.refresh_frequencies(removed_ids, delete_orphans=True)
+    QualityGraphCache.bump_version(user_id)
+    ChangeStamps.touch(user_id)
+
+    logger.info(f"Recounted {len(quality_ids) + len(removed_ids)} qualities")
+    return {"status": "completed", "qualities": len(quality_ids) + len(removed_ids)}
+
+
+@shared_task(bind=True)
+def bulk_delete_dreams(
+    self: Task, user_id: int, dream_ids: list[int]
+) -> dict[str, Any]:
+    """
+    Celery task to delete many of a user's dreams, reporting progress per batch.
+
+    Args:
+        user_id: The user owning the dreams
+        dream_ids: The dreams to delete; other users' dreams are ignored
+
+    Returns:
+        dict containing task status and the number of dreams deleted
+    """
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        logger.error(f"User {user_id} does not exist")
+        return {"status": "error", "error": f"User {user_id} does not exist"}
+
+    def report(done: int, total: int) -> None:
+        self.update_state(state="PROGRESS", meta={"done": done, "total": total})
+
+    deleted = delete_dreams(user, dream_ids, progress=report)
+    return {"status": "completed", "deleted": deleted}
+
+
+@shared_task(bind=True)
+def delete_user_account(self: Task, user_id: int) -> dict[str, Any]:
+    """
+    Celery task to delete a user and all of their journal data in batches.
+
+    Args:
+        user_id: The user to delete
+
+    Returns:
+        dict containing task status and the number of dreams deleted
+    """
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        logger.error(f"User {user_id} does not exist")
+        return {"status": "error", "error": f"User {user_id} does not exist"}
+
+    def report(done: int, total: int) -> None:
+        self.update_state(state="PROGRESS", meta={"done": done, "total": total})
+
+    deleted = delete_user(user, progress=report)
+    return {"status": "completed", "deleted": deleted}
+
+
+@shared_task(bind=True)
+def import_dream_file(
+    self: Task, user_id: int, path: str, fmt: str, total_bytes: int
+) -> dict[str, Any]:
+    """
+    Celery task to import a dream file staged in GCS, reporting progress in
+    bytes read per chunk. The staged file is deleted afterwards.
+
+    Args:
+        user_id: The user the dreams are imported for
+        path: GCS path of the staged file
+        fmt: "jsonl" or "csv"
+        total_bytes: Size of the staged file
+
+    Returns:
+        dict containing task status and the import report
+    """
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        logger.error(f"User {user_id} does not exist")
+        object_storage.delete(path)
+        return {"status": "error", "error": f"User {user_id} does not exist"}
+
+    def report(done: int, total: int) -> None:
+        self.update_state(state="PROGRESS", meta={"done": done, "total": total})
+
+    try:
+        result = import_dreams(
+            user, object_storage.read_lines(path), fmt, total_bytes, progress=report
+        )
+    finally:
+        object_storage.delete(path)
+    return {"status": "completed", **result.as_dict()}
+
+
+@shared_task(bind=True)
+def export_dream_file(self: Task, user_id: int, fmt: str) -> dict[str, Any]:
+    """
+    Celery task to export a user's journal to GCS, reporting progress in
+    dreams written per chunk. Each export is written under its task ID, so
+    concurrent exports never overwrite each other.
+
+    Args:
+        user_id: The user whose dreams are exported
+        fmt: "jsonl" or "csv"
+
+    Returns:
+        dict containing task status, the GCS path and a signed download URL
+    """
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        logger.error(f"User {user_id} does not exist")
+        return {"status": "error", "error": f"User {user_id} does not exist"}
+
+    def report(done: int, total: int) -> None:
+        self.update_state(state="PROGRESS", meta={"done": done, "total": total})
+
+    total = UserJournalStats.for_user(user).dream_count
+    path = f"users/{user_id}/exports/{self.request.id}.{fmt}"
+    size = object_storage.write_chunks(
+        path,
+        export_dreams(user, fmt, total=total, progress=report),
+        EXPORT_FORMATS[fmt],
+    )
+    return {
+        "status": "completed",
+        "path": path,
+        "url": object_storage.signed_url(path, EXPORT_URL_EXPIRATION),
+        "bytes": size,
+    }
+
+
+@shared_task
+def reconcile_quality_frequencies(shard_count: int | None = None) -> dict[str, Any]:
+    """
+    Periodic Celery task that fans frequency reconciliation out over user shards.
+
+    Args:
+        shard_count: Number of shards; defaults to settings.FREQUENCY_RECONCILIATION_SHARDS
+
+    Returns:
+        dict containing task status and the number of shards queued
+    """
+    shard_count = shard_count or settings.FREQUENCY_RECONCILIATION_SHARDS
+    for shard in range(shard_count):
+        reconcile_quality_frequencies_shard.delay(shard, shard_count)
+
+    logger.info(f"Queued frequency reconciliation over {shard_count} shards")
+    return {"status": "queued", "shards": shard_count}
+
+
+@shared_task
+def reconcile_quality_frequencies_shard(
+    shard: int, shard_count: int, fix: bool = True
+) -> dict[str, Any]:
+    """
+    Celery task to recount the frequencies of one shard of users.
+
+    Args:
+        shard: The shard to check (user_id % shard_count == shard)
+        shard_count: Total number of shards
+        fix: Write the recounted frequencies; False only reports drift
+
+    Returns:
+        dict containing task status and the drift report
+    """
+    report = reconcile_frequencies(shard, shard_count, fix=fix)
+    if report.drifted:
+        logger.warning(
+            f"Found {report.drifted} drifted quality frequencies in shard "
+            f"{shard}/{shard_count} (total drift {report.absolute_drift})"
+        )
+    return {"status": "completed", "shard": shard, **report.as_dict()}
@@ -1,9 +1,63 @@
+import csv
+import json
+import os
+import random
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+from itertools import pairwise
+from typing import TYPE_CHECKING, cast
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connection, transaction
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
 from rest_framework import status
-from rest_framework.test import APIClient, APITestCase
-
-from .models import Dream, Quality
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+
+from .models import (
+    DREAM_ID_SAMPLE_SIZE,
+    IMAGE_PREVIEW_COUNT,
+    BackgroundJob,
+    Dream,
+    Image,
+    Quality,
+    QualityCooccurrence,
+    UserJournalStats,
+)
+from .renderers import FastJSONRenderer
+from .serializers import (
+    DESCRIPTION_PREVIEW_LENGTH,
+    DreamListSerializer,
+    QualitySerializer,
+)
+from .services.background_jobs import BackgroundJobs
+from .services.bulk_deletion import delete_dreams, delete_user
+from .services.conditional_requests import PUBLIC_SCOPE, ChangeStamps
+from .services.dream_calendar import LATEST_DATE, DreamCalendar, day_bounds
+from .services.dream_export import export_dreams
+from .services.dream_import import import_dreams
+from .services.dream_search import DreamSearchIndex
+from .services.frequency_reconciliation import reconcile_frequencies
+from .services.list_rendering import DreamListRows, QualityRows
+from .services.public_feed_cache import PublicFeedCache
+from .services.quality_maintenance import QualityMaintenance
+from .tasks import export_dream_file, import_dream_file
+from .views import DreamViewSet
+
+if TYPE_CHECKING:
+    from django.http import StreamingHttpResponse
 
 
 class SecurityTestCase(APITestCase):
@@ -172,6 +226,47 @@ class QualityGraphTestCase(TestCase):
         for conn in connections:
             self.assertEqual(conn.connection_strength, 1)
 
+    def test_quality_connections_fixed_queries(self) -> None:
+        """Test that connections are computed in two queries with filters applied."""
+        self.dream1.qualities.add(self.lucid)  # flying+lucid now share 2 dreams
+
+        # One for the strengths, one for the dream ID samples
+        with self.assertNumQueries(2):
+            connections = self.flying.get_connections()
+
+        self.assertEqual(
+            [(c.quality_name, c.shared_dream_ids) for c in connections],
+            [
+                ("lucid", sorted([self.dream1.pk, self.dream2.pk])),
+                ("water", [self.dream1.pk]),
+            ],
+        )
+        self.assertEqual(
+            [c.quality_name for c in self.flying.get_connections(min_strength=2)],
+            ["lucid"],
+        )
+        self.assertEqual(len(self.flying.get_connections(limit=1)), 1)
+
+    def test_quality_connections_endpoint(self) -> None:
+        """Test the connections endpoint and its query parameters."""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = f"/api/qualities/{self.flying.pk}/connections/"
+
+        response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data[0]["connection_strength"], 1)
+
+        response = client.get(url, {"limit": 1})
+        self.assertEqual(len(response.data), 1)
+
+        response = client.get(url, {"min_strength": 2})
+        self.assertEqual(response.data, [])
+
+        response = client.get(url, {"limit": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_build_quality_graph(self) -> None:
         """Test building the complete quality graph."""
         graph = Dream.build_quality_graph(self.user)
@@ -209,6 +304,556 @@ class QualityGraphTestCase(TestCase):
             self.assertEqual(stat.frequency, 2)
 
 
+class QualityCooccurrenceTestCase(TestCase):
+    """Test that the co-occurrence table tracks dream-quality changes."""
+
+    def setUp(self) -> None:
+        """Set up test user and qualities."""
+        self.user = User.objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.flying = Quality.objects.create(user=self.user, name="flying")
+        self.water = Quality.objects.create(user=self.user, name="water")
+        self.lucid = Quality.objects.create(user=self.user, name="lucid")
+
+    def pairs(self) -> dict[frozenset[int], list[int]]:
+        """Return the stored pairs as {quality id pair: dream ids}."""
+        return {
+            frozenset((row.quality_a_id, row.quality_b_id)): row.dream_ids
+            for row in QualityCooccurrence.objects.filter(user=self.user)
+        }
+
+    def expected_pairs(self) -> dict[frozenset[int], list[int]]:
+        """Compute the pairs directly from the dreams."""
+        expected: dict[frozenset[int], list[int]] = {}
+        for dream in Dream.objects.filter(user=self.user).order_by("pk"):
+            ids = sorted(dream.qualities.values_list("pk", flat=True))
+            for i, q1 in enumerate(ids):
+                for q2 in ids[i + 1 :]:
+                    expected.setdefault(frozenset((q1, q2)), []).append(dream.pk)
+        return expected
+
+    def test_pair_created_concurrently(self) -> None:
+        """Test losing the race to create a pair merges into the winner's row."""
+        first = Dream.objects.create(user=self.user, description="First")
+        first.qualities.add(self.flying, self.water)
+        second = Dream.objects.create(user=self.user, description="Second")
+
+        # The first pass misses the row, as if it was committed after its read
+        select_for_update = QualityCooccurrence.objects.select_for_update
+        missed: list[bool] = []
+
+        def racing_read() -> QuerySet[QualityCooccurrence]:
+            if not missed:
+                missed.append(True)
+                return QualityCooccurrence.objects.none()
+            return select_for_update()
+
+        with patch.object(
+            QualityCooccurrence.objects,
+            "select_for_update",
+            side_effect=racing_read,
+        ):
+            second.qualities.add(self.flying, self.water)
+        self.assertEqual(missed, [True])
+        self.assertEqual(self.pairs(), self.expected_pairs())
+
+    def test_add_remove_and_clear(self) -> None:
+        """Pairs follow add, remove, set and clear on the relationship."""
+        dream1 = Dream.objects.create(user=self.user, description="One")
+        dream2 = Dream.objects.create(user=self.user, description="Two")
+
+        dream1.qualities.add(self.flying, self.water)
+        dream1.qualities.add(self.lucid)
+        dream2.qualities.set([self.flying, self.water])
+        self.assertEqual(self.pairs(), self.expected_pairs())
+        self.assertEqual(
+            self.pairs()[frozenset((self.flying.pk, self.water.pk))],
+            [dream1.pk, dream2.pk],
+        )
+
+        dream1.qualities.remove(self.water)
+        self.assertEqual(self.pairs(), self.expected_pairs())
+
+        dream2.qualities.clear()
+        self.assertEqual(self.pairs(), self.expected_pairs())
+        self.assertEqual(
+            self.pairs(), {frozenset((self.flying.pk, self.lucid.pk)): [dream1.pk]}
+        )
+
+    def test_dream_deletion_removes_pairs(self) -> None:
+        """Deleting a dream removes it from every pair it contributed to."""
+        dream1 = Dream.objects.create(user=self.user, description="One")
+        dream2 = Dream.objects.create(user=self.user, description="Two")
+        dream1.qualities.add(self.flying, self.water, self.lucid)
+        dream2.qualities.add(self.flying, self.water)
+
+        dream1.delete()
+        self.assertEqual(self.pairs(), self.expected_pairs())
+        self.assertEqual(
+            self.pairs(), {frozenset((self.flying.pk, self.water.pk)): [dream2.pk]}
+        )
+
+    def test_rebuild_for_user(self) -> None:
+        """Rebuilding from scratch reproduces the maintained rows."""
+        dream = Dream.objects.create(user=self.user, description="One")
+        dream.qualities.add(self.flying, self.water, self.lucid)
+        maintained = self.pairs()
+
+        QualityCooccurrence.objects.filter(user=self.user).delete()
+        QualityCooccurrence.rebuild_for_user(self.user)
+        self.assertEqual(self.pairs(), maintained)
+
+    def test_graph_reads_from_table(self) -> None:
+        """The quality graph is built from one query over the pair table."""
+        dream = Dream.objects.create(user=self.user, description="One")
+        dream.qualities.add(self.flying, self.water)
+
+        with self.assertNumQueries(2):
+            graph = Dream.build_quality_graph(self.user)
+
+        self.assertEqual(graph.nodes[self.flying.pk].edges, {self.water.pk: [dream.pk]})
+        self.assertEqual(graph.nodes[self.water.pk].edges, {self.flying.pk: [dream.pk]})
+        self.assertEqual(graph.nodes[self.lucid.pk].edges, {})
+
+
+class SparseStatisticsEngineTestCase(TestCase):
+    """Test the sparse-matrix statistics engine against the QualityGraph path."""
+
+    def setUp(self) -> None:
+        """Set up a randomly tagged journal with many ties."""
+        rng = random.Random(42)
+        self.user = User.objects.create_user(
+            username="testuser", password="password123"
+        )
+        qualities = [
+            Quality.objects.create(user=self.user, name=f"quality{i:02d}")
+            for i in range(25)
+        ]
+        for i in range(80):
+            dream = Dream.objects.create(user=self.user, description=f"Dream {i}")
+            dream.qualities.add(*rng.sample(qualities, rng.randint(0, 7)))
+
+    def test_parity_with_python_engine(self) -> None:
+        """Test both engines return identical statistics."""
+        python_stats = Dream.get_quality_statistics(self.user, engine="python")
+        sparse_stats = Dream.get_quality_statistics(self.user, engine="sparse")
+
+        self.assertEqual(len(sparse_stats), len(python_stats))
+        self.assertEqual(sparse_stats, python_stats)
+
+    def test_parity_beyond_sample(self) -> None:
+        """Test both engines sample the same most recent dreams of strong pairs."""
+        user = User.objects.create_user(username="dense", password="password123")
+        qualities = Quality.get_or_create_many(user, ["alpha", "beta", "gamma"])
+        dreams = []
+        for i in range(3 * DREAM_ID_SAMPLE_SIZE):
+            dream = Dream.objects.create(user=user, description=f"Dream {i}")
+            dream.qualities.add(*qualities[: 2 + i % 2])
+            dreams.append(dream)
+
+        python_stats = Dream.get_quality_statistics(user, engine="python")
+        sparse_stats = Dream.get_quality_statistics(user, engine="sparse")
+        self.assertEqual(sparse_stats, python_stats)
+
+        alpha = next(stat for stat in python_stats if stat.name == "alpha")
+        beta = alpha.top_connections[0]
+        self.assertEqual(beta.connection_strength, len(dreams))
+        self.assertEqual(
+            beta.shared_dream_ids, [d.pk for d in dreams[-DREAM_ID_SAMPLE_SIZE:]]
+        )
+        gamma = alpha.top_connections[1]
+        self.assertEqual(
+            gamma.shared_dream_ids,
+            [d.pk for d in dreams[1::2][-DREAM_ID_SAMPLE_SIZE:]],
+        )
+
+    def test_empty_journal(self) -> None:
+        """Test the sparse engine handles users without qualities."""
+        user = User.objects.create_user(username="empty", password="password123")
+        self.assertEqual(Dream.get_quality_statistics(user, engine="sparse"), [])
+
+
+class QualitySubgraphTestCase(APITestCase):
+    """Test the k-hop subgraph endpoint."""
+
+    def setUp(self) -> None:
+        """Set up a chain of qualities: flying - water - lucid - falling."""
+        self.user = User.objects.create_user(
+            username="testuser", password="password123"
+        )
+        names = ["flying", "water", "lucid", "falling"]
+        self.q = {
+            name: Quality.objects.create(user=self.user, name=name) for name in names
+        }
+        self.dreams = []
+        for first, second in pairwise(names):
+            dream = Dream.objects.create(user=self.user, description=first)
+            dream.qualities.add(self.q[first], self.q[second])
+            self.dreams.append(dream)
+        # flying and water share a second dream
+        extra = Dream.objects.create(user=self.user, description="again")
+        extra.qualities.add(self.q["flying"], self.q["water"])
+        self.dreams.append(extra)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = f"/api/qualities/{self.q['flying'].pk}/subgraph/"
+
+    def node_names(self, data: dict) -> list[str]:
+        """Return the node names of a subgraph response."""
+        return [node["name"] for node in data["nodes"]]
+
+    def test_hops(self) -> None:
+        """Test the neighbourhood grows with the hop count."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.node_names(response.data), ["flying", "water"])
+        self.assertEqual(response.data["edges"][0]["strength"], 2)
+        self.assertIsNone(response.data["edges"][0]["dream_ids"])
+
+        response = self.client.get(self.url, {"hops": 3})
+        self.assertEqual(
+            self.node_names(response.data), ["flying", "water", "lucid", "falling"]
+        )
+        self.assertEqual([n["hops"] for n in response.data["nodes"]], [0, 1, 2, 3])
+        self.assertEqual(len(response.data["edges"]), 3)
+        self.assertFalse(response.data["truncated"])
+
+    def test_limits_and_samples(self) -> None:
+        """Test max_nodes, min_strength and dream_sample."""
+        response = self.client.get(self.url, {"hops": 3, "max_nodes": 2})
+        self.assertEqual(self.node_names(response.data), ["flying", "water"])
+        self.assertTrue(response.data["truncated"])
+
+        response = self.client.get(self.url, {"hops": 3, "min_strength": 2})
+        self.assertEqual(self.node_names(response.data), ["flying", "water"])
+
+        response = self.client.get(self.url, {"dream_sample": 1})
+        self.assertEqual(response.data["edges"][0]["dream_ids"], [self.dreams[-1].pk])
+
+    def test_invalid_parameters(self) -> None:
+        """Test out-of-range or malformed parameters are rejected."""
+        invalid: list[dict[str, int | str]] = [
+            {"hops": 0},
+            {"hops": "x"},
+            {"max_nodes": 1000},
+        ]
+        for params in invalid:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BoundedConnectionPayloadTestCase(APITestCase):
+    """Test that dream ID lists are bounded and pageable with a cursor."""
+
+    def setUp(self) -> None:
+        """Set up two qualities sharing more dreams than the sample size."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.flying = Quality.objects.create(user=self.user, name="flying")
+        self.water = Quality.objects.create(user=self.user, name="water")
+        self.dreams = []
+        for i in range(DREAM_ID_SAMPLE_SIZE + 5):
+            dream = Dream.objects.create(user=self.user, description=f"Dream {i}")
+            dream.qualities.add(self.flying, self.water)
+            self.dreams.append(dream)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_connections_return_sample(self) -> None:
+        """Test connections report the full count but a bounded ID sample."""
+        response = self.client.get(f"/api/qualities/{self.flying.pk}/connections/")
+        connection = response.data[0]
+        self.assertEqual(connection["connection_strength"], len(self.dreams))
+        self.assertEqual(
+            connection["shared_dream_ids"],
+            [d.pk for d in self.dreams[-DREAM_ID_SAMPLE_SIZE:]],
+        )
+
+    def test_statistics_return_sample(self) -> None:
+        """Test statistics embed at most the sample size of dream IDs."""
+        response = self.client.get("/api/qualities/statistics/")
+        for stat in response.data:
+            connection = stat["top_connections"][0]
+            self.assertEqual(connection["connection_strength"], len(self.dreams))
+            self.assertEqual(len(connection["shared_dream_ids"]), DREAM_ID_SAMPLE_SIZE)
+
+    def test_connection_dreams_cursor(self) -> None:
+        """Test paging through every dream behind one connection."""
+        url = (
+            f"/api/qualities/{self.flying.pk}/connections/{self.water.pk}/dreams/"
+            "?page_size=6"
+        )
+        seen: list[int] = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            seen.extend(dream["id"] for dream in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(sorted(seen), sorted(d.pk for d in self.dreams))
+
+    def test_connection_dreams_other_user_quality(self) -> None:
+        """Test the other quality must belong to the requesting user."""
+        other_user = User.objects.create_user(username="other", password="pw123456")
+        foreign = Quality.objects.create(user=other_user, name="water")
+        response = self.client.get(
+            f"/api/qualities/{self.flying.pk}/connections/{foreign.pk}/dreams/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(CROSS_REQUEST_CACHING=True)
+class QualityGraphCacheTestCase(APITestCase):
+    """Test versioned caching and ETags for graph and statistics endpoints."""
+
+    def setUp(self) -> None:
+        """Set up a user with one tagged dream."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.flying = Quality.objects.create(user=self.user, name="flying")
+        self.water = Quality.objects.create(user=self.user, name="water")
+        self.dream = Dream.objects.create(user=self.user, description="Flying")
+        self.dream.qualities.add(self.flying, self.water)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_statistics_served_from_cache(self) -> None:
+        """Test a repeated request does not rebuild the statistics."""
+        response = self.client.get("/api/qualities/statistics/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get("/api/qualities/statistics/")
+        self.assertEqual(cached.data, response.data)
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+    @override_settings(CROSS_REQUEST_CACHING=False)
+    def test_not_cached_without_shared_cache(self) -> None:
+        """Test every request is built when the cache is per process."""
+        before = self.client.get("/api/qualities/statistics/")
+        self.assertNotIn("ETag", before)
+
+        # A version bumped by another process is invisible here
+        self.dream.qualities.remove(self.water)
+        after = self.client.get("/api/qualities/statistics/")
+        self.assertNotEqual(after.data, before.data)
+
+    def test_matching_etag_returns_not_modified(self) -> None:
+        """Test If-None-Match with the current ETag returns 304."""
+        response = self.client.get("/api/dreams/quality_graph/")
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                "/api/dreams/quality_graph/", HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_write_changes_version(self) -> None:
+        """Test changing dream qualities invalidates the cached graph."""
+        response = self.client.get("/api/dreams/quality_graph/")
+        etag = response["ETag"]
+
+        lucid = Quality.objects.create(user=self.user, name="lucid")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dream.qualities.add(lucid)
+
+        response = self.client.get(
+            "/api/dreams/quality_graph/", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data["nodes"]), 3)
+
+
+class FrequencyMaintenanceTestCase(TestCase):
+    """Test set-based frequency maintenance in the signal handlers."""
+
+    def make_journal(self, username: str, vocabulary: int) -> Dream:
+        """Create a user with `vocabulary` qualities and return a tagged dream."""
+        user = User.objects.create_user(username=username, password="password123")
+        qualities = [
+            Quality.objects.create(user=user, name=f"quality{i}")
+            for i in range(vocabulary)
+        ]
+        for quality in qualities:
+            Dream.objects.create(user=user).qualities.add(quality)
+        dream = Dream.objects.create(user=user, description="Target")
+        dream.qualities.add(*qualities[:2])
+        return dream
+
+    def delete_query_count(self, dream: Dream) -> int:
+        """Delete a dream and return the number of queries it took."""
+        with (
+            CaptureQueriesContext(connection) as queries,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            dream.delete()
+        return len(queries)
+
+    def test_dream_delete_cost_independent_of_vocabulary(self) -> None:
+        """Test deleting a dream costs the same for small and large vocabularies."""
+        small = self.delete_query_count(self.make_journal("small", 3))
+        large = self.delete_query_count(self.make_journal("large", 40))
+        self.assertEqual(small, large)
+
+    def test_frequencies_and_orphans_after_delete(self) -> None:
+        """Test frequencies are recounted and orphans removed after a delete."""
+        user = User.objects.create_user(username="u", password="password123")
+        flying = Quality.objects.create(user=user, name="flying")
+        water = Quality.objects.create(user=user, name="water")
+        dream1 = Dream.objects.create(user=user)
+        dream1.qualities.add(flying, water)
+        dream2 = Dream.objects.create(user=user)
+        dream2.qualities.add(flying)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            dream1.delete()
+
+        flying.refresh_from_db()
+        self.assertEqual(flying.frequency, 1)
+        self.assertFalse(Quality.objects.filter(pk=water.pk).exists())
+
+    def test_clear_recounts_cleared_qualities(self) -> None:
+        """Test clearing a dream's qualities recounts exactly those qualities."""
+        user = User.objects.create_user(username="u", password="password123")
+        flying = Quality.objects.create(user=user, name="flying")
+        dream1 = Dream.objects.create(user=user)
+        dream2 = Dream.objects.create(user=user)
+        with self.captureOnCommitCallbacks(execute=True):
+            dream1.qualities.add(flying)
+            dream2.qualities.add(flying)
+        flying.refresh_from_db()
+        self.assertEqual(flying.frequency, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            dream1.qualities.clear()
+
+        flying.refresh_from_db()
+        self.assertEqual(flying.frequency, 1)
+
+    def test_writes_coalesced_per_transaction(self) -> None:
+        """Test several writes in one transaction trigger a single recount."""
+        user = User.objects.create_user(username="u", password="password123")
+        flying = Quality.objects.create(user=user, name="flying")
+        water = Quality.objects.create(user=user, name="water")
+        dream = Dream.objects.create(user=user)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            dream.qualities.add(flying)
+            dream.qualities.set([water])
+            dream.qualities.add(flying)
+
+        with (
+            patch.object(
+                QualityMaintenance, "refresh", wraps=QualityMaintenance.refresh
+            ) as refresh,
+            CaptureQueriesContext(connection) as queries,
+        ):
+            for callback in callbacks:
+                callback()
+        refresh.assert_called_once()
+        updates = [q for q in queries if q["sql"].startswith('UPDATE "dreams_quality"')]
+        self.assertEqual(len(updates), 2)  # recount, then orphan candidates
+
+        flying.refresh_from_db()
+        water.refresh_from_db()
+        self.assertEqual((flying.frequency, water.frequency), (1, 1))
+
+    def test_rolled_back_savepoint_not_recounted(self) -> None:
+        """Test work scheduled in a rolled-back savepoint is dropped with it."""
+        user = User.objects.create_user(username="u", password="password123")
+        flying = Quality.objects.create(user=user, name="flying")
+        water = Quality.objects.create(user=user, name="water")
+        with self.captureOnCommitCallbacks(execute=True):
+            dream = Dream.objects.create(user=user)
+
+        with (
+            patch.object(
+                QualityMaintenance, "refresh", wraps=QualityMaintenance.refresh
+            ) as refresh,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                dream.qualities.add(flying)
+                Quality.objects.create(user=user, name="water")
+            dream.qualities.add(water)
+
+        refresh.assert_called_once_with(user.pk, {water.pk}, set())
+
+    @override_settings(QUALITY_MAINTENANCE_CELERY_THRESHOLD=2)
+    def test_large_batches_deferred_to_celery(self) -> None:
+        """Test batches over the threshold are sent to the Celery worker."""
+        user = User.objects.create_user(username="u", password="password123")
+        dream = Dream.objects.create(user=user)
+
+        with (
+            patch("dream_journal.celery.app.send_task") as send_task,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            Dream.objects.get(pk=dream.pk).qualities.set(
+                Quality.get_or_create_many(user, ["flying", "water"])
+            )
+
+        send_task.assert_called_once()
+        self.assertEqual(
+            send_task.call_args.args[0], "dreams.tasks.refresh_quality_frequencies"
+        )
+
+
+class DreamQualityUpsertTestCase(APITestCase):
+    """Test quality name handling in DreamSerializer writes."""
+
+    def setUp(self) -> None:
+        """Set up a user and an authenticated client."""
+        self.user = User.objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        ChangeStamps.get_many([self.user.pk, PUBLIC_SCOPE])
+
+    def patch_query_count(self, names: list[str]) -> int:
+        """PATCH a fresh dream with quality names and return the query count."""
+        dream = Dream.objects.create(user=self.user, description="Dream")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                f"/api/dreams/{dream.pk}/", {"quality_names": names}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_names_normalized_and_deduplicated(self) -> None:
+        """Test names are stripped, lowercased and deduplicated."""
+        Quality.objects.create(user=self.user, name="water")
+        response = self.client.post(
+            "/api/dreams/",
+            {"description": "Dream", "quality_names": ["Flying", " flying ", "WATER"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sorted(q["name"] for q in response.data["qualities"]), ["flying", "water"]
+        )
+        self.assertEqual(Quality.objects.filter(user=self.user).count(), 2)
+
+    def test_query_count_independent_of_tag_count(self) -> None:
+        """Test an autosave costs the same for few and many tags."""
+        few = self.patch_query_count(["a1", "a2"])
+        many = self.patch_query_count([f"b{i}" for i in range(12)])
+        self.assertEqual(few, many)
+
+
 class NestedRoutesSecurityTestCase(APITestCase):
     """Test security for nested routes: /api/dreams/{id}/qualities/{id}/"""
 
@@ -332,10 +977,11 @@ class NestedRoutesSecurityTestCase(APITestCase):
         """Test that quality frequencies update correctly when using nested routes."""
         self.client.force_authenticate(user=self.user_a)
 
-        # Add quality to dream
-        response = self.client.put(
-            f"/api/dreams/{self.dream_a.pk}/qualities/{self.quality_a.pk}/"
-        )
+        # Add quality to dream (recounts run when the transaction commits)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                f"/api/dreams/{self.dream_a.pk}/qualities/{self.quality_a.pk}/"
+            )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Check frequency updated
@@ -343,10 +989,1878 @@ class NestedRoutesSecurityTestCase(APITestCase):
         self.assertEqual(self.quality_a.frequency, 1)
 
         # Remove quality from dream
-        response = self.client.delete(
-            f"/api/dreams/{self.dream_a.pk}/qualities/{self.quality_a.pk}/"
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                f"/api/dreams/{self.dream_a.pk}/qualities/{self.quality_a.pk}/"
+            )
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
         # Quality should be deleted since frequency is 0
         self.assertFalse(Quality.objects.filter(pk=self.quality_a.pk).exists())
+
+
+class BulkDeletionTestCase(APITestCase):
+    """Test batched dream and account deletion."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.other = User.objects.create_user(username="other", password="password123")
+        self.flying = Quality.objects.create(user=self.user, name="flying")
+        self.water = Quality.objects.create(user=self.user, name="water")
+        self.falling = Quality.objects.create(user=self.user, name="falling")
+        self.dreams = []
+        for i in range(6):
+            dream = Dream.objects.create(user=self.user, description=f"Dream {i}")
+            dream.qualities.add(self.flying, self.water if i % 2 else self.falling)
+            self.dreams.append(dream)
+        self.other_dream = Dream.objects.create(user=self.other)
+        self.client.force_authenticate(user=self.user)
+
+    def make_journal(self, username: str, size: int) -> User:
+        """Create a user with `size` dreams that share a few qualities."""
+        user = User.objects.create_user(username=username, password="password123")
+        qualities = [
+            Quality.objects.create(user=user, name=f"quality{i}") for i in range(3)
+        ]
+        for i in range(size):
+            Dream.objects.create(user=user).qualities.add(*qualities[: i % 3 + 1])
+        return user
+
+    def test_bulk_delete_repairs_aggregates(self) -> None:
+        """Test frequencies, orphans and co-occurrences are fixed after the delete."""
+        odd_ids = [dream.pk for dream in self.dreams if dream.description[-1] in "135"]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/dreams/bulk_delete/", {"ids": odd_ids}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["deleted"], 3)
+
+        self.flying.refresh_from_db()
+        self.assertEqual(self.flying.frequency, 3)
+        self.assertFalse(Quality.objects.filter(pk=self.water.pk).exists())
+
+        expected = QualityCooccurrence.objects.filter(user=self.user)
+        rows = {(row.quality_a_id, row.quality_b_id): row.dream_ids for row in expected}
+        QualityCooccurrence.rebuild_for_user(self.user)
+        rebuilt = {
+            (row.quality_a_id, row.quality_b_id): row.dream_ids for row in expected
+        }
+        self.assertEqual(rows, rebuilt)
+
+    def test_bulk_delete_ignores_other_users_dreams(self) -> None:
+        """Test IDs of dreams owned by someone else are not deleted."""
+        response = self.client.post(
+            "/api/dreams/bulk_delete/",
+            {"ids": [self.other_dream.pk, self.dreams[0].pk]},
+            format="json",
+        )
+        self.assertEqual(response.data["deleted"], 1)
+        self.assertTrue(Dream.objects.filter(pk=self.other_dream.pk).exists())
+
+    def test_bulk_delete_rejects_invalid_ids(self) -> None:
+        """Test a non-list or non-integer ids payload is rejected."""
+        for ids in ["1,2", [1, "2"], None]:
+            response = self.client.post(
+                "/api/dreams/bulk_delete/", {"ids": ids}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_delete_query_count_independent_of_dream_count(self) -> None:
+        """Test a batch costs the same number of queries for few or many dreams."""
+        counts = []
+        for username, size in [("small", 5), ("large", 40)]:
+            # Flush the maintenance the setup queued so only the delete is counted
+            with self.captureOnCommitCallbacks(execute=True):
+                user = self.make_journal(username, size)
+            with (
+                CaptureQueriesContext(connection) as queries,
+                self.captureOnCommitCallbacks(execute=True),
+            ):
+                delete_dreams(user)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_delete_user_removes_journal(self) -> None:
+        """Test deleting an account removes its dreams, qualities and pairs."""
+        user = self.make_journal("leaving", 12)
+        progress = []
+        deleted = delete_user(user, progress=lambda done, total: progress.append(done))
+
+        self.assertEqual(deleted, 12)
+        self.assertEqual(progress, [12])
+        self.assertFalse(User.objects.filter(username="leaving").exists())
+        self.assertFalse(Dream.objects.filter(user_id=user.pk).exists())
+        self.assertFalse(Quality.objects.filter(user_id=user.pk).exists())
+        self.assertFalse(QualityCooccurrence.objects.filter(user_id=user.pk).exists())
+
+    def test_background_bulk_delete_reports_job(self) -> None:
+        """Test background deletion queues a task only its owner can inspect."""
+        with patch("dream_journal.celery.app.send_task") as send_task:
+            send_task.return_value.id = "job-1"
+            response = self.client.post(
+                "/api/dreams/bulk_delete/",
+                {"ids": [self.dreams[0].pk], "background": True},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["task_id"], "job-1")
+        send_task.assert_called_once_with(
+            "dreams.tasks.bulk_delete_dreams",
+            args=[self.user.pk, [self.dreams[0].pk]],
+        )
+        self.assertTrue(Dream.objects.filter(pk=self.dreams[0].pk).exists())
+
+        # Polls may land on another gunicorn worker, with its own cache
+        cache.clear()
+        with patch("dream_journal.celery.app.AsyncResult") as async_result:
+            async_result.return_value.state = "PROGRESS"
+            async_result.return_value.info = {"done": 500, "total": 1200}
+            response = self.client.get("/api/dreams/jobs/job-1/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["done"], 500)
+        self.assertEqual(response.data["total"], 1200)
+
+        self.client.force_authenticate(user=self.other)
+        response = self.client.get("/api/dreams/jobs/job-1/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_expired_jobs_are_forgotten(self) -> None:
+        """Test job status is only readable for a day after the job starts."""
+        with patch("dream_journal.celery.app.send_task") as send_task:
+            send_task.return_value.id = "job-old"
+            BackgroundJobs.start(self.user.pk, "dreams.tasks.bulk_delete_dreams", [])
+        BackgroundJob.objects.filter(task_id="job-old").update(
+            created=timezone.now() - timedelta(days=2)
+        )
+        response = self.client.get("/api/dreams/jobs/job-old/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        with patch("dream_journal.celery.app.send_task") as send_task:
+            send_task.return_value.id = "job-new"
+            BackgroundJobs.start(self.user.pk, "dreams.tasks.bulk_delete_dreams", [])
+        self.assertEqual(
+            list(BackgroundJob.objects.values_list("task_id", flat=True)), ["job-new"]
+        )
+
+
+class FrequencyReconciliationTestCase(TestCase):
+    """Test the frequency drift reconciliation pass."""
+
+    def setUp(self) -> None:
+        self.qualities = []
+        for u in range(3):
+            user = User.objects.create_user(username=f"u{u}", password="password123")
+            for q in range(4):
+                quality = Quality.objects.create(user=user, name=f"quality{q}")
+                for _ in range(q + 1):
+                    Dream.objects.create(user=user).qualities.add(quality)
+                self.qualities.append(quality)
+        Quality.refresh_frequencies(q.pk for q in self.qualities)
+
+    def drift(self, *qualities: Quality) -> None:
+        """Corrupt the stored frequency of the given qualities."""
+        Quality.objects.filter(pk__in=[q.pk for q in qualities]).update(frequency=99)
+
+    def test_reports_and_fixes_drift(self) -> None:
+        """Test drifted frequencies are reported and recounted."""
+        self.drift(self.qualities[0], self.qualities[5])
+        report = reconcile_frequencies(chunk_size=5)
+
+        self.assertEqual(report.checked, len(self.qualities))
+        self.assertEqual(report.drifted, 2)
+        self.assertEqual(report.fixed, 2)
+        self.assertEqual(report.absolute_drift, (99 - 1) + (99 - 2))
+        self.assertEqual(len(report.user_ids), 2)
+        for quality in self.qualities:
+            quality.refresh_from_db()
+            self.assertEqual(quality.frequency, quality.dream_set.count())
+
+    def test_dry_run_leaves_frequencies(self) -> None:
+        """Test a dry run reports drift without writing."""
+        self.drift(self.qualities[0])
+        report = reconcile_frequencies(fix=False)
+        self.assertEqual(report.drifted, 1)
+        self.assertEqual(report.fixed, 0)
+        self.qualities[0].refresh_from_db()
+        self.assertEqual(self.qualities[0].frequency, 99)
+
+    def test_shards_cover_every_quality_once(self) -> None:
+        """Test the shards partition the qualities by user."""
+        self.drift(*self.qualities)
+        reports = [reconcile_frequencies(shard, 2) for shard in range(2)]
+        self.assertEqual(sum(r.checked for r in reports), len(self.qualities))
+        self.assertEqual(sum(r.fixed for r in reports), len(self.qualities))
+        self.assertTrue(reports[0].user_ids.isdisjoint(reports[1].user_ids))
+
+    def test_cloud_run_task_runs_its_shard(self) -> None:
+        """Test a Cloud Run task takes its shard from the task environment."""
+        self.drift(*self.qualities)
+        out = StringIO()
+        with patch.dict(
+            os.environ, {"CLOUD_RUN_TASK_INDEX": "1", "CLOUD_RUN_TASK_COUNT": "2"}
+        ):
+            call_command("reconcile_frequencies", "--cloud-run-task", stdout=out)
+        self.assertIn("Shard 1/2:", out.getvalue())
+        self.assertNotIn("Shard 0/2:", out.getvalue())
+        self.assertEqual(reconcile_frequencies(1, 2, fix=False).drifted, 0)
+        self.assertEqual(
+            reconcile_frequencies(fix=False).drifted,
+            reconcile_frequencies(0, 2, fix=False).drifted,
+        )
+
+        with (
+            patch.dict(os.environ, {"CLOUD_RUN_TASK_INDEX": "x"}),
+            self.assertRaises(CommandError),
+        ):
+            call_command("reconcile_frequencies", "--cloud-run-task")
+
+    def test_clean_chunks_only_read(self) -> None:
+        """Test a pass without drift costs two reads per chunk and no writes."""
+        with CaptureQueriesContext(connection) as queries:
+            reconcile_frequencies(chunk_size=5)
+        chunks = -(-len(self.qualities) // 5)
+        self.assertEqual(len(queries), 2 * chunks + 1)
+        self.assertFalse(
+            any(q["sql"].startswith("UPDATE") for q in queries.captured_queries)
+        )
+
+    def test_management_command(self) -> None:
+        """Test the command fixes drift and prints a summary."""
+        self.drift(self.qualities[3])
+        out = StringIO()
+        call_command("reconcile_frequencies", "--shards", "3", stdout=out)
+        self.assertIn("1 drifted", out.getvalue())
+        self.qualities[3].refresh_from_db()
+        self.assertEqual(self.qualities[3].frequency, 4)
+
+
+class DreamSearchTestCase(APITestCase):
+    """Test full-text search over dream descriptions and quality names."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.other = User.objects.create_user(username="other", password="password123")
+        # Search documents are rebuilt when the writing transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flying = Quality.objects.create(user=self.user, name="flying")
+            self.ocean = Dream.objects.create(
+                user=self.user, description="Swimming in a dark ocean"
+            )
+            self.sky = Dream.objects.create(user=self.user, description="Over the city")
+            self.sky.qualities.add(self.flying)
+            self.public = Dream.objects.create(
+                user=self.other, description="A shared ocean voyage", is_public=True
+            )
+        self.client.force_authenticate(user=self.user)
+
+    def search(self, query: str, url: str = "/api/dreams/") -> list[int]:
+        """Return the IDs of dreams the endpoint finds for a query."""
+        response = self.client.get(url, {"search": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [dream["id"] for dream in response.data["results"]]
+
+    def test_matches_description_and_quality_names(self) -> None:
+        """Test words match descriptions and attached quality names."""
+        self.assertEqual(self.search("swimming"), [self.ocean.pk])
+        self.assertEqual(self.search("flying"), [self.sky.pk])
+        self.assertEqual(set(self.search("ocean")), {self.ocean.pk, self.public.pk})
+
+    def test_prefix_and_all_words(self) -> None:
+        """Test partial words match and every word must be present."""
+        self.assertEqual(self.search("swim"), [self.ocean.pk])
+        self.assertEqual(self.search("dark ocean"), [self.ocean.pk])
+        self.assertEqual(self.search("dark city"), [])
+
+    def test_operator_characters_are_ignored(self) -> None:
+        """Test query syntax in user input is treated as plain words."""
+        self.assertEqual(self.search('"swim* OR (city'), [])
+        self.assertEqual(self.search('swim" -'), [self.ocean.pk])
+
+    def test_ranks_better_matches_first(self) -> None:
+        """Test a dream mentioning the term more often ranks higher."""
+        with self.captureOnCommitCallbacks(execute=True):
+            stormy = Dream.objects.create(
+                user=self.user, description="Ocean waves, ocean spray, endless ocean"
+            )
+        self.assertEqual(self.search("ocean")[0], stormy.pk)
+
+    def test_document_follows_quality_changes(self) -> None:
+        """Test removing and renaming qualities updates the search document."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flying.name = "soaring"
+            self.flying.save()
+        self.assertEqual(self.search("soaring"), [self.sky.pk])
+        self.assertEqual(self.search("flying"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sky.qualities.clear()
+        self.assertEqual(self.search("soaring"), [])
+
+    def test_document_follows_description_edits(self) -> None:
+        """Test editing a description through the API updates the search."""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/dreams/{self.ocean.pk}/",
+                {"description": "A quiet forest"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.search("forest"), [self.ocean.pk])
+        self.assertEqual(self.search("swimming"), [])
+
+    def test_one_refresh_per_transaction(self) -> None:
+        """Test a save touching description and qualities refreshes once."""
+        with (
+            patch.object(
+                DreamSearchIndex, "refresh", wraps=DreamSearchIndex.refresh
+            ) as refresh,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.patch(
+                f"/api/dreams/{self.sky.pk}/",
+                {"description": "Above the clouds", "quality_names": ["gliding"]},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        refresh.assert_called_once()
+        self.assertEqual(set(refresh.call_args.args[0]), {self.sky.pk})
+        self.assertEqual(self.search("gliding clouds"), [self.sky.pk])
+        self.assertEqual(self.search("flying"), [])
+
+    def test_deleted_dreams_leave_the_index(self) -> None:
+        """Test deleted dreams are no longer found."""
+        self.ocean.delete()
+        self.assertEqual(self.search("swimming"), [])
+
+    def test_astral_plane_search(self) -> None:
+        """Test the public feed searches only public dreams."""
+        self.assertEqual(
+            self.search("ocean", "/api/dreams/astral_plane/"), [self.public.pk]
+        )
+
+
+class QualityAutocompleteTestCase(APITestCase):
+    """Test the quality name autocomplete endpoint."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="u", password="password123")
+        other = User.objects.create_user(username="other", password="password123")
+        for name, frequency in [
+            ("flying", 2),
+            ("floating", 7),
+            ("fleeing", 4),
+            ("water", 9),
+        ]:
+            Quality.objects.create(user=self.user, name=name, frequency=frequency)
+        Quality.objects.create(user=other, name="flood", frequency=50)
+        self.client.force_authenticate(user=self.user)
+
+    def suggest(self, **params: str) -> list[str]:
+        """Return the suggested names for the given query parameters."""
+        response = self.client.get("/api/qualities/autocomplete/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [suggestion["name"] for suggestion in response.data]
+
+    def test_prefix_matches_own_qualities_by_name(self) -> None:
+        """Test prefixes match only the user's qualities, alphabetically."""
+        self.assertEqual(self.suggest(prefix="Fl"), ["fleeing", "floating", "flying"])
+        self.assertEqual(self.suggest(prefix="flo"), ["floating"])
+        self.assertEqual(self.suggest(prefix="xyz"), [])
+
+    def test_prefix_ending_in_last_code_point(self) -> None:
+        """Test a prefix ending in U+10FFFF is matched instead of failing."""
+        Quality.objects.create(user=self.user, name="fl\U0010ffffy")
+        self.assertEqual(self.suggest(prefix="fl\U0010ffff"), ["fl\U0010ffffy"])
+        self.assertEqual(self.suggest(prefix="\U0010ffff"), [])
+
+    def test_frequency_order_and_limit(self) -> None:
+        """Test ranking by frequency and limiting the number of suggestions."""
+        self.assertEqual(
+            self.suggest(prefix="fl", order="frequency", limit="2"),
+            ["floating", "fleeing"],
+        )
+        self.assertEqual(self.suggest(order="frequency", limit="1"), ["water"])
+
+    def test_compact_payload(self) -> None:
+        """Test suggestions carry only id, name and frequency."""
+        response = self.client.get("/api/qualities/autocomplete/", {"prefix": "wa"})
+        self.assertEqual(list(response.data[0]), ["id", "name", "frequency"])
+
+    def test_fuzzy_mode(self) -> None:
+        """Test fuzzy mode matches inside names."""
+        self.assertIn("floating", self.suggest(prefix="loating", mode="fuzzy"))
+
+    def test_invalid_parameters(self) -> None:
+        """Test bad limit, order or mode values are rejected."""
+        for params in [{"limit": "0"}, {"limit": "x"}, {"order": "created"}]:
+            response = self.client.get("/api/qualities/autocomplete/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_single_query(self) -> None:
+        """Test a suggestion request runs one query besides authentication."""
+        with self.assertNumQueries(1):
+            self.suggest(prefix="fl")
+
+
+class DreamCursorPaginationTestCase(APITestCase):
+    """Test opt-in keyset pagination of dream lists."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.dreams = [
+            Dream.objects.create(
+                user=self.user, description=f"Dream {i}", is_public=True
+            )
+            for i in range(7)
+        ]
+        # Several dreams share a timestamp so ties are broken by id
+        tied = self.dreams[2].created
+        Dream.objects.filter(pk__in=[d.pk for d in self.dreams[2:5]]).update(
+            created=tied
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def walk(self, url: str) -> list[int]:
+        """Follow next links from the first page and collect the dream IDs."""
+        seen: list[int] = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            seen.extend(dream["id"] for dream in response.data["results"])
+            url = response.data["next"]
+        return seen
+
+    def expected_order(self) -> list[int]:
+        """Return every dream ID in keyset order."""
+        return list(
+            Dream.objects.order_by("-created", "pk").values_list("pk", flat=True)
+        )
+
+    def test_walks_every_dream_once_in_keyset_order(self) -> None:
+        """Test cursor pages cover all dreams in (-created, id) order."""
+        self.assertEqual(
+            self.walk("/api/dreams/?pagination=cursor&page_size=2"),
+            self.expected_order(),
+        )
+
+    def test_astral_plane_cursor(self) -> None:
+        """Test the public feed supports cursor mode."""
+        self.assertEqual(
+            self.walk("/api/dreams/astral_plane/?pagination=cursor&page_size=3"),
+            self.expected_order(),
+        )
+
+    def test_page_number_mode_is_default(self) -> None:
+        """Test lists without the opt-in keep page-number responses."""
+        response = self.client.get("/api/dreams/")
+        self.assertEqual(response.data["count"], 7)
+        self.assertIn("previous", response.data)
+
+    def test_no_count_query(self) -> None:
+        """Test cursor pages skip COUNT unless an approximate total is asked for."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/dreams/?pagination=cursor&page_size=2")
+        self.assertFalse(
+            any(q["sql"].startswith("SELECT COUNT") for q in queries.captured_queries)
+        )
+
+        response = self.client.get("/api/dreams/?pagination=cursor&total=approx")
+        self.assertEqual(response.data["count"], 7)
+
+    def test_invalid_cursor(self) -> None:
+        """Test a malformed cursor is rejected."""
+        response = self.client.get("/api/dreams/?pagination=cursor&cursor=garbage")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class DreamScopeTestCase(APITestCase):
+    """Test the action-scoped dream querysets."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.other = User.objects.create_user(username="other", password="password123")
+        self.own = Dream.objects.create(user=self.user, description="Mine")
+        self.own_public = Dream.objects.create(
+            user=self.user, description="Mine, shared", is_public=True
+        )
+        self.shared = Dream.objects.create(
+            user=self.other, description="Theirs, shared", is_public=True
+        )
+        self.private = Dream.objects.create(user=self.other, description="Theirs")
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_is_own_plus_public_without_duplicates(self) -> None:
+        """Test the list unions own and public dreams exactly once each."""
+        response = self.client.get("/api/dreams/")
+        self.assertEqual(
+            sorted(dream["id"] for dream in response.data["results"]),
+            sorted([self.own.pk, self.own_public.pk, self.shared.pk]),
+        )
+        self.assertEqual(response.data["count"], 3)
+
+    def test_list_query_has_no_or_or_distinct(self) -> None:
+        """Test the list query is a UNION of two scoped queries."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/dreams/")
+        sql = " ".join(q["sql"] for q in queries.captured_queries)
+        self.assertIn("UNION", sql)
+        self.assertNotIn("DISTINCT", sql)
+
+    def test_public_dreams_of_others_are_read_only(self) -> None:
+        """Test others' public dreams can be read but are outside write scopes."""
+        response = self.client.get(f"/api/dreams/{self.shared.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.patch(
+            f"/api/dreams/{self.shared.pk}/", {"description": "x"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.delete(f"/api/dreams/{self.shared.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(f"/api/dreams/{self.private.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class DreamScopeExplainTestCase(TestCase):
+    """
+    Test the dream scopes are planned as index scans (Postgres only).
+
+    The planner's own choice is checked against a table of realistic shape,
+    many users with a few public dreams each, and fresh statistics. Run with
+    DATABASE_URL set to the localdev Postgres to include these tests.
+    """
+
+    USERS = 200
+    DREAMS_PER_USER = 50
+    QUALITIES_PER_USER = 10
+
+    def setUp(self) -> None:
+        if connection.vendor != "postgresql":
+            self.skipTest("EXPLAIN plans are only checked on Postgres")
+        users = User.objects.bulk_create(
+            User(username=f"u{u}", password="!") for u in range(self.USERS)
+        )
+        self.user = users[0]
+        qualities = Quality.objects.bulk_create(
+            Quality(user=user, name=f"quality{q}")
+            for user in users
+            for q in range(self.QUALITIES_PER_USER)
+        )
+        dreams = Dream.objects.bulk_create(
+            # One dream in fifty is shared to the Astral Plane
+            Dream(user=user, description=f"Dream {d}", is_public=d % 50 == 0)
+            for user in users
+            for d in range(self.DREAMS_PER_USER)
+        )
+        self.quality_ids = [q.pk for q in qualities[: self.QUALITIES_PER_USER]]
+        Dream.qualities.through.objects.bulk_create(
+            Dream.qualities.through(
+                dream_id=dream.pk,
+                quality_id=qualities[
+                    u * self.QUALITIES_PER_USER + (d + k) % self.QUALITIES_PER_USER
+                ].pk,
+            )
+            for u in range(self.USERS)
+            for d, dream in enumerate(
+                dreams[u * self.DREAMS_PER_USER : (u + 1) * self.DREAMS_PER_USER]
+            )
+            for k in range(3)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "ANALYZE dreams_dream, dreams_dream_qualities, dreams_quality"
+            )
+
+    def plan(self, queryset: QuerySet[Dream]) -> str:
+        """Return the query plan chosen from the table statistics."""
+        return queryset.explain()
+
+    def test_owned_uses_user_index(self) -> None:
+        """Test owner lists use the (user, -created) index."""
+        plan = self.plan(Dream.objects.owned_by(self.user).order_by("-created")[:20])
+        self.assertIn("dreams_drea_user_id_10ca8c_idx", plan)
+
+    def test_public_uses_public_index(self) -> None:
+        """Test the public feed uses the (is_public, -created) index."""
+        plan = self.plan(Dream.objects.public().order_by("-created")[:20])
+        self.assertIn("dreams_drea_is_publ_02dd42_idx", plan)
+
+    def test_visible_uses_both_indexes(self) -> None:
+        """Test each branch of the mixed list is an index scan."""
+        plan = self.plan(Dream.objects.visible_to(self.user))
+        # Either the composite or the foreign key index serves the owner branch,
+        # as a plain or a bitmap index scan
+        self.assertRegex(plan, r"Scan (using|on) dreams_dream?_user_id")
+        self.assertIn("dreams_drea_is_publ_02dd42_idx", plan)
+
+    def test_quality_filter_uses_through_index(self) -> None:
+        """Test quality filters read the through table by (quality, dream)."""
+        for match_all in (False, True):
+            plan = self.plan(
+                Dream.objects.owned_by(self.user).with_qualities(
+                    self.quality_ids[:2], match_all
+                )
+            )
+            self.assertIn("dreams_dream_qualities_quality_dream_idx", plan)
+
+    def test_calendar_uses_user_index(self) -> None:
+        """Test calendar buckets are grouped from the (user, -created) index."""
+        utc = ZoneInfo("UTC")
+        lower, upper = day_bounds(date(2026, 1, 1), date(2026, 12, 31), utc)
+        dreams = Dream.objects.owned_by(self.user).filter(
+            created__gte=lower, created__lt=upper
+        )
+        plan = self.plan(DreamCalendar.dream_counts(dreams, "week", utc))
+        self.assertRegex(plan, r"Scan (using|on) dreams_dream?_user_id")
+        self.assertNotIn("Seq Scan on dreams_dream ", plan)
+
+
+@override_settings(CROSS_REQUEST_CACHING=True)
+class PublicFeedCacheTestCase(APITestCase):
+    """Test the shared Astral Plane page cache."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.alice = User.objects.create_user(username="alice", password="password123")
+        self.bob = User.objects.create_user(username="bob", password="password123")
+        self.shared = Dream.objects.create(
+            user=self.alice, description="Shared ocean", is_public=True
+        )
+        self.private = Dream.objects.create(user=self.alice, description="Hidden")
+        self.client.force_authenticate(user=self.alice)
+
+    def feed(self, **params: str) -> list[dict]:
+        """Return the results of one Astral Plane page."""
+        response = self.client.get("/api/dreams/astral_plane/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results: list[dict] = response.data["results"]
+        return results
+
+    def test_hit_runs_no_query(self) -> None:
+        """Test a cached page and its validators are served without the database."""
+        self.feed()
+        with self.assertNumQueries(0):
+            results = self.feed()
+        self.assertEqual([d["id"] for d in results], [self.shared.pk])
+
+    def test_not_modified_from_feed_version(self) -> None:
+        """Test revalidation answers 304 without queries until the feed changes."""
+        response = self.client.get("/api/dreams/astral_plane/")
+        with self.assertNumQueries(0):
+            revalidated = self.client.get(
+                "/api/dreams/astral_plane/", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.private.is_public = True
+            self.private.save()
+        changed = self.client.get(
+            "/api/dreams/astral_plane/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(changed.data["results"]), 2)
+
+    @override_settings(CROSS_REQUEST_CACHING=False)
+    def test_not_cached_without_shared_cache(self) -> None:
+        """Test pages are built per request when the cache is per process."""
+        self.feed()
+        # Unpublished with the feed version bumped in some other process only
+        Dream.objects.filter(pk=self.shared.pk).update(is_public=False)
+        self.assertEqual(self.feed(), [])
+
+    def test_is_owner_is_per_user(self) -> None:
+        """Test cached pages report ownership for the requesting user."""
+        self.assertTrue(self.feed()[0]["is_owner"])
+        self.client.force_authenticate(user=self.bob)
+        with self.assertNumQueries(0):
+            self.assertFalse(self.feed()[0]["is_owner"])
+
+    def test_search_and_page_are_separate_entries(self) -> None:
+        """Test different searches are not answered from each other's entry."""
+        self.assertEqual(len(self.feed()), 1)
+        self.assertEqual(self.feed(search="forest"), [])
+
+    def test_publishing_and_unpublishing_invalidate(self) -> None:
+        """Test visibility changes are reflected immediately."""
+        self.feed()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.private.is_public = True
+            self.private.save()
+        self.assertEqual(len(self.feed()), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/dreams/{self.shared.pk}/", {"is_public": False}, format="json"
+            )
+        self.assertEqual([d["id"] for d in self.feed()], [self.private.pk])
+
+    def test_public_edit_invalidates(self) -> None:
+        """Test editing a public dream's description or qualities shows up."""
+        self.feed()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/dreams/{self.shared.pk}/",
+                {"description": "Shared sky", "quality_names": ["flying"]},
+                format="json",
+            )
+        result = self.feed()[0]
+        self.assertEqual(result["description"], "Shared sky")
+        self.assertEqual([q["name"] for q in result["qualities"]], ["flying"])
+
+    def test_private_edit_keeps_cache(self) -> None:
+        """Test edits to private dreams leave cached pages in place."""
+        self.feed()
+        version = PublicFeedCache.get_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.private.description = "Still hidden"
+            self.private.save()
+        self.assertEqual(PublicFeedCache.get_version(), version)
+
+
+class DreamQueryBudgetTestCase(APITestCase):
+    """Test dream endpoints run a fixed number of queries however many rows."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.other = User.objects.create_user(username="other", password="password123")
+        self.client.force_authenticate(user=self.user)
+        # Stamps exist once a user has made any request; budgets are steady state
+        ChangeStamps.get_many([self.user.pk, self.other.pk, PUBLIC_SCOPE])
+
+    def add_dreams(self, user: User, count: int, is_public: bool = False) -> None:
+        """Create dreams with two qualities and more images than are embedded."""
+        qualities = Quality.get_or_create_many(user, ["flying", "water"])
+        for i in range(count):
+            dream = Dream.objects.create(
+                user=user, description=f"Dream {i}", is_public=is_public
+            )
+            dream.qualities.add(*qualities)
+            Image.objects.bulk_create(
+                Image(dream=dream, gcs_path=f"{dream.pk}/{n}.png")
+                for n in range(IMAGE_PREVIEW_COUNT + 2)
+            )
+
+    def test_list_budget(self) -> None:
+        """Test the list costs stamps, count, dreams, qualities and images queries."""
+        for total in (3, 30):
+            self.add_dreams(self.user, total // 3)
+            self.add_dreams(self.other, total - total // 3, is_public=True)
+            with self.assertNumQueries(5):
+                response = self.client.get("/api/dreams/", {"page_size": 100})
+            result = response.data["results"][0]
+            self.assertEqual(len(result["images"]), IMAGE_PREVIEW_COUNT)
+            self.assertEqual(result["image_count"], IMAGE_PREVIEW_COUNT + 2)
+            Dream.objects.all().delete()
+
+    def test_retrieve_budget(self) -> None:
+        """
+        Test a public dream of another user is retrieved in five queries (the
+        validator and owner stamp lookups, then three), and revalidated in two.
+        """
+        self.add_dreams(self.other, 1, is_public=True)
+        dream = Dream.objects.get()
+        with self.assertNumQueries(5):
+            response = self.client.get(f"/api/dreams/{dream.pk}/")
+        self.assertFalse(response.data["is_owner"])
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                f"/api/dreams/{dream.pk}/", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_astral_plane_budget(self) -> None:
+        """Test an uncached feed page costs the same for few or many dreams."""
+        for total in (3, 30):
+            self.add_dreams(self.other, total, is_public=True)
+            with self.assertNumQueries(5):
+                self.client.get("/api/dreams/astral_plane/", {"page_size": total})
+            Dream.objects.all().delete()
+
+
+class SparseFieldsetTestCase(APITestCase):
+    """Test fields= and expand= on dream read endpoints."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.dream = Dream.objects.create(
+            user=self.user,
+            description="x" * (DESCRIPTION_PREVIEW_LENGTH + 50),
+            is_public=True,
+        )
+        self.dream.qualities.add(*Quality.get_or_create_many(self.user, ["a1", "b2"]))
+        Image.objects.create(dream=self.dream, gcs_path="a.png")
+        self.client.force_authenticate(user=self.user)
+        ChangeStamps.get_many([self.user.pk, PUBLIC_SCOPE])
+
+    def test_selected_fields_only(self) -> None:
+        """Test only the selected fields are rendered."""
+        response = self.client.get(
+            "/api/dreams/", {"fields": "id,created,description_preview,quality_names"}
+        )
+        result = response.data["results"][0]
+        self.assertEqual(
+            set(result), {"id", "created", "description_preview", "quality_names"}
+        )
+        self.assertEqual(sorted(result["quality_names"]), ["a1", "b2"])
+        self.assertEqual(
+            result["description_preview"],
+            "x" * DESCRIPTION_PREVIEW_LENGTH + "...",
+        )
+
+    def test_unselected_relations_are_not_queried(self) -> None:
+        """Test images and the full description are not loaded unless selected."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/dreams/", {"fields": "id,quality_names"})
+        sql = [q["sql"] for q in queries.captured_queries]
+        self.assertEqual(len(sql), 4)  # stamps, count, dreams, quality names
+        self.assertFalse(any("dreams_image" in q for q in sql))
+        self.assertNotIn('"dreams_dream"."description"', sql[2])
+
+    def test_expand_adds_nested_relations(self) -> None:
+        """Test expanded relations are rendered on top of the selected fields."""
+        response = self.client.get(
+            f"/api/dreams/{self.dream.pk}/", {"fields": "id", "expand": "images"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"id", "images"})
+        self.assertEqual(len(response.data["images"]), 1)
+
+    def test_default_output_unchanged(self) -> None:
+        """Test lists without fields= keep the full default payload."""
+        result = self.client.get("/api/dreams/").data["results"][0]
+        self.assertIn("description", result)
+        self.assertIn("qualities", result)
+        self.assertNotIn("description_preview", result)
+
+    def test_astral_plane_fields(self) -> None:
+        """Test the public feed honours fields= without adding is_owner."""
+        response = self.client.get("/api/dreams/astral_plane/", {"fields": "id"})
+        self.assertEqual(response.data["results"], [{"id": self.dream.pk}])
+
+    def test_unknown_fields_rejected(self) -> None:
+        """Test unknown or non-expandable names are a bad request."""
+        for params in [{"fields": "id,password"}, {"expand": "description"}]:
+            response = self.client.get("/api/dreams/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ListRenderingParityTestCase(APITestCase):
+    """Test the values() list rendering matches the list serializers exactly."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.other = User.objects.create_user(username="other", password="password123")
+        start = timezone.now().replace(microsecond=0) - timedelta(days=1)
+        descriptions = [
+            "Short dream",
+            "x" * (DESCRIPTION_PREVIEW_LENGTH + 1),
+            "Ünïcødé 夢 \u2028 separators \u2029",
+            "",
+        ]
+        for i, description in enumerate(descriptions):
+            dream = Dream.objects.create(
+                user=self.user if i % 2 else self.other,
+                description=description,
+                is_public=i != 1,
+            )
+            dream.qualities.add(
+                *Quality.get_or_create_many(dream.user, ["zeta", "alpha", "mid"][i:])
+            )
+            for n in range(i * 3):
+                image = Image.objects.create(dream=dream, gcs_path=f"{i}/{n}.png")
+                # Whole and fractional seconds render differently
+                Image.objects.filter(pk=image.pk).update(
+                    created=start + timedelta(minutes=i, seconds=n, microseconds=n % 2)
+                )
+        self.request = APIRequestFactory().get("/api/dreams/")
+        self.request.user = self.user
+
+    def assertRendersLikeSerializer(
+        self, fields: set[str] | None = None, expand: frozenset[str] = frozenset()
+    ) -> None:
+        """Assert both paths encode the dreams to the same bytes."""
+        queryset = DreamViewSet.with_relations(
+            Dream.objects.order_by("-created"), fields, set(expand)
+        )
+        expected = DreamListSerializer(
+            queryset,
+            many=True,
+            fields=fields,
+            expand=expand,
+            context={"request": self.request},
+        ).data
+
+        selected = DreamListRows.selection(fields, expand)
+        rows = list(DreamListRows.values(queryset, selected))
+        actual = DreamListRows.render(rows, selected, self.user.pk)
+
+        self.assertEqual(
+            FastJSONRenderer().render(actual), JSONRenderer().render(expected)
+        )
+
+    def test_default_fields(self) -> None:
+        """Test the default payload matches."""
+        self.assertRendersLikeSerializer()
+
+    def test_each_field_alone(self) -> None:
+        """Test every selectable field matches on its own."""
+        for name in DreamListSerializer.Meta.fields:
+            with self.subTest(field=name):
+                self.assertRendersLikeSerializer({name})
+
+    def test_all_fields(self) -> None:
+        """Test the optional fields match alongside the defaults."""
+        self.assertRendersLikeSerializer(set(DreamListSerializer.Meta.fields))
+
+    def test_expand(self) -> None:
+        """Test expanded relations match."""
+        self.assertRendersLikeSerializer({"id"}, frozenset({"qualities", "images"}))
+
+    def test_qualities(self) -> None:
+        """Test quality rows match QualitySerializer."""
+        queryset = Quality.objects.order_by("name")
+        expected = QualitySerializer(queryset, many=True).data
+        actual = QualityRows.render(QualityRows.values(queryset))
+        self.assertEqual(
+            FastJSONRenderer().render(actual), JSONRenderer().render(expected)
+        )
+
+    def test_list_endpoints(self) -> None:
+        """Test the list endpoints return what the serializers render."""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get("/api/dreams/", {"page_size": 100})
+        dreams = DreamViewSet.with_relations(Dream.objects.visible_to(self.user))
+        expected = DreamListSerializer(
+            dreams, many=True, context={"request": self.request}
+        ).data
+        self.assertEqual(response.json()["results"], json.loads(json.dumps(expected)))
+
+        response = self.client.get("/api/qualities/")
+        qualities = Quality.objects.filter(user=self.user).order_by("name")[:5]
+        expected = QualitySerializer(qualities, many=True).data
+        self.assertEqual(response.json()["results"], json.loads(json.dumps(expected)))
+
+    def test_renderer_matches_json_renderer(self) -> None:
+        """Test the orjson renderer encodes like DRF's JSONRenderer."""
+        data = {
+            "text": "Ünïcødé \u2028 \u2029",
+            "when": timezone.now(),
+            "amount": Decimal("1.50"),
+            "lazy": gettext_lazy("Not found."),
+            1: [None, True, 2, 3.5],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            FastJSONRenderer().render(data, "application/json; indent=2"),
+            JSONRenderer().render(data, "application/json; indent=2"),
+        )
+
+
+class ConditionalRequestTestCase(APITestCase):
+    """Test ETag / Last-Modified validation and If-Match on dream endpoints."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.other = User.objects.create_user(username="other", password="password123")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dream = Dream.objects.create(user=self.user, description="Flying")
+            self.dream.qualities.add(*Quality.get_or_create_many(self.user, ["sky"]))
+            self.image = Image.objects.create(dream=self.dream, gcs_path="a.png")
+        self.client.force_authenticate(user=self.user)
+
+    def revalidate(self, url: str, response: Response) -> Response:
+        """Repeat a GET with the validators of an earlier response."""
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    def test_lists_not_modified_from_stamps(self) -> None:
+        """Test unchanged lists answer 304 from one change stamp lookup."""
+        for url in ["/api/dreams/", "/api/qualities/", "/api/dreams/astral_plane/"]:
+            response = self.client.get(url)
+            self.assertEqual(response["Cache-Control"], "private, no-cache")
+            with self.assertNumQueries(1):
+                revalidated = self.revalidate(url, response)
+            self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(revalidated["ETag"], response["ETag"])
+
+    def test_touch_from_another_process(self) -> None:
+        """Test a stamp touched through another process's cache invalidates 304s."""
+        response = self.client.get("/api/me/stats/")
+        other_process = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "celery-worker",
+            }
+        }
+        with (
+            override_settings(CACHES=other_process),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            ChangeStamps.touch(self.user.pk)
+        revalidated = self.revalidate("/api/me/stats/", response)
+        self.assertEqual(revalidated.status_code, status.HTTP_200_OK)
+
+    def test_list_changes_after_own_write(self) -> None:
+        """Test a write to the user's dreams changes the list validators."""
+        response = self.client.get("/api/dreams/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/dreams/{self.dream.pk}/", {"description": "Falling"}
+            )
+        revalidated = self.revalidate("/api/dreams/", response)
+        self.assertEqual(revalidated.status_code, status.HTTP_200_OK)
+        self.assertEqual(revalidated.data["results"][0]["description"], "Falling")
+
+    def test_list_changes_after_public_write(self) -> None:
+        """Test another user's public dream changes the list validators."""
+        response = self.client.get("/api/dreams/")
+        with self.captureOnCommitCallbacks(execute=True):
+            Dream.objects.create(user=self.other, description="Shared", is_public=True)
+        revalidated = self.revalidate("/api/dreams/", response)
+        self.assertEqual(revalidated.status_code, status.HTTP_200_OK)
+        self.assertEqual(revalidated.data["count"], 2)
+
+    def test_validators_depend_on_query(self) -> None:
+        """Test different pages of a list have different ETags."""
+        first = self.client.get("/api/dreams/", {"page_size": 1})
+        second = self.client.get("/api/dreams/", {"page_size": 2})
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    def test_retrieve_not_modified(self) -> None:
+        """Test an unchanged dream answers 304, by ETag or Last-Modified."""
+        url = f"/api/dreams/{self.dream.pk}/"
+        response = self.client.get(url)
+        self.assertEqual(
+            self.revalidate(url, response).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+        revalidated = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_changes_with_images(self) -> None:
+        """Test an image change revalidates the dream, though updated is unchanged."""
+        url = f"/api/dreams/{self.dream.pk}/"
+        response = self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.generation_status = Image.GenerationStatus.GENERATING
+            self.image.save()
+        self.assertEqual(self.revalidate(url, response).status_code, status.HTTP_200_OK)
+
+    def test_retrieve_of_unreadable_dream_is_not_found(self) -> None:
+        """Test validators are not computed for dreams the user cannot read."""
+        private = Dream.objects.create(user=self.other, description="Secret")
+        response = self.client.get(f"/api/dreams/{private.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", response)
+
+    def test_image_polling(self) -> None:
+        """Test image reads answer 304 until the image changes status."""
+        for url in [
+            f"/api/dreams/{self.dream.pk}/images/",
+            f"/api/dreams/{self.dream.pk}/images/{self.image.pk}/",
+        ]:
+            Image.objects.filter(pk=self.image.pk).update(
+                generation_status=Image.GenerationStatus.PENDING
+            )
+            response = self.client.get(url)
+            self.assertEqual(
+                self.revalidate(url, response).status_code,
+                status.HTTP_304_NOT_MODIFIED,
+            )
+            Image.objects.filter(pk=self.image.pk).update(
+                generation_status=Image.GenerationStatus.GENERATING
+            )
+            self.assertEqual(
+                self.revalidate(url, response).status_code, status.HTTP_200_OK
+            )
+
+    def test_if_match(self) -> None:
+        """Test If-Match accepts the current version and rejects stale ones."""
+        url = f"/api/dreams/{self.dream.pk}/"
+        etag = self.client.get(url)["ETag"]
+
+        # Other changes covered by the ETag don't conflict with the dream's own
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.generation_status = Image.GenerationStatus.GENERATING
+            self.image.save()
+
+        response = self.client.patch(
+            url, {"description": "Falling"}, HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        response = self.client.patch(url, {"description": "Lost"}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.dream.refresh_from_db()
+        self.assertEqual(self.dream.description, "Falling")
+
+    def test_if_match_chains_autosaves(self) -> None:
+        """Test each PATCH returns the ETag the next one must send."""
+        url = f"/api/dreams/{self.dream.pk}/"
+        etag = self.client.get(url)["ETag"]
+        for description in ["One", "Two", "Three"]:
+            response = self.client.patch(
+                url, {"description": description}, HTTP_IF_MATCH=etag
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response["ETag"]
+        response = self.client.patch(url, {"description": "Four"}, HTTP_IF_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_stamps_published_once_per_write(self) -> None:
+        """Test one PATCH replaces the owner's and the public stamps in one upsert."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dream.is_public = True
+            self.dream.save()
+        before = ChangeStamps.get_many([self.user.pk, PUBLIC_SCOPE])
+        with (
+            CaptureQueriesContext(connection) as queries,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.patch(
+                f"/api/dreams/{self.dream.pk}/",
+                {"description": "Soaring", "quality_names": ["sky", "wind"]},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        upserts = [
+            q["sql"] for q in queries if 'INSERT INTO "dreams_changestamp"' in q["sql"]
+        ]
+        self.assertEqual(len(upserts), 1)
+        after = ChangeStamps.get_many([self.user.pk, PUBLIC_SCOPE])
+        for old, new in zip(before, after, strict=True):
+            self.assertNotEqual(old.token, new.token)
+
+
+class QualityFilterTestCase(APITestCase):
+    """Test qualities= and match= on the dream list."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="u", password="password123")
+        other = User.objects.create_user(username="other", password="password123")
+        lucid, flying, water = Quality.get_or_create_many(
+            self.user, ["lucid", "flying", "water"]
+        )
+        self.both = Dream.objects.create(user=self.user, description="both")
+        self.both.qualities.add(lucid, flying)
+        self.lucid = Dream.objects.create(user=self.user, description="lucid")
+        self.lucid.qualities.add(lucid)
+        self.flying = Dream.objects.create(user=self.user, description="flying")
+        self.flying.qualities.add(flying, water)
+        shared = Dream.objects.create(user=other, description="shared", is_public=True)
+        shared.qualities.add(*Quality.get_or_create_many(other, ["lucid"]))
+        self.ids = {"lucid": lucid.pk, "flying": flying.pk, "water": water.pk}
+        self.client.force_authenticate(user=self.user)
+        ChangeStamps.get_many([self.user.pk, PUBLIC_SCOPE])
+
+    def list_ids(self, names: list[str], match: str | None = None) -> list[int]:
+        """Return the IDs of the listed dreams filtered by quality names."""
+        params = {"qualities": ",".join(str(self.ids[n]) for n in names)}
+        if match:
+            params["match"] = match
+        response = self.client.get("/api/dreams/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(dream["id"] for dream in response.data["results"])
+
+    def test_match_all(self) -> None:
+        """Test match=all keeps dreams having every quality."""
+        self.assertEqual(self.list_ids(["lucid", "flying"], "all"), [self.both.pk])
+        self.assertEqual(self.list_ids(["lucid", "water"], "all"), [])
+        self.assertEqual(
+            self.list_ids(["lucid", "flying", "water"], "all"),
+            [],
+        )
+
+    def test_match_any(self) -> None:
+        """Test match=any (the default) lists each matching dream once."""
+        expected = sorted([self.both.pk, self.lucid.pk, self.flying.pk])
+        self.assertEqual(self.list_ids(["lucid", "flying"]), expected)
+        self.assertEqual(self.list_ids(["lucid", "flying"], "any"), expected)
+
+    def test_single_quality(self) -> None:
+        """Test one quality matches the same way in either mode and via quality=."""
+        expected = sorted([self.both.pk, self.lucid.pk])
+        self.assertEqual(self.list_ids(["lucid"], "all"), expected)
+        response = self.client.get("/api/dreams/", {"quality": self.ids["lucid"]})
+        self.assertEqual(
+            sorted(dream["id"] for dream in response.data["results"]), expected
+        )
+
+    def test_no_distinct_over_dreams(self) -> None:
+        """Test both modes are a semi-join without DISTINCT."""
+        for match, clause in [("all", "HAVING"), ("any", " IN (SELECT")]:
+            with CaptureQueriesContext(connection) as queries:
+                self.list_ids(["lucid", "flying"], match)
+            # The change stamps, the count, then the dreams
+            dreams_sql = queries.captured_queries[2]["sql"]
+            self.assertIn(clause, dreams_sql)
+            self.assertNotIn("DISTINCT", dreams_sql)
+
+    def test_invalid_parameters(self) -> None:
+        """Test malformed IDs or an unknown match mode are a bad request."""
+        for params in [
+            {"qualities": "1,x"},
+            {"qualities": "1", "match": "most"},
+            {"qualities": "99999999999999999999999"},
+            {"qualities": "0"},
+            {"qualities": "1", "quality": "2"},
+        ]:
+            response = self.client.get("/api/dreams/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        for value in ["x", "99999999999999999999"]:
+            response = self.client.get("/api/dreams/", {"quality": value})
+            self.assertEqual(response.data["results"], [])
+
+    def test_parameters_ignored_outside_list(self) -> None:
+        """Test list parameters left on other requests are not validated."""
+        response = self.client.get(f"/api/dreams/{self.both.pk}/", {"match": "most"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.patch(
+            f"/api/dreams/{self.both.pk}/?qualities=x",
+            {"description": "both again"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class DreamCalendarTestCase(APITestCase):
+    """Test the calendar aggregates and the list's date range."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.other = User.objects.create_user(username="other", password="password123")
+        self.today = timezone.now().date()
+        self.client.force_authenticate(user=self.user)
+
+    def create_dream(
+        self, days_ago: int, names: tuple[str, ...] = (), user: User | None = None
+    ) -> Dream:
+        """Create a dream at noon UTC the given number of days ago."""
+        user = user or self.user
+        dream = Dream.objects.create(user=user, description="dream", is_public=True)
+        dream.qualities.add(*Quality.get_or_create_many(user, list(names)))
+        day = self.today - timedelta(days=days_ago)
+        created = datetime(day.year, day.month, day.day, 12, tzinfo=UTC)
+        Dream.objects.filter(pk=dream.pk).update(created=created)
+        return dream
+
+    def test_daily_buckets_and_streaks(self) -> None:
+        """Test per-day counts, distinct qualities and the two streaks."""
+        self.create_dream(0, ("lucid", "water"))
+        self.create_dream(0, ("lucid",))
+        self.create_dream(1)
+        for days_ago in range(30, 34):
+            self.create_dream(days_ago)
+        self.create_dream(400)
+        self.create_dream(0, ("lucid",), user=self.other)
+
+        response = self.client.get("/api/dreams/calendar/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        buckets = {bucket["date"]: bucket for bucket in response.data["buckets"]}
+        self.assertEqual(
+            buckets[self.today.isoformat()],
+            {"date": self.today.isoformat(), "dreams": 2, "qualities": 2},
+        )
+        # The default range is the last year; streaks and totals are all-time
+        self.assertEqual(len(buckets), 6)
+        self.assertEqual(response.data["streaks"], {"current": 2, "longest": 4})
+        self.assertEqual(response.data["totals"], {"dreams": 8, "qualities": 2})
+
+    def test_current_streak_lapses(self) -> None:
+        """Test a streak is current through yesterday but not the day before."""
+        self.create_dream(1)
+        response = self.client.get("/api/dreams/calendar/")
+        self.assertEqual(response.data["streaks"], {"current": 1, "longest": 1})
+
+        Dream.objects.update(created=timezone.now() - timedelta(days=2))
+        response = self.client.get("/api/dreams/calendar/")
+        self.assertEqual(response.data["streaks"], {"current": 0, "longest": 1})
+
+    def test_periods(self) -> None:
+        """Test week and month buckets start on the period's first day."""
+        for days_ago in range(0, 60, 3):
+            self.create_dream(days_ago)
+        start = (self.today - timedelta(days=59)).isoformat()
+        for period in ["week", "month"]:
+            response = self.client.get(
+                "/api/dreams/calendar/", {"period": period, "start": start}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            dates = [
+                date.fromisoformat(bucket["date"])
+                for bucket in response.data["buckets"]
+            ]
+            self.assertEqual(
+                sum(bucket["dreams"] for bucket in response.data["buckets"]), 20
+            )
+            for day in dates:
+                self.assertEqual(day.weekday() if period == "week" else day.day - 1, 0)
+
+    def test_time_zone(self) -> None:
+        """Test days are counted in the requested time zone."""
+        dream = self.create_dream(0)
+        Dream.objects.filter(pk=dream.pk).update(
+            created=datetime(2026, 3, 1, 2, tzinfo=UTC)
+        )
+        params = {"start": "2026-02-01", "end": "2026-03-31"}
+        response = self.client.get("/api/dreams/calendar/", params)
+        self.assertEqual(response.data["buckets"][0]["date"], "2026-03-01")
+        response = self.client.get(
+            "/api/dreams/calendar/", {**params, "tz": "America/Los_Angeles"}
+        )
+        self.assertEqual(response.data["buckets"][0]["date"], "2026-02-28")
+
+    def test_revalidation(self) -> None:
+        """Test the calendar answers 304 until the user writes a dream."""
+        self.create_dream(0)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get("/api/dreams/calendar/")
+        etag = response["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/dreams/calendar/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/dreams/", {"description": "new"}, format="json")
+        response = self.client.get("/api/dreams/calendar/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["totals"]["dreams"], 2)
+
+    def test_invalid_parameters(self) -> None:
+        """Test bad periods, dates, ranges and time zones are a bad request."""
+        for params in [
+            {"period": "year"},
+            {"start": "yesterday"},
+            {"start": "2026-02-01", "end": "2026-01-01"},
+            {"tz": "Mars/Olympus_Mons"},
+        ]:
+            response = self.client.get("/api/dreams/calendar/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            response = self.client.get("/api/dreams/", params)
+            if "period" not in params:
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Dates at the ends of the calendar are clamped rather than overflowing
+        for url, params in [
+            ("/api/dreams/", {"end": "9999-12-31"}),
+            ("/api/dreams/", {"start": "0001-01-01", "tz": "Pacific/Kiritimati"}),
+            ("/api/dreams/calendar/", {"end": "0001-01-05"}),
+            ("/api/dreams/calendar/", {"start": "2000-01-01", "end": "9999-12-31"}),
+        ]:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["end"], LATEST_DATE.isoformat())
+
+    def test_list_date_range(self) -> None:
+        """Test start= and end= bound the list by whole local days."""
+        recent = self.create_dream(1)
+        older = self.create_dream(10)
+        shared = self.create_dream(1, user=self.other)
+        day = (self.today - timedelta(days=1)).isoformat()
+
+        response = self.client.get("/api/dreams/", {"start": day, "end": day})
+        self.assertEqual(
+            sorted(dream["id"] for dream in response.data["results"]),
+            sorted([recent.pk, shared.pk]),
+        )
+        response = self.client.get("/api/dreams/", {"end": day})
+        self.assertEqual(
+            sorted(dream["id"] for dream in response.data["results"]),
+            sorted([recent.pk, older.pk, shared.pk]),
+        )
+        response = self.client.get("/api/dreams/", {"start": day, "tz": "Asia/Tokyo"})
+        self.assertNotIn(older.pk, [dream["id"] for dream in response.data["results"]])
+
+
+class UserJournalStatsTestCase(APITestCase):
+    """Test the maintained journal counters and /api/me/stats/."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.other = User.objects.create_user(username="other", password="password123")
+        UserJournalStats.for_user(self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def assertStatsMatchTables(self) -> dict:
+        """Assert the stored counters equal a recount and return them."""
+        stored: dict = (
+            UserJournalStats.objects.filter(user=self.user)
+            .values(*UserJournalStats.COUNTERS)
+            .get()
+        )
+        self.assertEqual(stored, UserJournalStats.actual([self.user.pk])[self.user.pk])
+        return stored
+
+    def create_dream(self, names: list[str], is_public: bool = False) -> Dream:
+        """Create a dream through the API and return it."""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/dreams/",
+                {
+                    "description": "dream",
+                    "quality_names": names,
+                    "is_public": is_public,
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Dream.objects.get(pk=response.data["id"])
+
+    def test_dream_writes(self) -> None:
+        """Test creating, publishing and deleting dreams keeps the counters exact."""
+        first = self.create_dream(["lucid", "water"], is_public=True)
+        second = self.create_dream(["lucid"])
+        stats = self.assertStatsMatchTables()
+        self.assertEqual(stats["dream_count"], 2)
+        self.assertEqual(stats["public_dream_count"], 1)
+        self.assertEqual(stats["quality_count"], 2)
+        self.assertEqual(stats["last_dream_at"], second.created)
+
+        self.client.patch(
+            f"/api/dreams/{second.pk}/", {"is_public": True}, format="json"
+        )
+        self.assertEqual(self.assertStatsMatchTables()["public_dream_count"], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/dreams/{second.pk}/")
+        stats = self.assertStatsMatchTables()
+        self.assertEqual(stats["dream_count"], 1)
+        self.assertEqual(stats["last_dream_at"], first.created)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/dreams/{first.pk}/")
+        stats = self.assertStatsMatchTables()
+        self.assertEqual(stats["quality_count"], 0)
+        self.assertIsNone(stats["last_dream_at"])
+
+    def test_image_and_quality_writes(self) -> None:
+        """Test images and standalone qualities are counted as they come and go."""
+        dream = self.create_dream(["lucid"])
+        Image.objects.create(dream=dream, gcs_path="a.png")
+        image = Image.objects.create(dream=dream, gcs_path="b.png")
+        image.generation_status = Image.GenerationStatus.COMPLETED
+        image.save()
+        self.assertEqual(self.assertStatsMatchTables()["image_count"], 2)
+
+        self.client.post("/api/qualities/", {"name": "flying"}, format="json")
+        self.assertEqual(self.assertStatsMatchTables()["quality_count"], 2)
+
+        # Deleting the dream cascades to its images
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/dreams/{dream.pk}/")
+        stats = self.assertStatsMatchTables()
+        self.assertEqual(stats["image_count"], 0)
+        self.assertEqual(stats["quality_count"], 1)
+
+    def test_bulk_delete_rebuilds(self) -> None:
+        """Test the batched delete, which runs without signals, repairs the row."""
+        dreams = [self.create_dream([f"q{i}"], is_public=True) for i in range(3)]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/api/dreams/bulk_delete/",
+                {"ids": [dream.pk for dream in dreams[:2]]},
+                format="json",
+            )
+        stats = self.assertStatsMatchTables()
+        self.assertEqual(stats["dream_count"], 1)
+        self.assertEqual(stats["public_dream_count"], 1)
+
+    def test_endpoint(self) -> None:
+        """Test /api/me/stats/ serves the counters and revalidates from the stamp."""
+        self.create_dream(["lucid"])
+        response = self.client.get("/api/me/stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["dream_count"], 1)
+        self.assertEqual(response.data["quality_count"], 1)
+        self.assertEqual(response.data["image_count"], 0)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                "/api/me/stats/", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Users without a row get one built on first read
+        self.client.force_authenticate(user=self.other)
+        response = self.client.get("/api/me/stats/")
+        self.assertEqual(response.data["dream_count"], 0)
+        self.assertTrue(UserJournalStats.objects.filter(user=self.other).exists())
+
+        self.client.force_authenticate(user=None)
+        response = self.client.get("/api/me/stats/")
+        self.assertIn(
+            response.status_code,
+            [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN],
+        )
+
+    def test_rebuild_command(self) -> None:
+        """Test the command reports drift, and only fixes it without --dry-run."""
+        self.create_dream(["lucid"])
+        UserJournalStats.objects.filter(user=self.user).update(dream_count=7)
+
+        # The other user has no row yet, which counts as drift too
+        out = StringIO()
+        call_command("rebuild_journal_stats", "--dry-run", stdout=out)
+        self.assertIn("2 drifted; dry run", out.getvalue())
+        self.assertEqual(UserJournalStats.objects.get(user=self.user).dream_count, 7)
+
+        out = StringIO()
+        call_command("rebuild_journal_stats", "--user", str(self.user.pk), stdout=out)
+        self.assertIn("1 drifted; fixed 1", out.getvalue())
+        self.assertEqual(self.assertStatsMatchTables()["dream_count"], 1)
+        self.assertFalse(UserJournalStats.objects.filter(user=self.other).exists())
+
+
+class DreamImportTestCase(APITestCase):
+    """Test the streaming JSON Lines and CSV import."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.client.force_authenticate(user=self.user)
+
+    def post(self, body: str | bytes, content_type: str) -> Response:
+        """Post an import body."""
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/dreams/import/", body, content_type=content_type
+            )
+
+    def assertAggregatesRepaired(self) -> None:
+        """Assert frequencies, co-occurrences and counters match a recount."""
+        for quality in Quality.objects.filter(user=self.user):
+            self.assertEqual(quality.frequency, quality.dream_set.count())
+        stored = {
+            (row.quality_a_id, row.quality_b_id): row.dream_ids
+            for row in QualityCooccurrence.objects.filter(user=self.user)
+        }
+        QualityCooccurrence.rebuild_for_user(self.user)
+        rebuilt = {
+            (row.quality_a_id, row.quality_b_id): row.dream_ids
+            for row in QualityCooccurrence.objects.filter(user=self.user)
+        }
+        self.assertEqual(stored, rebuilt)
+        stats = UserJournalStats.objects.filter(user=self.user).values(
+            *UserJournalStats.COUNTERS
+        )
+        self.assertEqual(
+            stats.get(), UserJournalStats.actual([self.user.pk])[self.user.pk]
+        )
+
+    def test_jsonl(self) -> None:
+        """Test JSON Lines rows are imported and bad rows reported by line."""
+        lines = [
+            {
+                "description": "Flying over water",
+                "qualities": ["Flying", "water"],
+                "created": "2020-05-01T08:00:00Z",
+            },
+            {"description": "Lucid", "qualities": [{"id": 9, "name": "lucid"}]},
+            "not json",
+            {"qualities": ["flying"]},
+            {"description": "Shared", "qualities": ["water"], "is_public": True},
+        ]
+        body = "\n".join(
+            line if isinstance(line, str) else json.dumps(line) for line in lines
+        )
+        response = self.post(body, "application/x-ndjson; charset=utf-8")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["imported"], 3)
+        self.assertEqual(response.data["rejected"], 2)
+        self.assertEqual([e["line"] for e in response.data["errors"]], [3, 4])
+        self.assertIn("description", response.data["errors"][1]["errors"])
+
+        dream = Dream.objects.get(description="Flying over water")
+        self.assertEqual(dream.created.year, 2020)
+        self.assertEqual(
+            sorted(dream.qualities.values_list("name", flat=True)),
+            ["flying", "water"],
+        )
+        self.assertTrue(Dream.objects.get(description="Shared").is_public)
+        self.assertAggregatesRepaired()
+
+        response = self.client.get("/api/dreams/", {"search": "lucid"})
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_csv(self) -> None:
+        """Test CSV with a BOM, quoted newlines and separated qualities."""
+        body = (
+            "﻿description,qualities,is_public,created\r\n"
+            '"Two\nlines",flying;water,true,2021-01-02T03:04:05Z\r\n'
+            "Plain,,,\r\n"
+            ",water,,\r\n"
+        ).encode()
+        response = self.post(body, "text/csv")
+        self.assertEqual(response.data["imported"], 2)
+        self.assertEqual(response.data["rejected"], 1)
+        self.assertEqual(response.data["errors"][0]["line"], 5)
+
+        dream = Dream.objects.get(description="Two\nlines")
+        self.assertTrue(dream.is_public)
+        self.assertEqual(dream.qualities.count(), 2)
+        self.assertAggregatesRepaired()
+
+    def test_existing_qualities_are_reused(self) -> None:
+        """Test imported names resolve to the user's existing qualities."""
+        Dream.objects.create(user=self.user).qualities.add(
+            Quality.objects.create(user=self.user, name="water")
+        )
+        self.post(
+            json.dumps({"description": "d", "qualities": ["Water"]}),
+            "application/jsonl",
+        )
+        water = Quality.objects.get(user=self.user, name="water")
+        self.assertEqual(water.frequency, 2)
+        self.assertAggregatesRepaired()
+
+    def test_cooccurrences_updated_per_chunk(self) -> None:
+        """Test pairs are merged chunk by chunk instead of rebuilt at the end."""
+        dream = Dream.objects.create(user=self.user, description="Existing")
+        dream.qualities.add(
+            Quality.objects.create(user=self.user, name="flying"),
+            Quality.objects.create(user=self.user, name="water"),
+        )
+        lines = (
+            json.dumps(
+                {"description": f"d{i}", "qualities": ["flying", "water", f"q{i % 3}"]}
+            ).encode()
+            for i in range(7)
+        )
+        with patch.object(QualityCooccurrence, "rebuild_for_user") as rebuild:
+            import_dreams(self.user, lines, "jsonl", chunk_size=3)
+        rebuild.assert_not_called()
+        pair = QualityCooccurrence.objects.get(
+            user=self.user,
+            quality_a__name__in=["flying", "water"],
+            quality_b__name__in=["flying", "water"],
+        )
+        self.assertEqual(pair.dream_count, 8)
+        self.assertAggregatesRepaired()
+
+    def test_queries_per_chunk_do_not_grow_with_rows(self) -> None:
+        """Test a chunk costs the same queries for 5 rows as for 50."""
+        counts = []
+        for size in (5, 50):
+            lines = (
+                json.dumps(
+                    {"description": f"d{i}", "qualities": [f"q{i % 7}"]}
+                ).encode()
+                for i in range(size)
+            )
+            with CaptureQueriesContext(connection) as queries:
+                import_dreams(self.user, lines, "jsonl", chunk_size=100)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_invalid_requests(self) -> None:
+        """Test other content types and empty bodies are refused."""
+        response = self.client.post(
+            "/api/dreams/import/", {"description": "d"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        empty = self.post("", "text/csv")
+        self.assertEqual(empty.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(DREAM_IMPORT_INLINE_MAX_BYTES=10)
+    def test_large_body_runs_as_job(self) -> None:
+        """Test large bodies are staged and imported by a job with progress."""
+        body = "\n".join(
+            json.dumps({"description": f"dream {i}", "qualities": ["big"]})
+            for i in range(3)
+        )
+        staged: list[bytes] = []
+
+        def write_chunks(path: str, chunks: list[bytes], content_type: str) -> int:
+            staged.extend(chunks)
+            return len(b"".join(staged))
+
+        with (
+            patch("dreams.views.object_storage.write_chunks", side_effect=write_chunks),
+            patch("dream_journal.celery.app.send_task") as send_task,
+        ):
+            send_task.return_value.id = "job-1"
+            response = self.post(body, "application/jsonl")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["task_id"], "job-1")
+        self.assertFalse(Dream.objects.filter(user=self.user).exists())
+        (name,), kwargs = send_task.call_args
+        self.assertEqual(name, "dreams.tasks.import_dream_file")
+        user_id, path, fmt, size = kwargs["args"]
+        self.assertEqual((user_id, fmt, size), (self.user.pk, "jsonl", len(body)))
+
+        with (
+            patch(
+                "dreams.tasks.object_storage.read_lines",
+                return_value=iter(b"".join(staged).splitlines(keepends=True)),
+            ),
+            patch("dreams.tasks.object_storage.delete") as delete,
+            patch.object(import_dream_file, "update_state") as update_state,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            result = import_dream_file.apply(args=[user_id, path, fmt, size]).get()
+        self.assertEqual(result["imported"], 3)
+        delete.assert_called_once_with(path)
+        update_state.assert_called_with(
+            state="PROGRESS", meta={"done": len(body), "total": len(body)}
+        )
+        self.assertAggregatesRepaired()
+
+
+class DreamExportTestCase(APITestCase):
+    """Test the streaming JSON Lines and CSV export."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="u", password="password123")
+        self.other = User.objects.create_user(username="o", password="password123")
+        self.client.force_authenticate(user=self.user)
+        water = Quality.objects.create(user=self.user, name="water")
+        flying = Quality.objects.create(user=self.user, name="flying")
+        self.first = Dream.objects.create(user=self.user, description="Two\nlines")
+        self.first.qualities.add(water, flying)
+        self.second = Dream.objects.create(
+            user=self.user, description='A "quoted", public dream', is_public=True
+        )
+        self.second.qualities.add(water)
+        Dream.objects.create(user=self.other, description="Not mine", is_public=True)
+
+    def export(self, **params: str) -> bytes:
+        """Download an export and return its body."""
+        response = self.client.get("/api/dreams/export/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        return cast("StreamingHttpResponse", response).getvalue()
+
+    def assertRoundTrips(self, body: bytes, fmt: str) -> None:
+        """Assert importing the export for another user recreates the dreams."""
+        report = import_dreams(self.other, body.splitlines(keepends=True), fmt)
+        self.assertEqual((report.imported, report.rejected), (2, 0))
+
+        def journal(user: User) -> list[tuple]:
+            return [
+                (
+                    dream.description,
+                    dream.is_public,
+                    dream.created,
+                    sorted(q.name for q in dream.qualities.all()),
+                )
+                for dream in Dream.objects.owned_by(user)
+                .exclude(description="Not mine")
+                .order_by("created")
+            ]
+
+        self.assertEqual(journal(self.other), journal(self.user))
+
+    def test_jsonl(self) -> None:
+        """Test the default export is JSON Lines of the user's dreams only."""
+        body = self.export()
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(
+            [(row["description"], row["qualities"], row["is_public"]) for row in rows],
+            [
+                ("Two\nlines", ["flying", "water"], False),
+                ('A "quoted", public dream', ["water"], True),
+            ],
+        )
+        self.assertRoundTrips(body, "jsonl")
+
+    def test_csv(self) -> None:
+        """Test ?format=csv quotes descriptions and joins quality names."""
+        response = self.client.get("/api/dreams/export/", {"format": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv")
+        body = cast("StreamingHttpResponse", response).getvalue()
+        rows = list(csv.DictReader(StringIO(body.decode())))
+        self.assertEqual(rows[0]["qualities"], "flying;water")
+        self.assertEqual(rows[1]["description"], 'A "quoted", public dream')
+        self.assertEqual(rows[1]["is_public"], "true")
+        self.assertRoundTrips(body, "csv")
+
+    def test_csv_quality_names_with_separators(self) -> None:
+        """Test names holding separators survive a CSV export and import."""
+        Quality.objects.filter(user=self.user, name="flying").update(
+            name="fear, falling"
+        )
+        Quality.objects.filter(user=self.user, name="water").update(name="[a;b]")
+        body = self.export(format="csv")
+        rows = list(csv.DictReader(StringIO(body.decode())))
+        self.assertEqual(rows[0]["qualities"], '["[a;b]","fear, falling"]')
+        self.assertEqual(rows[1]["qualities"], '["[a;b]"]')
+        self.assertRoundTrips(body, "csv")
+
+    def test_empty_journal(self) -> None:
+        """Test an empty journal exports an empty file or a bare CSV header."""
+        self.client.force_authenticate(
+            user=User.objects.create_user(username="e", password="password123")
+        )
+        self.assertEqual(self.export(), b"")
+        self.assertEqual(
+            self.export(format="csv"), b"description,qualities,is_public,created\r\n"
+        )
+
+    def test_one_quality_lookup_per_chunk(self) -> None:
+        """Test qualities are looked up once per chunk, not per dream."""
+        for i in range(3):
+            Dream.objects.create(user=self.user, description=f"d{i}")
+        with CaptureQueriesContext(connection) as queries:
+            chunks = list(export_dreams(self.user, "jsonl", chunk_size=2))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(len(queries), 1 + len(chunks))
+
+    def test_background(self) -> None:
+        """Test ?background=1 queues a job that writes the export to GCS."""
+        with patch("dream_journal.celery.app.send_task") as send_task:
+            send_task.return_value.id = "job-1"
+            response = self.client.get(
+                "/api/dreams/export/", {"format": "csv", "background": "1"}
+            )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["task_id"], "job-1")
+        send_task.assert_called_once_with(
+            "dreams.tasks.export_dream_file", args=[self.user.pk, "csv"]
+        )
+
+        written: list[bytes] = []
+
+        def write_chunks(path: str, chunks: Iterator[bytes], content_type: str) -> int:
+            written.extend(chunks)
+            return len(b"".join(written))
+
+        with (
+            patch("dreams.tasks.object_storage.write_chunks", side_effect=write_chunks),
+            patch("dreams.tasks.object_storage.signed_url", return_value="https://u"),
+            patch.object(export_dream_file, "update_state") as update_state,
+        ):
+            result = export_dream_file.apply(
+                args=[self.user.pk, "csv"], task_id="job-1"
+            ).get()
+        self.assertEqual(result["path"], f"users/{self.user.pk}/exports/job-1.csv")
+        self.assertEqual(result["url"], "https://u")
+        self.assertEqual(result["bytes"], len(b"".join(written)))
+        update_state.assert_called_with(state="PROGRESS", meta={"done": 2, "total": 2})
+        self.assertRoundTrips(b"".join(written), "csv")
+
+    @override_settings(DREAM_EXPORT_INLINE_MAX_DREAMS=1)
+    def test_large_journal_runs_as_job(self) -> None:
+        """Test journals over the inline limit are exported by a job."""
+        with patch("dream_journal.celery.app.send_task") as send_task:
+            send_task.return_value.id = "job-1"
+            response = self.client.get("/api/dreams/export/")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        send_task.assert_called_once_with(
+            "dreams.tasks.export_dream_file", args=[self.user.pk, "jsonl"]
+        )
@@ -2,7 +2,7 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .nested_views import DreamQualityViewSet
-from .views import DreamViewSet, QualityViewSet
+from .views import DreamViewSet, JournalStatsViewSet, QualityViewSet
 
 # Main router
 router = DefaultRouter()
@@ -24,6 +24,11 @@ nested_urlpatterns = [
 ]
 
 urlpatterns = [
+    path(
+        "me/stats/",
+        JournalStatsViewSet.as_view({"get": "retrieve"}),
+        name="journal-stats",
+    ),
     path("", include(router.urls)),
     path("", include(nested_urlpatterns)),
 ]
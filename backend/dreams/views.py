@@ -1,23 +1,78 @@
 import logging
+import time
+import uuid
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import Any, cast
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Q, QuerySet
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    OuterRef,
+    Prefetch,
+    QuerySet,
+    Subquery,
+    TextField,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Concat, Length, Substr
+from django.db.models.lookups import GreaterThan
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
 
-from .models import Dream, Image, Quality
-from .pagination import DynamicPageSizePagination
+from .models import IMAGE_PREVIEW_COUNT, Dream, Image, Quality, UserJournalStats
+from .pagination import DreamCursorPagination, DynamicPageSizePagination
 from .permissions import IsAuthenticatedAndIsOwnerOrIsPublic, IsAuthenticatedAndOwner
+from .renderers import CSVRenderer, FastJSONRenderer, JSONLinesRenderer
 from .serializers import (
+    DESCRIPTION_PREVIEW_LENGTH,
     DreamListSerializer,
     DreamSerializer,
     ImageSerializer,
+    QualityConnectionSerializer,
     QualitySerializer,
     QualityStatisticSerializer,
+    QualitySubgraphSerializer,
+    UserJournalStatsSerializer,
+)
+from .services import object_storage
+from .services.background_jobs import BackgroundJobs
+from .services.bulk_deletion import delete_dreams
+from .services.conditional_requests import (
+    PUBLIC_SCOPE,
+    SIGNED_URL_REFRESH,
+    ChangeStamps,
+    ConditionalGet,
+)
+from .services.dream_calendar import (
+    DEFAULT_RANGE,
+    EARLIEST_DATE,
+    LATEST_DATE,
+    PERIODS,
+    DreamCalendar,
+    day_bounds,
 )
+from .services.dream_export import EXPORT_FORMATS, export_dreams
+from .services.dream_import import IMPORT_FORMATS, import_dreams
+from .services.dream_search import DreamSearchIndex
+from .services.list_rendering import DreamListRows, QualityRows
 from .services.prompt_service import PromptService
+from .services.public_feed_cache import PublicFeedCache
+from .services.quality_graph_cache import QualityGraphCache
 from .services.signed_url import signed_url_service
 
 
@@ -29,6 +84,7 @@ class QualityViewSet(viewsets.ModelViewSet):
 
     serializer_class = QualitySerializer
     permission_classes = [IsAuthenticatedAndOwner]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
 
     def perform_create(self, serializer: QualitySerializer) -> None:
         """Save the quality with the authenticated user."""
@@ -41,24 +97,172 @@ class QualityViewSet(viewsets.ModelViewSet):
         """
         return Quality.objects.filter(user=self.request.user).order_by("name")
 
+    def list(self, request: Request, *args: object, **kwargs: object) -> Response:
+        """
+        List the user's qualities, built from values() rows.
+        Answers 304 from the user's change stamp, one primary key lookup.
+        """
+        user = request.user
+        if not isinstance(user, User):
+            return Response(
+                {"error": "Authentication required"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        stamp = ChangeStamps.get(user.pk)
+        etag = ConditionalGet.entity_tag(
+            "qualities", user.pk, stamp.token, request.query_params.urlencode()
+        )
+        not_modified = ConditionalGet.not_modified(request, etag, stamp.changed)
+        if not_modified is not None:
+            return not_modified
+
+        queryset = QualityRows.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            response = self.get_paginated_response(QualityRows.render(page))
+        else:
+            response = Response(QualityRows.render(queryset))
+        return ConditionalGet.with_validators(response, etag, stamp.changed)
+
+    @action(detail=False, methods=["get"])
+    def autocomplete(self, request: Request) -> Response:
+        """
+        Suggest qualities for a partially typed name.
+
+        Query parameters: prefix (text typed so far), limit (1-50, default 10),
+        order ("name" or "frequency") and mode ("prefix" or "fuzzy").
+        Returns an unpaginated list of {"id", "name", "frequency"}.
+        """
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            return Response(
+                {"error": "limit must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not 1 <= limit <= 50:
+            return Response(
+                {"error": "limit must be between 1 and 50"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        order = request.query_params.get("order", "name")
+        mode = request.query_params.get("mode", "prefix")
+        if order not in ("name", "frequency") or mode not in ("prefix", "fuzzy"):
+            return Response(
+                {"error": "order must be name or frequency, mode prefix or fuzzy"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        suggestions = Quality.autocomplete(
+            request.user,  # type: ignore[arg-type]
+            request.query_params.get("prefix", ""),
+            limit=limit,
+            by_frequency=order == "frequency",
+            fuzzy=mode == "fuzzy",
+        )
+        return Response(suggestions)
+
     @action(detail=True, methods=["get"])
-    def connections(self, request: Request) -> Response:
-        """Get all connections for a specific quality."""
+    def connections(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Get all connections for a specific quality.
+        Supports optional `limit` and `min_strength` query parameters.
+
+        Each connection's connection_strength is the full number of shared
+        dreams, while shared_dream_ids holds only the DREAM_ID_SAMPLE_SIZE most
+        recent of them (ascending); page through every shared dream with
+        connections/{other_id}/dreams/.
+        """
         quality = self.get_object()  # This already checks ownership
-        connections = quality.get_connections()
-
-        # Convert to serializable format
-        connections_data = [
-            {
-                "quality_id": conn.quality_id,
-                "quality_name": conn.quality_name,
-                "shared_dream_ids": conn.shared_dream_ids,
-                "connection_strength": conn.connection_strength,
-            }
-            for conn in connections
-        ]
 
-        return Response(connections_data)
+        try:
+            limit_param = request.query_params.get("limit")
+            limit = int(limit_param) if limit_param else None
+            min_strength = int(request.query_params.get("min_strength", 1))
+        except (ValueError, TypeError):
+            return Response(
+                {"error": "limit and min_strength must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if (limit is not None and limit < 1) or min_strength < 1:
+            return Response(
+                {"error": "limit and min_strength must be positive"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        connections = quality.get_connections(limit=limit, min_strength=min_strength)
+        serializer = QualityConnectionSerializer(connections, many=True)
+        return Response(serializer.data)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path=r"connections/(?P<other_id>\d+)/dreams",
+    )
+    def connection_dreams(
+        self, request: Request, pk: str | None = None, other_id: str | None = None
+    ) -> Response:
+        """
+        Page through the dreams shared by this quality and another one.
+        Uses cursor pagination; pass `cursor` from the previous page's links.
+        """
+        quality = self.get_object()  # This already checks ownership
+        other = get_object_or_404(self.get_queryset(), pk=other_id)
+
+        queryset = DreamViewSet.with_relations(
+            Dream.objects.filter(user=quality.user, qualities=quality).filter(
+                qualities=other
+            )
+        )
+
+        selected = DreamListRows.selection(None)
+        paginator = DreamCursorPagination()
+        page = paginator.paginate_queryset(
+            DreamListRows.values(queryset, selected), request, view=self
+        )
+        rows = DreamListRows.render(page, selected, request.user.pk)
+        return paginator.get_paginated_response(rows)
+
+    @action(detail=True, methods=["get"])
+    def subgraph(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Get the quality graph neighbourhood centered on this quality.
+
+        Query parameters:
+            hops: Co-occurrence steps from this quality (1-3, default 1)
+            max_nodes: Maximum nodes returned (2-200, default 50)
+            min_strength: Minimum shared dreams per edge (default 1)
+            dream_sample: Recent dream IDs per edge (0-20, default 0 for weights only)
+        """
+        quality = self.get_object()  # This already checks ownership
+
+        limits = {
+            "hops": (1, 1, 3),
+            "max_nodes": (50, 2, 200),
+            "min_strength": (1, 1, None),
+            "dream_sample": (0, 0, 20),
+        }
+        params = {}
+        for name, (default, minimum, maximum) in limits.items():
+            try:
+                value = int(request.query_params.get(name, default))
+            except (ValueError, TypeError):
+                return Response(
+                    {"error": f"{name} must be an integer"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if value < minimum or (maximum is not None and value > maximum):
+                return Response(
+                    {"error": f"{name} is out of range"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            params[name] = value
+
+        subgraph = quality.get_subgraph(**params)
+        serializer = QualitySubgraphSerializer(subgraph)
+        return Response(serializer.data)
 
     @action(detail=False, methods=["get"])
     def statistics(self, request: Request) -> Response:
@@ -70,9 +274,11 @@ class QualityViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        stats = Dream.get_quality_statistics(user)
-        serializer = QualityStatisticSerializer(stats, many=True)
-        return Response(serializer.data)
+        def build() -> list[dict[str, object]]:
+            stats = Dream.get_quality_statistics(user)
+            return list(QualityStatisticSerializer(stats, many=True).data)
+
+        return QualityGraphCache.get_response(request, user.pk, "statistics", build)
 
 
 class DreamViewSet(viewsets.ModelViewSet):
@@ -84,6 +290,21 @@ class DreamViewSet(viewsets.ModelViewSet):
 
     permission_classes = [IsAuthenticatedAndIsOwnerOrIsPublic]
     pagination_class = DynamicPageSizePagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    _paginator: BasePagination | None
+
+    @property
+    def paginator(self) -> BasePagination | None:
+        """
+        Page numbers by default; ?pagination=cursor opts into keyset pages
+        ordered by (-created, id), which also replaces search rank ordering.
+        """
+        if not hasattr(self, "_paginator"):
+            if self.request.query_params.get("pagination") == "cursor":
+                self._paginator = DreamCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def _generate_gcs_path(self, dream: Dream) -> str:
         """Generate a unique GCS path for a dream image."""
@@ -129,42 +350,351 @@ class DreamViewSet(viewsets.ModelViewSet):
 
         return dream_image
 
-    def get_queryset(self) -> QuerySet[Dream]:
+    # Detail actions that non-owners may call on public dreams
+    READ_ACTIONS = frozenset({"retrieve", "images", "image"})
+
+    # Largest BigAutoField primary key; larger IDs can't be bound as parameters
+    MAX_ID = 2**63 - 1
+
+    # Read actions that accept the fields= and expand= query parameters
+    SPARSE_ACTIONS = frozenset({"list", "retrieve", "astral_plane"})
+
+    # Columns loaded for each selectable field, beyond the ones always needed
+    # for ordering, pagination and ownership checks
+    FIELD_COLUMNS: dict[str, tuple[str, ...]] = {
+        "description": ("description",),
+        "updated": ("updated",),
+    }
+
+    @staticmethod
+    def with_relations(
+        queryset: QuerySet[Dream],
+        fields: set[str] | None = None,
+        expand: set[str] | frozenset[str] = frozenset(),
+    ) -> QuerySet[Dream]:
         """
-        Filter dreams to those owned by the user OR marked as public.
-        Supports optional quality filtering via query parameter.
+        Load what the dream serializers render, one query per relation.
+
+        Only the latest IMAGE_PREVIEW_COUNT images are loaded per dream (a
+        window over the images query); image_count carries the full number.
+        With a sparse field selection, only the selected columns, annotations
+        and relations are loaded.
+
+        Args:
+            queryset: The scoped dreams
+            fields: Selected fields, or None for the full default output
+            expand: Nested relations requested on top of the fields
         """
-        queryset = (
-            Dream.objects.filter(Q(user=self.request.user) | Q(is_public=True))
-            .prefetch_related("qualities")
-            .distinct()
+        if fields is None:
+            selected = {"description", "image_count", "qualities", "images"}
+        else:
+            selected = fields | expand
+            columns = ["id", "user", "is_public", "created"]
+            for name in selected:
+                columns.extend(DreamViewSet.FIELD_COLUMNS.get(name, ()))
+            queryset = queryset.only(*columns)
+
+        if "image_count" in selected:
+            image_count = (
+                Image.objects.filter(dream=OuterRef("pk"))
+                .order_by()
+                .values("dream")
+                .annotate(count=Count("pk"))
+                .values("count")
+            )
+            queryset = queryset.annotate(
+                image_count=Coalesce(Subquery(image_count), Value(0))
+            )
+        if "description_preview" in selected:
+            # Truncated in SQL so long descriptions are never sent over the wire
+            queryset = queryset.annotate(
+                description_preview=Case(
+                    When(
+                        GreaterThan(Length("description"), DESCRIPTION_PREVIEW_LENGTH),
+                        then=Concat(
+                            Substr("description", 1, DESCRIPTION_PREVIEW_LENGTH),
+                            Value("..."),
+                        ),
+                    ),
+                    default="description",
+                    output_field=TextField(),
+                )
+            )
+        if "qualities" in selected:
+            queryset = queryset.prefetch_related("qualities")
+        elif "quality_names" in selected:
+            queryset = queryset.prefetch_related(
+                Prefetch("qualities", queryset=Quality.objects.only("id", "name"))
+            )
+        if "images" in selected:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "images",
+                    queryset=Image.objects.order_by("-created")[:IMAGE_PREVIEW_COUNT],
+                    to_attr="_preview_images",
+                )
+            )
+        return queryset
+
+    def get_field_selection(self) -> tuple[set[str] | None, set[str]]:
+        """
+        Parse the fields= and expand= query parameters.
+
+        Returns:
+            The selected fields (None when not narrowed) and the relations to
+            expand; both empty outside the sparse read actions
+        """
+        if self.action not in self.SPARSE_ACTIONS:
+            return None, set()
+
+        def parse(name: str) -> set[str] | None:
+            value = self.request.query_params.get(name)
+            if value is None:
+                return None
+            return {part.strip() for part in value.split(",") if part.strip()}
+
+        fields = parse("fields")
+        expand = parse("expand") or set()
+        allowed = set(DreamListSerializer.Meta.fields)
+        unknown = sorted(((fields or set()) - allowed) | (expand - allowed))
+        if unknown:
+            raise ValidationError({"fields": [f"Unknown fields: {', '.join(unknown)}"]})
+        not_expandable = sorted(expand - set(DreamListSerializer.expandable_fields))
+        if not_expandable:
+            raise ValidationError(
+                {"expand": [f"Cannot expand: {', '.join(not_expandable)}"]}
+            )
+        if fields is None and expand:
+            # Expanding alone keeps the default fields
+            fields = set(allowed) - set(DreamListSerializer.optional_fields)
+        return fields, expand
+
+    def get_quality_filter(self) -> tuple[list[int], bool]:
+        """
+        Parse the qualities= and match= query parameters of the list.
+
+        Returns:
+            The quality IDs to filter by (empty for no filter) and whether
+            dreams must have all of them rather than any
+        """
+        params = self.request.query_params
+        value = params.get("qualities", "")
+        match = params.get("match", "any")
+        if match not in ("any", "all"):
+            raise ValidationError({"match": ["match must be any or all"]})
+        if value.strip() and params.get("quality"):
+            raise ValidationError(
+                {"qualities": ["pass either quality or qualities, not both"]}
+            )
+        try:
+            quality_ids = [int(part) for part in value.split(",") if part.strip()]
+        except ValueError as exc:
+            raise ValidationError(
+                {"qualities": ["qualities must be comma-separated IDs"]}
+            ) from exc
+        if not all(0 < pk <= self.MAX_ID for pk in quality_ids):
+            raise ValidationError({"qualities": ["qualities must be quality IDs"]})
+        return quality_ids, match == "all"
+
+    def get_date_range(self) -> tuple[date | None, date | None, ZoneInfo]:
+        """
+        Parse the start= and end= (YYYY-MM-DD, inclusive) and tz= query
+        parameters of the list and calendar. Dates are clamped to
+        EARLIEST_DATE..LATEST_DATE.
+
+        Returns:
+            The first and last local days (None when not given) and the time
+            zone the days are counted in, the server's by default
+        """
+        params = self.request.query_params
+        try:
+            tz = ZoneInfo(params["tz"]) if params.get("tz") else None
+        except (ZoneInfoNotFoundError, ValueError) as exc:
+            raise ValidationError({"tz": ["tz must be an IANA time zone"]}) from exc
+        if tz is None:
+            tz = ZoneInfo(timezone.get_default_timezone_name())
+
+        bounds: dict[str, date | None] = {}
+        for name in ("start", "end"):
+            value = params.get(name)
+            try:
+                bounds[name] = date.fromisoformat(value) if value else None
+            except ValueError as exc:
+                raise ValidationError(
+                    {name: [f"{name} must be a date (YYYY-MM-DD)"]}
+                ) from exc
+        start, end = bounds["start"], bounds["end"]
+        if start and end and start > end:
+            raise ValidationError({"end": ["end must not be before start"]})
+        start, end = (
+            min(max(day, EARLIEST_DATE), LATEST_DATE) if day else None
+            for day in (start, end)
         )
+        return start, end, tz
+
+    def get_serializer(self, *args: object, **kwargs: object) -> BaseSerializer:
+        """Pass a sparse field selection to the list serializer."""
+        fields, expand = self.get_field_selection()
+        if fields is not None:
+            kwargs.setdefault("context", self.get_serializer_context())
+            return DreamListSerializer(*args, fields=fields, expand=expand, **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self) -> QuerySet[Dream]:
+        """
+        Scope dreams to what the action needs, so each query uses one index.
+        - list: the user's dreams UNION public dreams (only the user's own
+          when filtering by one of their qualities)
+        - retrieve and image reads: own or public, looked up by primary key
+        - writes and everything else: the user's own dreams
+        Supports quality filtering (quality=<id>, or qualities=<id>,<id>... with
+        match=any|all), date ranges (start=, end=, tz=) and full-text search on
+        lists.
+        """
+        user = self.request.user
+        if not isinstance(user, User):
+            # The permission classes turn anonymous requests away first
+            return Dream.objects.none()
+
+        fields, expand = self.get_field_selection()
+        if self.action == "retrieve":
+            return self.with_relations(Dream.objects.readable_by(user), fields, expand)
+        if self.action in self.READ_ACTIONS:
+            # The image actions read the dream's images themselves, unbounded
+            return Dream.objects.readable_by(user)
+        if self.action != "list":
+            return self.with_relations(Dream.objects.owned_by(user))
 
         # Filter by quality if quality query parameter is provided
         quality_id = self.request.query_params.get("quality")
+        quality_ids, match_all = self.get_quality_filter()
         if quality_id:
             try:
-                quality_id_int = int(quality_id)
-                # Filter dreams that have this quality and belong to the user
-                queryset = queryset.filter(
-                    qualities__id=quality_id_int, qualities__user=self.request.user
-                ).distinct()
+                quality_ids = [int(quality_id)]
             except (ValueError, TypeError):
-                # Invalid quality ID format, return empty queryset
-                queryset = queryset.none()
+                quality_ids = [0]
+            if not 0 < quality_ids[0] <= self.MAX_ID:
+                # Invalid quality ID, return an empty list (annotated for rendering)
+                return self.with_relations(Dream.objects.none(), fields, expand)
+        queryset: QuerySet[Dream]
+        if quality_ids:
+            # Qualities belong to their owner, so only the user's dreams can match
+            queryset = Dream.objects.owned_by(user).with_qualities(
+                quality_ids, match_all
+            )
+        else:
+            queryset = Dream.objects.visible_to(user)
 
-        # Filter by search query if search parameter is provided
+        # Bound created by instants rather than __date, so the index applies
+        start, end, tz = self.get_date_range()
+        if start:
+            queryset = queryset.filter(created__gte=day_bounds(start, start, tz)[0])
+        if end:
+            queryset = queryset.filter(created__lt=day_bounds(end, end, tz)[1])
+        queryset = self.with_relations(queryset, fields, expand)
+
+        # Full-text search over description and quality names, best match first
         search_query = self.request.query_params.get("search")
         if search_query and search_query.strip():
-            search_term = search_query.strip()
-            # Search in dream description and quality names
-            queryset = queryset.filter(
-                Q(description__icontains=search_term)
-                | Q(qualities__name__icontains=search_term)
-            ).distinct()
+            queryset = DreamSearchIndex.search(queryset, search_query)
 
         return queryset
 
+    def list(self, request: Request, *args: object, **kwargs: object) -> Response:
+        """
+        List dreams without instantiating serializers per row.
+        Rows are built from values() by DreamListRows, which renders exactly
+        what DreamListSerializer would.
+        """
+        user = request.user
+        if not isinstance(user, User):
+            return Response(
+                {"error": "Authentication required"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        # Lists read the user's dreams and public ones, so the two change stamps
+        # validate any page with one lookup
+        stamps = ChangeStamps.get_many([user.pk, PUBLIC_SCOPE])
+        etag = ConditionalGet.entity_tag(
+            "dreams",
+            user.pk,
+            *(stamp.token for stamp in stamps),
+            request.query_params.urlencode(),
+        )
+        last_modified = max(stamp.changed for stamp in stamps)
+        not_modified = ConditionalGet.not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        fields, expand = self.get_field_selection()
+        selected = DreamListRows.selection(fields, expand)
+        queryset = DreamListRows.values(
+            self.filter_queryset(self.get_queryset()), selected
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            rows = DreamListRows.render(page, selected, request.user.pk)
+            response = self.get_paginated_response(rows)
+        else:
+            rows = DreamListRows.render(list(queryset), selected, request.user.pk)
+            response = Response(rows)
+        return ConditionalGet.with_validators(response, etag, last_modified)
+
+    def get_dream_validators(
+        self, pk: int, owner_id: int, updated: datetime
+    ) -> tuple[str, datetime]:
+        """
+        ETag and Last-Modified of a dream's detail representation.
+
+        The ETag's version part is the dream's own Dream.updated, which If-Match
+        checks; the rest covers the viewer, the query and the owner's change
+        stamp (images, quality names and frequencies).
+        """
+        owner = ChangeStamps.get(owner_id)
+        etag = ConditionalGet.entity_tag(
+            self.dream_version(pk, updated),
+            self.request.user.pk,
+            owner.token,
+            self.request.query_params.urlencode(),
+        )
+        return etag, max(updated, owner.changed)
+
+    @staticmethod
+    def dream_version(pk: int, updated: datetime) -> str:
+        """The version of a dream's own fields, for If-Match."""
+        return f"dream-{pk}-{updated:%Y%m%d%H%M%S%f}"
+
+    def retrieve(self, request: Request, *args: object, **kwargs: object) -> Response:
+        """
+        Get one dream, answering 304 after a single indexed lookup of its
+        owner and Dream.updated when the client's copy is current.
+        """
+        user = request.user
+        if not isinstance(user, User):
+            return super().retrieve(request, *args, **kwargs)
+        try:
+            dream = (
+                Dream.objects.readable_by(user)
+                .filter(pk=kwargs["pk"])
+                .values("pk", "user_id", "updated")
+                .first()
+            )
+        except (ValueError, TypeError):
+            dream = None
+        if dream is None:
+            # Let get_object() produce the usual 404
+            return super().retrieve(request, *args, **kwargs)
+
+        etag, last_modified = self.get_dream_validators(
+            dream["pk"], dream["user_id"], dream["updated"]
+        )
+        not_modified = ConditionalGet.not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = super().retrieve(request, *args, **kwargs)
+        return ConditionalGet.with_validators(response, etag, last_modified)
+
     def get_serializer_class(self) -> type:
         """Use lightweight serializer for list views."""
         if self.action == "list":
@@ -176,8 +706,31 @@ class DreamViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
     def perform_update(self, serializer: DreamSerializer) -> None:
-        """Update the dream (user is already set on the instance)."""
-        serializer.save()
+        """
+        Update the dream (user is already set on the instance).
+
+        With If-Match, the write only goes ahead while the dream is still at
+        the version the client last saw (412 otherwise); the row is locked
+        between the check and the save. The new validators are returned so
+        autosaves can chain.
+        """
+        dream = cast("Dream", serializer.instance)
+        with transaction.atomic():
+            if "If-Match" in self.request.headers:
+                updated = (
+                    Dream.objects.select_for_update()
+                    .values_list("updated", flat=True)
+                    .get(pk=dream.pk)
+                )
+                ConditionalGet.require_version(
+                    self.request, self.dream_version(dream.pk, updated)
+                )
+            serializer.save()
+
+        etag, last_modified = self.get_dream_validators(
+            dream.pk, dream.user_id, dream.updated
+        )
+        self.headers.update(ConditionalGet.headers(etag, last_modified))
 
     @action(detail=False, methods=["get"])
     def quality_graph(self, request: Request) -> Response:
@@ -189,45 +742,241 @@ class DreamViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        graph = Dream.build_quality_graph(user)
+        def build() -> dict[str, object]:
+            graph = Dream.build_quality_graph(user)
 
-        # Convert graph to serializable format
-        graph_data = {
-            "nodes": [
-                {
-                    "id": node.quality_id,
-                    "name": node.quality_name,
-                    "frequency": node.frequency,
-                    "edges": {str(k): v for k, v in node.edges.items()},
-                }
-                for node in graph.nodes.values()
-            ]
-        }
+            # Convert graph to serializable format
+            return {
+                "nodes": [
+                    {
+                        "id": node.quality_id,
+                        "name": node.quality_name,
+                        "frequency": node.frequency,
+                        "edges": {str(k): v for k, v in node.edges.items()},
+                    }
+                    for node in graph.nodes.values()
+                ]
+            }
 
-        return Response(graph_data)
+        return QualityGraphCache.get_response(request, user.pk, "graph", build)
+
+    @action(detail=False, methods=["get"])
+    def calendar(self, request: Request) -> Response:
+        """
+        Get the user's dream counts per day, week or month, with streaks and
+        totals, for the dashboard and heatmap.
+
+        Query parameters:
+            period: day, week or month (default day)
+            start, end: Local dates of the range (default the last year)
+            tz: IANA time zone days are counted in (default the server's)
+        """
+        user = request.user
+        if not isinstance(user, User):
+            return Response(
+                {"error": "Authentication required"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        period = request.query_params.get("period", "day")
+        if period not in PERIODS:
+            return Response(
+                {"error": f"period must be one of {', '.join(PERIODS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        start, end, tz = self.get_date_range()
+        today = datetime.now(tz).date()
+        end = end or max(today, start or today)
+        start = start or end - DEFAULT_RANGE
+
+        # The current streak depends on the day as well as the data
+        stamp = ChangeStamps.get(user.pk)
+        etag = ConditionalGet.entity_tag(
+            "calendar",
+            user.pk,
+            stamp.token,
+            today,
+            request.query_params.urlencode(),
+        )
+        not_modified = ConditionalGet.not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        payload = DreamCalendar.build(user, period, start, end, tz)
+        return ConditionalGet.with_validators(Response(payload), etag)
+
+    @action(detail=False, methods=["post"])
+    def bulk_delete(self, request: Request) -> Response:
+        """
+        Delete many of the user's dreams at once.
+
+        Body: {"ids": [1, 2, ...], "background": false}. IDs of dreams the user
+        does not own are ignored. With "background" the deletion runs as a
+        Celery job whose progress is read from the jobs endpoint.
+        """
+        user = request.user
+        if not isinstance(user, User):
+            return Response(
+                {"error": "Authentication required"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        dream_ids = request.data.get("ids")
+        if not isinstance(dream_ids, list) or not all(
+            isinstance(pk, int) and not isinstance(pk, bool) for pk in dream_ids
+        ):
+            return Response(
+                {"error": "ids must be a list of dream IDs"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if request.data.get("background"):
+            task_id = BackgroundJobs.start(
+                user.pk, "dreams.tasks.bulk_delete_dreams", [user.pk, dream_ids]
+            )
+            return Response({"task_id": task_id}, status=status.HTTP_202_ACCEPTED)
+
+        deleted = delete_dreams(user, dream_ids)
+        return Response({"deleted": deleted})
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_file(self, request: Request) -> Response:
+        """
+        Import dreams from a JSON Lines or CSV body, picked by Content-Type
+        (application/jsonl or application/x-ndjson, text/csv).
+
+        Rows carry description and optionally qualities, is_public and created;
+        invalid rows are skipped and reported. The body is read as a stream.
+        Bodies over DREAM_IMPORT_INLINE_MAX_BYTES, or any with ?background=true,
+        are staged in GCS and imported by a Celery job whose progress is read
+        from the jobs endpoint.
+        """
+        user = request.user
+        if not isinstance(user, User):
+            return Response(
+                {"error": "Authentication required"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        content_type = request.content_type.split(";")[0].strip().lower()
+        fmt = IMPORT_FORMATS.get(content_type)
+        if fmt is None:
+            return Response(
+                {"error": "Content-Type must be JSON Lines or CSV"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        size = int(request.META.get("CONTENT_LENGTH") or 0)
+        stream = request.stream
+        if not size or stream is None:
+            return Response(
+                {"error": "The request body is empty"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        background = request.query_params.get("background") in ("1", "true")
+        if background or size > settings.DREAM_IMPORT_INLINE_MAX_BYTES:
+            path = f"users/{user.pk}/imports/{uuid.uuid4()}.{fmt}"
+            chunks = iter(lambda: stream.read(object_storage.STREAM_CHUNK_SIZE), b"")
+            size = object_storage.write_chunks(path, chunks, content_type)
+            task_id = BackgroundJobs.start(
+                user.pk, "dreams.tasks.import_dream_file", [user.pk, path, fmt, size]
+            )
+            return Response({"task_id": task_id}, status=status.HTTP_202_ACCEPTED)
+
+        report = import_dreams(user, stream, fmt, total_bytes=size)
+        return Response(report.as_dict())
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[JSONLinesRenderer, CSVRenderer],
+    )
+    def export(self, request: Request) -> Response | StreamingHttpResponse:
+        """
+        Export the user's whole journal as JSON Lines (?format=jsonl, the
+        default) or CSV (?format=csv), in the format the importer reads.
+
+        The file is streamed from a server-side cursor a chunk at a time.
+        Journals over DREAM_EXPORT_INLINE_MAX_DREAMS, or any with
+        ?background=true, are written to GCS by a Celery job whose result
+        holds a signed download URL.
+        """
+        user = request.user
+        if not isinstance(user, User):
+            return Response(
+                {"error": "Authentication required"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        fmt = request.accepted_renderer.format
+        background = request.query_params.get("background") in ("1", "true")
+        total = UserJournalStats.for_user(user).dream_count
+        if background or total > settings.DREAM_EXPORT_INLINE_MAX_DREAMS:
+            task_id = BackgroundJobs.start(
+                user.pk, "dreams.tasks.export_dream_file", [user.pk, fmt]
+            )
+            return Response({"task_id": task_id}, status=status.HTTP_202_ACCEPTED)
+
+        response = StreamingHttpResponse(
+            export_dreams(user, fmt), content_type=EXPORT_FORMATS[fmt]
+        )
+        filename = f"dreams-{timezone.localdate().isoformat()}.{fmt}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=["get"], url_path=r"jobs/(?P<task_id>[\w-]+)")
+    def job(self, request: Request, task_id: str | None = None) -> Response:
+        """Get the state and progress of one of the user's background jobs."""
+        user = request.user
+        if not isinstance(user, User):
+            return Response(
+                {"error": "Authentication required"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        payload = BackgroundJobs.status(user.pk, str(task_id))
+        if payload is None:
+            return Response(
+                {"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(payload)
 
     @action(detail=False, methods=["get"])
     def astral_plane(self, request: Request) -> Response:
-        """Get all public dreams anonymously for The Astral Plane."""
-        queryset = Dream.objects.filter(is_public=True).prefetch_related("qualities")
+        """
+        Get all public dreams anonymously for The Astral Plane.
+        Pages are shared across users through PublicFeedCache, and answer 304
+        from the feed version the cached pages are stored under.
+        """
+        version, changed = PublicFeedCache.validator()
+        etag = ConditionalGet.entity_tag(
+            "astral_plane",
+            request.user.pk,
+            version,
+            request.query_params.urlencode(),
+        )
+        not_modified = ConditionalGet.not_modified(request, etag, changed)
+        if not_modified is not None:
+            return not_modified
 
-        # Apply search if provided
-        search_query = request.query_params.get("search")
-        if search_query and search_query.strip():
-            search_term = search_query.strip()
-            queryset = queryset.filter(
-                Q(description__icontains=search_term)
-                | Q(qualities__name__icontains=search_term)
-            ).distinct()
+        def build() -> tuple[dict[str, Any], list[int]]:
+            fields, expand = self.get_field_selection()
+            selected = DreamListRows.selection(fields, expand)
+            queryset = self.with_relations(Dream.objects.public(), fields, expand)
 
-        # Apply pagination
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            # Apply search if provided
+            search_query = request.query_params.get("search")
+            if search_query and search_query.strip():
+                queryset = DreamSearchIndex.search(queryset, search_query)
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+            page = self.paginate_queryset(DreamListRows.values(queryset, selected))
+            page = page or []
+            rows = DreamListRows.render(page, selected, request.user.pk)
+            response = self.get_paginated_response(rows)
+            return response.data, [row["user_id"] for row in page]
+
+        response = PublicFeedCache.get_response(request, build, version)
+        return ConditionalGet.with_validators(response, etag, changed)
 
     @action(detail=True, methods=["post"])
     def generate_image(self, request: Request, pk: str | None = None) -> Response:
@@ -318,15 +1067,24 @@ class DreamViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["get"])
     def images(self, request: Request, pk: str | None = None) -> Response:
-        """Get all images for this dream. Returns List[Image]."""
+        """
+        Get all images for this dream. Returns List[Image].
+        Polls answer 304 until an image is added, removed or changes status.
+        """
         dream = self.get_object()  # This already checks ownership
+        images = list(dream.images.all())
+
+        etag = self.get_image_etag(f"images-{dream.pk}", images)
+        not_modified = ConditionalGet.not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
 
         # Serialize images
-        serializer = ImageSerializer(dream.images.all(), many=True)
+        serializer = ImageSerializer(images, many=True)
         data = serializer.data
 
         # Add signed URLs for completed images
-        for i, image in enumerate(dream.images.all()):
+        for i, image in enumerate(images):
             if image.generation_status == Image.GenerationStatus.COMPLETED:
                 try:
                     data[i]["image_url"] = signed_url_service.get_signed_url(image)
@@ -335,7 +1093,7 @@ class DreamViewSet(viewsets.ModelViewSet):
                         f"Failed to generate signed URL for image {image.id}: {e}"
                     )
 
-        return Response(data)
+        return Response(data, headers=ConditionalGet.headers(etag))
 
     @action(detail=True, methods=["get"], url_path=r"images/(?P<image_id>\d+)")
     def image(
@@ -351,6 +1109,11 @@ class DreamViewSet(viewsets.ModelViewSet):
                 {"error": "Image not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
+        etag = self.get_image_etag(f"image-{dream_image.pk}", [dream_image])
+        not_modified = ConditionalGet.not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+
         # Serialize the image
         serializer = ImageSerializer(dream_image)
         data = serializer.data
@@ -364,4 +1127,52 @@ class DreamViewSet(viewsets.ModelViewSet):
                     f"Failed to generate signed URL for image {dream_image.id}: {e}"
                 )
 
-        return Response(data)
+        return Response(data, headers=ConditionalGet.headers(etag))
+
+    @staticmethod
+    def get_image_etag(version: str, images: Sequence[Image]) -> str:
+        """
+        ETag of image representations, from each image's creation and status.
+        Signed URLs expire, so completed images also roll over every
+        SIGNED_URL_REFRESH seconds to hand out fresh URLs in time.
+        """
+        parts: list[object] = [
+            f"{image.pk}:{image.created.isoformat()}:{image.generation_status}"
+            for image in images
+        ]
+        if any(
+            image.generation_status == Image.GenerationStatus.COMPLETED
+            for image in images
+        ):
+            parts.append(int(time.time() // SIGNED_URL_REFRESH))
+        return ConditionalGet.entity_tag(version, *parts)
+
+
+class JournalStatsViewSet(viewsets.ViewSet):
+    """The requesting user's journal summary counters, at /api/me/stats/."""
+
+    permission_classes = [IsAuthenticatedAndOwner]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def retrieve(self, request: Request) -> Response:
+        """
+        Get the maintained counters; answers 304 from the user's change stamp,
+        which every counted write replaces.
+        """
+        user = request.user
+        if not isinstance(user, User):
+            return Response(
+                {"error": "Authentication required"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        stamp = ChangeStamps.get(user.pk)
+        etag = ConditionalGet.entity_tag("stats", user.pk, stamp.token)
+        not_modified = ConditionalGet.not_modified(request, etag, stamp.changed)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = UserJournalStatsSerializer(UserJournalStats.for_user(user))
+        return ConditionalGet.with_validators(
+            Response(serializer.data), etag, stamp.changed
+        )
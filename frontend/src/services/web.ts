@@ -1,5 +1,5 @@
 import { api } from 'boot/axios';
-import type { Dream, Quality } from 'src/types/models';
+import type { Dream, DreamCalendar, JournalStats, Quality } from 'src/types/models';
 
 // Auth API calls
 export const authApi = {
@@ -44,9 +44,17 @@ export const dreamsApi = {
 
   get: (id: string | number) => api.get<Dream>(`/dreams/${id}/`),
 
+  // Dream counts per day, week or month with streaks and totals
+  calendar: (params?: URLSearchParams) => {
+    const url = `/dreams/calendar/${params?.toString() ? '?' + params.toString() : ''}`;
+    return api.get<DreamCalendar>(url);
+  },
+
   create: (dream: Partial<Dream>) => api.post('/dreams/', dream),
 
-  update: (id: string | number, dream: Partial<Dream>) => api.patch(`/dreams/${id}/`, dream),
+  // Pass the ETag of the last read or save to only write over that version
+  update: (id: string | number, dream: Partial<Dream>, etag?: string) =>
+    api.patch<Dream>(`/dreams/${id}/`, dream, etag ? { headers: { 'If-Match': etag } } : {}),
 
   delete: (id: string | number) => api.delete(`/dreams/${id}/`),
 
@@ -74,6 +82,11 @@ export const qualitiesApi = {
 
   get: (id: string | number) => api.get<Quality>(`/qualities/${id}/`),
 
+  autocomplete: (
+    prefix: string,
+    options: { limit?: number; order?: 'name' | 'frequency'; mode?: 'prefix' | 'fuzzy' } = {},
+  ) => api.get<Quality[]>('/qualities/autocomplete/', { params: { prefix, ...options } }),
+
   create: (quality: Partial<Quality>) => api.post('/qualities/', quality),
 
   update: (id: string | number, quality: Partial<Quality>) => api.put(`/qualities/${id}/`, quality),
@@ -91,3 +104,9 @@ export const dreamQualitiesApi = {
   delete: (dreamId: string | number, qualityId: string | number) =>
     api.delete(`/dreams/${dreamId}/qualities/${qualityId}/`),
 };
+
+// Current user API calls
+export const meApi = {
+  // Maintained journal counters; cheaper than counting from the lists
+  stats: () => api.get<JournalStats>('/me/stats/'),
+};
@@ -17,7 +17,11 @@ export interface Dream {
   created: string;
   updated: string;
   qualities?: Quality[];
-  images?: Image[];
+  images?: Image[]; // Latest few images only
+  image_count?: number;
+  // Only present when requested through the fields= query parameter
+  description_preview?: string;
+  quality_names?: string[];
   is_public?: boolean;
   is_owner?: boolean;
 }
@@ -37,6 +41,35 @@ export interface Image {
   image_url?: string; // Optional signed URL when status is completed
 }
 
+export interface CalendarBucket {
+  date: string; // First local day of the period, YYYY-MM-DD
+  dreams: number;
+  qualities: number; // Distinct qualities recorded in the period
+}
+
+export interface DreamCalendar {
+  period: 'day' | 'week' | 'month';
+  start: string;
+  end: string;
+  buckets: CalendarBucket[]; // Only periods with dreams, oldest first
+  streaks: {
+    current: number;
+    longest: number;
+  };
+  totals: {
+    dreams: number;
+    qualities: number;
+  };
+}
+
+export interface JournalStats {
+  dream_count: number;
+  public_dream_count: number;
+  quality_count: number;
+  image_count: number;
+  last_dream_at: string | null;
+}
+
 export interface DreamCreate {
   description: string;
   quality_names: string[];
@@ -43,7 +43,9 @@ resource "google_project_service" "apis" {
     "cloudbilling.googleapis.com",
     "vpcaccess.googleapis.com",
     "storage.googleapis.com",
-    "generativelanguage.googleapis.com"
+    "generativelanguage.googleapis.com",
+    "redis.googleapis.com",
+    "cloudscheduler.googleapis.com"
   ])
 
   project = local.project_id
@@ -138,6 +140,35 @@ resource "google_project_iam_member" "app_token_creator" {
   member  = "serviceAccount:${google_service_account.app_service_account.email}"
 }
 
+# Lets Cloud Scheduler start Cloud Run jobs as the app service account
+resource "google_project_iam_member" "app_run_invoker" {
+  project = local.project_id
+  role    = "roles/run.invoker"
+  member  = "serviceAccount:${google_service_account.app_service_account.email}"
+}
+
+# Nightly quality frequency reconciliation. The Cloud Run job itself
+# (backend/reconcile-frequencies-job.yaml) is deployed by Cloud Build; no
+# Celery beat process runs in production.
+resource "google_cloud_scheduler_job" "reconcile_frequencies" {
+  name      = "dream-journal-reconcile-frequencies"
+  project   = local.project_id
+  region    = var.region
+  schedule  = "0 3 * * *"
+  time_zone = "Etc/UTC"
+
+  http_target {
+    http_method = "POST"
+    uri         = "https://run.googleapis.com/v2/projects/${local.project_id}/locations/${var.region}/jobs/dream-journal-reconcile-frequencies:run"
+
+    oauth_token {
+      service_account_email = google_service_account.app_service_account.email
+    }
+  }
+
+  depends_on = [google_project_service.apis]
+}
+
 # Grant Cloud Build trigger service account permission to manage Pub/Sub IAM
 resource "google_project_iam_member" "cloudbuild_pubsub_admin" {
   project = local.project_id
@@ -171,7 +202,8 @@ resource "google_secret_manager_secret_iam_binding" "cloud_run_secret_access" {
     google_secret_manager_secret.django_secret_key.secret_id,
     google_secret_manager_secret.db_url.secret_id,
     google_secret_manager_secret.sendgrid_api_key.secret_id,
-    google_secret_manager_secret.gemini_api_key.secret_id
+    google_secret_manager_secret.gemini_api_key.secret_id,
+    google_secret_manager_secret.redis_cache_url.secret_id
   ])
 
   project   = local.project_id
@@ -392,6 +424,41 @@ resource "google_secret_manager_secret_version" "db_url" {
   secret_data = "postgresql://dreamjournal:${urlencode(random_password.db_password.result)}@${google_sql_database_instance.postgres.private_ip_address}:5432/dreamjournal"
 }
 
+# Redis cache shared by every backend and Celery worker process
+resource "google_redis_instance" "cache" {
+  name               = "dream-journal-cache"
+  project            = local.project_id
+  region             = var.region
+  tier               = "BASIC"
+  memory_size_gb     = 1
+  redis_version      = "REDIS_7_0"
+  authorized_network = google_compute_network.main.id
+  connect_mode       = "PRIVATE_SERVICE_ACCESS"
+
+  depends_on = [google_service_networking_connection.private_vpc_connection]
+}
+
+# Store the cache URL in Secret Manager
+resource "google_secret_manager_secret" "redis_cache_url" {
+  secret_id = "redis-cache-url"
+  project   = local.project_id
+
+  replication {
+    user_managed {
+      replicas {
+        location = var.region
+      }
+    }
+  }
+
+  depends_on = [google_project_service.apis]
+}
+
+resource "google_secret_manager_secret_version" "redis_cache_url" {
+  secret      = google_secret_manager_secret.redis_cache_url.id
+  secret_data = "redis://${google_redis_instance.cache.host}:${google_redis_instance.cache.port}/0"
+}
+
 # Generate Django secret key
 resource "random_password" "django_secret_key" {
   length  = 50